@@ -0,0 +1,132 @@
+-- Trigger yang menjaga buyer_stats dan tag_counts, prosedur refresh_summary() dan view
+-- top_5_tags dari tag_counts (dibuat dari bustbuy_gen/summary.py, summary_script('triggers')).
+-- Jalankan sesudah data dimuat. Jika dump tidak dibuat dengan --summary, isi tabelnya
+-- sekali dengan: CALL refresh_summary();
+
+DELIMITER //
+
+DROP TRIGGER IF EXISTS trg_buyer_stats_pesanan_insert//
+CREATE TRIGGER trg_buyer_stats_pesanan_insert
+AFTER INSERT ON pesanan
+FOR EACH ROW
+BEGIN
+    INSERT INTO buyer_stats (email_pembeli, jumlah_pesanan, total_belanja, jumlah_ulasan_positif) VALUES (NEW.email_pembeli, 1, NEW.harga_total, 0) ON DUPLICATE KEY UPDATE jumlah_pesanan = jumlah_pesanan + VALUES(jumlah_pesanan), total_belanja = total_belanja + VALUES(total_belanja);
+END//
+
+DROP TRIGGER IF EXISTS trg_buyer_stats_pesanan_update//
+CREATE TRIGGER trg_buyer_stats_pesanan_update
+AFTER UPDATE ON pesanan
+FOR EACH ROW
+BEGIN
+    IF OLD.email_pembeli <> NEW.email_pembeli OR OLD.harga_total <> NEW.harga_total THEN
+        UPDATE buyer_stats SET jumlah_pesanan = jumlah_pesanan - 1, total_belanja = total_belanja - OLD.harga_total WHERE email_pembeli = OLD.email_pembeli;
+        DELETE FROM buyer_stats WHERE email_pembeli = OLD.email_pembeli AND jumlah_pesanan = 0 AND jumlah_ulasan_positif = 0;
+        INSERT INTO buyer_stats (email_pembeli, jumlah_pesanan, total_belanja, jumlah_ulasan_positif) VALUES (NEW.email_pembeli, 1, NEW.harga_total, 0) ON DUPLICATE KEY UPDATE jumlah_pesanan = jumlah_pesanan + VALUES(jumlah_pesanan), total_belanja = total_belanja + VALUES(total_belanja);
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_buyer_stats_pesanan_delete//
+CREATE TRIGGER trg_buyer_stats_pesanan_delete
+AFTER DELETE ON pesanan
+FOR EACH ROW
+BEGIN
+    UPDATE buyer_stats SET jumlah_pesanan = jumlah_pesanan - 1, total_belanja = total_belanja - OLD.harga_total WHERE email_pembeli = OLD.email_pembeli;
+    DELETE FROM buyer_stats WHERE email_pembeli = OLD.email_pembeli AND jumlah_pesanan = 0 AND jumlah_ulasan_positif = 0;
+END//
+
+DROP TRIGGER IF EXISTS trg_buyer_stats_ulasan_insert//
+CREATE TRIGGER trg_buyer_stats_ulasan_insert
+AFTER INSERT ON ulasan
+FOR EACH ROW
+BEGIN
+    IF NEW.nilai >= 4.0 THEN
+        INSERT INTO buyer_stats (email_pembeli, jumlah_pesanan, total_belanja, jumlah_ulasan_positif) VALUES (NEW.email_pembeli, 0, 0, 1) ON DUPLICATE KEY UPDATE jumlah_ulasan_positif = jumlah_ulasan_positif + VALUES(jumlah_ulasan_positif);
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_buyer_stats_ulasan_update//
+CREATE TRIGGER trg_buyer_stats_ulasan_update
+AFTER UPDATE ON ulasan
+FOR EACH ROW
+BEGIN
+    IF OLD.email_pembeli <> NEW.email_pembeli OR (OLD.nilai >= 4.0) <> (NEW.nilai >= 4.0) THEN
+        UPDATE buyer_stats SET jumlah_ulasan_positif = jumlah_ulasan_positif - 1 WHERE email_pembeli = OLD.email_pembeli AND OLD.nilai >= 4.0;
+        DELETE FROM buyer_stats WHERE email_pembeli = OLD.email_pembeli AND OLD.nilai >= 4.0 AND jumlah_pesanan = 0 AND jumlah_ulasan_positif = 0;
+        INSERT INTO buyer_stats (email_pembeli, jumlah_pesanan, total_belanja, jumlah_ulasan_positif) SELECT NEW.email_pembeli, 0, 0, 1 FROM DUAL WHERE NEW.nilai >= 4.0 ON DUPLICATE KEY UPDATE jumlah_ulasan_positif = jumlah_ulasan_positif + VALUES(jumlah_ulasan_positif);
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_buyer_stats_ulasan_delete//
+CREATE TRIGGER trg_buyer_stats_ulasan_delete
+AFTER DELETE ON ulasan
+FOR EACH ROW
+BEGIN
+    IF OLD.nilai >= 4.0 THEN
+        UPDATE buyer_stats SET jumlah_ulasan_positif = jumlah_ulasan_positif - 1 WHERE email_pembeli = OLD.email_pembeli;
+        DELETE FROM buyer_stats WHERE email_pembeli = OLD.email_pembeli AND jumlah_pesanan = 0 AND jumlah_ulasan_positif = 0;
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_tag_counts_tag_produk_insert//
+CREATE TRIGGER trg_tag_counts_tag_produk_insert
+AFTER INSERT ON tag_produk
+FOR EACH ROW
+BEGIN
+    INSERT INTO tag_counts (tag, jumlah_produk) VALUES (NEW.tag, 1) ON DUPLICATE KEY UPDATE jumlah_produk = jumlah_produk + VALUES(jumlah_produk);
+END//
+
+DROP TRIGGER IF EXISTS trg_tag_counts_tag_produk_update//
+CREATE TRIGGER trg_tag_counts_tag_produk_update
+AFTER UPDATE ON tag_produk
+FOR EACH ROW
+BEGIN
+    IF OLD.tag <> NEW.tag THEN
+        UPDATE tag_counts SET jumlah_produk = jumlah_produk - 1 WHERE tag = OLD.tag;
+        DELETE FROM tag_counts WHERE tag = OLD.tag AND jumlah_produk = 0;
+        INSERT INTO tag_counts (tag, jumlah_produk) VALUES (NEW.tag, 1) ON DUPLICATE KEY UPDATE jumlah_produk = jumlah_produk + VALUES(jumlah_produk);
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_tag_counts_tag_produk_delete//
+CREATE TRIGGER trg_tag_counts_tag_produk_delete
+AFTER DELETE ON tag_produk
+FOR EACH ROW
+BEGIN
+    UPDATE tag_counts SET jumlah_produk = jumlah_produk - 1 WHERE tag = OLD.tag;
+    DELETE FROM tag_counts WHERE tag = OLD.tag AND jumlah_produk = 0;
+END//
+
+DROP PROCEDURE IF EXISTS refresh_summary//
+CREATE PROCEDURE refresh_summary()
+BEGIN
+    START TRANSACTION;
+    DELETE FROM buyer_stats;
+    INSERT INTO buyer_stats (email_pembeli, jumlah_pesanan, total_belanja, jumlah_ulasan_positif)
+    SELECT email_pembeli, SUM(jumlah_pesanan), SUM(total_belanja), SUM(jumlah_ulasan_positif)
+    FROM (
+        SELECT email_pembeli, COUNT(*) AS jumlah_pesanan, SUM(harga_total) AS total_belanja,
+            0 AS jumlah_ulasan_positif
+        FROM pesanan
+        GROUP BY email_pembeli
+        UNION ALL
+        SELECT email_pembeli, 0, 0, COUNT(*)
+        FROM ulasan
+        WHERE nilai >= 4.0
+        GROUP BY email_pembeli
+    ) AS s
+    GROUP BY email_pembeli;
+    DELETE FROM tag_counts;
+    INSERT INTO tag_counts (tag, jumlah_produk)
+    SELECT tag, COUNT(*)
+    FROM tag_produk
+    GROUP BY tag;
+    COMMIT;
+END//
+
+DELIMITER ;
+
+CREATE OR REPLACE VIEW top_5_tags AS
+SELECT tag, jumlah_produk
+FROM tag_counts
+ORDER BY jumlah_produk DESC
+LIMIT 5;
@@ -0,0 +1,24 @@
+-- Tabel ringkasan buyer_stats dan tag_counts (dibuat dari bustbuy_gen/summary.py,
+-- summary_script('tables')). Jalankan sesudah skema utama dan sebelum memuat dump dari
+-- Bustbuy.py --summary.
+
+CREATE TABLE IF NOT EXISTS buyer_stats (
+    email_pembeli VARCHAR(50) NOT NULL,
+    jumlah_pesanan INT NOT NULL DEFAULT 0,
+    total_belanja DECIMAL(20,2) NOT NULL DEFAULT 0,
+    jumlah_ulasan_positif INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (email_pembeli),
+    FOREIGN KEY (email_pembeli) REFERENCES pembeli(email)
+);
+
+CREATE TABLE IF NOT EXISTS tag_counts (
+    tag VARCHAR(50) NOT NULL,
+    jumlah_produk INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tag)
+);
+
+CREATE INDEX idx_buyer_stats_total ON buyer_stats(total_belanja);
+
+CREATE INDEX idx_buyer_stats_pesanan ON buyer_stats(jumlah_pesanan);
+
+CREATE INDEX idx_tag_counts_jumlah ON tag_counts(jumlah_produk);
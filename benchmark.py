@@ -0,0 +1,73 @@
+# Benchmark the generator at several scales for every output mode.
+#
+#   python benchmark.py                                # rows/extended/csv/tsv/sqlite x 1, 10, 100
+#   python benchmark.py --modes rows,sqlite --scales 1,10,100,1000 -o bench.json
+#   python benchmark.py --tracemalloc                  # also Python heap peak per table (slower)
+#   python benchmark.py -o new.json --compare bench.json
+#
+# Scale 1 is the original 50 pengguna / 200 produk / 100 pesanan. Every case
+# runs serially in a fresh process; per table the JSON holds rows, seconds,
+# rows/sec and the peak RSS so far (plus the tracemalloc peak of the section).
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+from bustbuy_gen.bench import MODES, SCALES, compare, environment, run_isolated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BustBuy data generation")
+    parser.add_argument('--modes', type=lambda text: text.split(','), default=list(MODES), metavar='M1,M2',
+                        help=f"output modes (default: {','.join(MODES)})")
+    parser.add_argument('--scales', type=lambda text: [float(s) for s in text.split(',')], default=list(SCALES),
+                        metavar='S1,S2', help="scale factors (default: 1,10,100)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tracemalloc', action='store_true', help="record the tracemalloc peak per table")
+    parser.add_argument('--no-numpy', action='store_true')
+    parser.add_argument('--no-pools', action='store_true')
+    parser.add_argument('-o', '--output', default='bench.json', help="JSON results (default: bench.json)")
+    parser.add_argument('--compare', default=None, metavar='OLD.json',
+                        help="print rows/sec changes of 10%% or more against an earlier result file")
+    args = parser.parse_args(argv)
+
+    unknown = [mode for mode in args.modes if mode not in MODES]
+    if unknown:
+        parser.error(f"mode tidak dikenal: {', '.join(unknown)}")
+
+    now = datetime(2025, 1, 1)
+    runs = []
+    for scale in args.scales:
+        scale = int(scale) if scale == int(scale) else scale
+        for mode in args.modes:
+            result = run_isolated(mode, scale, seed=args.seed, now=now, trace=args.tracemalloc,
+                                  vectorized=False if args.no_numpy else None, pools=not args.no_pools)
+            runs.append(result)
+            print(f"{mode:<9} x{scale:<6} {result['rows']:>10} baris {result['seconds']:>8.2f} s "
+                  f"{result['rows_per_sec']:>9} baris/detik {result['output_bytes']:>12} B "
+                  f"RSS {result['peak_rss_kb']} KiB", file=sys.stderr)
+            slowest = max(result['tables'].items(), key=lambda item: item[1]['seconds'])
+            print(f"{'':<17} paling lambat: {slowest[0]} ({slowest[1]['seconds']:.2f} s)", file=sys.stderr)
+
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': args.seed,
+        'numpy_engine': not args.no_numpy and environment()['numpy'],
+        'pools': not args.no_pools,
+        'environment': environment(),
+        'runs': runs,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            old = json.load(f)
+        for line in compare(old, results) or ["Tidak ada perubahan baris/detik >= 10%"]:
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
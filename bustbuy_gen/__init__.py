@@ -0,0 +1,32 @@
+"""Data generator for the BustBuy e-commerce schema (see schemav2.txt)."""
+
+from .columnar import ColumnarWriter, iter_columnar, read_columns
+from .config import BASE_COUNTS, scaled_counts
+from .convert import convert
+from .dumpreader import iter_dump
+from .loader import ConnectionPool, DbWriter, create_schema
+from .keys import AliasTable, Csr, ProdukKeys, UserKeys
+from .runner import generate, iter_dataset, iter_records, iter_rows, plan
+from .sinks import ShardedWriter
+from .schema import COLUMNS, ROW_TYPES
+from .skew import SKEW_COLUMNS, parse_skew
+from .state import DELTA_TABLES, generate_delta, load_state, save_state
+from .summary import SUMMARY_TABLES, install_summary, refresh_summary
+from .tables import CHUNK_ROWS, REGISTRY, Chunked, Dataset, register
+from .verify import Verifier, verify
+from .writers import DelimitedWriter, ExtendedInsertWriter, NullWriter, SqlRowWriter
+
+__all__ = [
+    'BASE_COUNTS', 'scaled_counts',
+    'COLUMNS', 'ROW_TYPES',
+    'CHUNK_ROWS', 'Chunked', 'Dataset', 'REGISTRY', 'register',
+    'AliasTable', 'Csr', 'ProdukKeys', 'UserKeys',
+    'generate', 'iter_dataset', 'iter_records', 'iter_rows', 'plan',
+    'DELTA_TABLES', 'generate_delta', 'load_state', 'save_state',
+    'SUMMARY_TABLES', 'install_summary', 'refresh_summary',
+    'SqlRowWriter', 'ExtendedInsertWriter', 'DelimitedWriter', 'NullWriter', 'ShardedWriter',
+    'DbWriter', 'ConnectionPool', 'create_schema',
+    'SKEW_COLUMNS', 'parse_skew',
+    'iter_dump', 'Verifier', 'verify',
+    'convert', 'ColumnarWriter', 'iter_columnar', 'read_columns',
+]
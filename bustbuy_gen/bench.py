@@ -0,0 +1,185 @@
+# Generator benchmark.
+#
+# Every (output mode, scale) case runs in a fresh spawned process so peak
+# RSS and caches do not leak between cases. Inside the case the writer is
+# wrapped in MeasuringWriter, which times every table section from
+# begin_table to end_table (generation and writing both happen in between)
+# and records the process RSS high-water mark, and optionally the
+# tracemalloc peak, at the end of the section. Results are plain dicts that
+# benchmark.py stores as JSON; compare() diffs two such result files.
+
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .columns import HAVE_NUMPY
+from .config import scaled_counts
+from .loader import DbWriter, create_schema
+from .runner import generate
+from .tables import Dataset
+from .writers import DelimitedWriter, ExtendedInsertWriter, SqlRowWriter
+
+MODES = ('rows', 'extended', 'csv', 'tsv', 'sqlite')
+SCALES = (1, 10, 100)
+
+
+def peak_rss_kb():
+    """RSS high-water mark of this process in KiB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class MeasuringWriter:
+    """Writer wrapper that records time, rows and memory per table section."""
+
+    def __init__(self, inner, trace=False):
+        self.inner = inner
+        self.trace = trace
+        self.sections = {}
+        self.started_at = 0.0
+        # Langsung ke writer asli: tanpa overhead per baris
+        self.write_row = inner.write_row
+        self.comment = inner.comment
+
+    def begin_table(self, table, columns):
+        if self.trace:
+            tracemalloc.reset_peak()
+        self.started_at = time.perf_counter()
+        self.inner.begin_table(table, columns)
+
+    def end_table(self, table, count, note=''):
+        self.inner.end_table(table, count, note)
+        seconds = time.perf_counter() - self.started_at
+        section = {
+            'rows': count,
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(count / seconds) if seconds > 0 else None,
+            'peak_rss_kb': peak_rss_kb(),
+        }
+        if self.trace:
+            section['tracemalloc_peak_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        self.sections[table] = section
+
+    def close(self):
+        self.inner.close()
+
+
+def output_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def run_case(mode, scale, seed=1, now=None, trace=False, vectorized=None, pools=True, workdir=None):
+    """Generate one case serially and return its measurements."""
+    ds = Dataset(scaled_counts(scale), seed=seed, now=now, vectorized=vectorized, pools=pools)
+    with tempfile.TemporaryDirectory(prefix='bustbuy-bench-', dir=workdir) as tmp:
+        f = None
+        if mode == 'sqlite':
+            target = os.path.join(tmp, 'bench.db')
+            url = f"sqlite:///{target}"
+            create_schema(url)
+            inner = DbWriter(url)
+        elif mode in ('csv', 'tsv'):
+            target = os.path.join(tmp, 'dump')
+            inner = DelimitedWriter(target, ',' if mode == 'csv' else '\t')
+        else:
+            target = os.path.join(tmp, 'out.sql')
+            f = open(target, 'w', encoding='utf-8')
+            inner = ExtendedInsertWriter(f) if mode == 'extended' else SqlRowWriter(f)
+        if trace:
+            tracemalloc.start()
+        writer = MeasuringWriter(inner, trace)
+        started_at = time.perf_counter()
+        try:
+            totals = generate(ds, writer, tables=None)
+            writer.close()
+        finally:
+            if f is not None:
+                f.close()
+        seconds = time.perf_counter() - started_at
+        if trace:
+            tracemalloc.stop()
+        rows = sum(totals.values())
+        return {
+            'mode': mode,
+            'scale': scale,
+            'rows': rows,
+            'seconds': round(seconds, 4),
+            # Di luar tabel: pool kosakata, tulis load.sql, tutup writer
+            'setup_seconds': round(seconds - sum(s['seconds'] for s in writer.sections.values()), 4),
+            'rows_per_sec': round(rows / seconds) if seconds > 0 else None,
+            'output_bytes': output_bytes(target),
+            'peak_rss_kb': peak_rss_kb(),
+            'tables': writer.sections,
+        }
+
+
+def _case_process(conn, args, kwargs):
+    try:
+        conn.send(('ok', run_case(*args, **kwargs)))
+    except BaseException as exc:
+        conn.send(('error', f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def run_isolated(mode, scale, **kwargs):
+    """run_case() in a fresh process so its peak RSS is its own."""
+    ctx = multiprocessing.get_context('spawn')
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_case_process, args=(send_conn, (mode, scale), kwargs))
+    process.start()
+    send_conn.close()
+    try:
+        status, result = recv_conn.recv()
+    except EOFError:
+        status, result = 'error', f"proses berhenti dengan exit code {process.exitcode}"
+    process.join()
+    if status == 'error':
+        raise RuntimeError(f"Benchmark {mode} x{scale} gagal: {result}")
+    return result
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': HAVE_NUMPY,
+    }
+
+
+def compare(old, new, threshold=0.1):
+    """Lines describing rows/sec changes larger than `threshold` between two result dicts."""
+    before = {(run['mode'], run['scale']): run for run in old['runs']}
+    lines = []
+    for run in new['runs']:
+        previous = before.get((run['mode'], run['scale']))
+        if previous is None:
+            continue
+        sections = [('(total)', previous, run)]
+        sections += [(table, previous['tables'][table], section)
+                     for table, section in run['tables'].items() if table in previous['tables']]
+        for table, a, b in sections:
+            if not a['rows_per_sec'] or not b['rows_per_sec']:
+                continue
+            change = b['rows_per_sec'] / a['rows_per_sec'] - 1
+            if abs(change) >= threshold:
+                lines.append(f"{run['mode']:<9} x{run['scale']:<6} {table:<20} "
+                             f"{a['rows_per_sec']:>10} -> {b['rows_per_sec']:>10} baris/detik ({change:+.0%})")
+    return lines
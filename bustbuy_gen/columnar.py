@@ -0,0 +1,188 @@
+# Binary columnar cache: one <table>.bbc file per table.
+#
+# A file starts with MAGIC and a JSON header (table, columns) and continues
+# with row groups of up to ROW_GROUP rows. Inside a row group every column
+# is stored on its own and encoded by the type of its values: int as
+# array('q'), float as array('d'), bool as one byte each, strings as
+# character offsets plus one UTF-8 blob, anything else pickled. Columns with
+# NULLs carry a mask; every column is zlib compressed. Writer and readers
+# hold one row group at a time, and read_columns() decodes only the columns
+# that are asked for.
+#
+# Writing the same table again (another INSERT run of it in the input)
+# appends row groups, provided the columns are the same.
+
+import json
+import os
+import pickle
+import struct
+import zlib
+from array import array
+
+MAGIC = b'BBCOL1\n'
+COLUMNAR_EXTENSION = 'bbc'
+ROW_GROUP = 65536
+
+_LENGTH = struct.Struct('<I')
+_BLOCK = struct.Struct('<cBII')  # jenis, ada mask NULL, byte mentah, byte terkompresi
+
+
+def encode_column(values):
+    """(kind, NULL mask, payload) for one column of a row group; the payload starts with the mask."""
+    mask = b''
+    if None in values:
+        mask = bytes([value is None for value in values])
+        values = [value for value in values if value is not None]
+    types = set(map(type, values))
+    try:
+        if types <= {int}:
+            return b'i', mask, mask + array('q', values).tobytes()
+        if types <= {bool}:
+            return b'b', mask, mask + bytes(values)
+        if types <= {int, float}:
+            return b'f', mask, mask + array('d', values).tobytes()
+    except OverflowError:
+        pass
+    if types <= {str}:
+        offsets = array('q', [0])
+        end = 0
+        for value in values:
+            end += len(value)
+            offsets.append(end)
+        return b's', mask, mask + offsets.tobytes() + ''.join(values).encode('utf-8')
+    return b'o', mask, mask + pickle.dumps(list(values), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_column(kind, has_nulls, payload, n):
+    """Values of one column of a row group with `n` rows."""
+    mask = None
+    if has_nulls:
+        mask = payload[:n]
+        payload = payload[n:]
+    m = n - sum(mask) if mask else n
+    if kind == b'i' or kind == b'f':
+        values = array('q' if kind == b'i' else 'd')
+        values.frombytes(payload)
+        values = values.tolist()
+    elif kind == b'b':
+        values = list(map(bool, payload))
+    elif kind == b's':
+        offsets = array('q')
+        offsets.frombytes(payload[:8 * (m + 1)])
+        text = payload[8 * (m + 1):].decode('utf-8')
+        values = [text[a:b] for a, b in zip(offsets, offsets[1:])]
+    elif kind == b'o':
+        values = pickle.loads(payload)
+    else:
+        raise ValueError(f"Jenis kolom tidak dikenal: {kind!r}")
+    if mask:
+        present = iter(values)
+        values = [None if null else next(present) for null in mask]
+    return values
+
+
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"Bukan file cache kolom: {getattr(f, 'name', f)}")
+    (size,) = _LENGTH.unpack(f.read(_LENGTH.size))
+    return json.loads(f.read(size))
+
+
+def _row_groups(f, columns, wanted):
+    while True:
+        head = f.read(_LENGTH.size)
+        if not head:
+            return
+        (n,) = _LENGTH.unpack(head)
+        group = {}
+        for column in columns:
+            kind, has_nulls, raw, size = _BLOCK.unpack(f.read(_BLOCK.size))
+            if column not in wanted:
+                f.seek(size, os.SEEK_CUR)
+                continue
+            payload = zlib.decompress(f.read(size))
+            if len(payload) != raw:
+                raise ValueError(f"Kolom {column} rusak di {getattr(f, 'name', f)}")
+            group[column] = decode_column(kind, has_nulls, payload, n)
+        yield n, group
+
+
+def read_columns(path, columns=None):
+    """Yield {column: values} per row group of a .bbc file, for `columns` (default: all)."""
+    with open(path, 'rb') as f:
+        header = read_header(f)
+        wanted = set(header['columns'] if columns is None else columns)
+        for _, group in _row_groups(f, header['columns'], wanted):
+            yield group
+
+
+def iter_columnar(path):
+    """(table, columns, values) for every row of a .bbc file."""
+    with open(path, 'rb') as f:
+        header = read_header(f)
+        table = header['table']
+        columns = tuple(header['columns'])
+        for _, group in _row_groups(f, columns, set(columns)):
+            for values in zip(*(group[column] for column in columns)):
+                yield table, columns, list(values)
+
+
+class ColumnarWriter:
+    """One .bbc file per table in `directory`, written in row groups.
+
+    `level` is the zlib level of the column blocks (default 1: fast).
+    """
+
+    def __init__(self, directory, row_group=ROW_GROUP, level=1):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.row_group = row_group
+        self.level = level
+        self.f = None
+        self.rows = []
+        self.written = {}  # table -> [nama file, kolom, jumlah baris]
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def begin_table(self, table, columns):
+        columns = tuple(columns)
+        filename = f"{table}.{COLUMNAR_EXTENSION}"
+        if table in self.written:
+            if self.written[table][1] != columns:
+                raise ValueError(f"Kolom {table} berbeda dengan bagian sebelumnya: {', '.join(columns)}")
+            self.f = open(self.path(filename), 'ab')
+            return
+        self.f = open(self.path(filename), 'wb')
+        header = json.dumps({'table': table, 'columns': list(columns)}).encode('utf-8')
+        self.f.write(MAGIC + _LENGTH.pack(len(header)) + header)
+        self.written[table] = [filename, columns, 0]
+
+    def write_row(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        blocks = [_LENGTH.pack(len(self.rows))]
+        for values in zip(*self.rows):
+            kind, mask, payload = encode_column(list(values))
+            data = zlib.compress(payload, self.level)
+            blocks.append(_BLOCK.pack(kind, bool(mask), len(payload), len(data)))
+            blocks.append(data)
+        self.f.write(b''.join(blocks))
+        self.rows = []
+
+    def comment(self, text):
+        pass
+
+    def end_table(self, table, count, note=''):
+        self.flush()
+        self.f.close()
+        self.f = None
+        self.written[table][2] += count
+
+    def close(self):
+        pass
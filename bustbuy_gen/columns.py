@@ -0,0 +1,125 @@
+# Column engine: draws the numeric, temporal and categorical columns of a
+# whole chunk at once, so the per-row loop in tables.py only assembles rows.
+#
+# NumpyColumns uses a numpy Generator seeded from the chunk's Random and is
+# used when numpy is installed; PyColumns has the same interface on top of
+# random.Random. Both return plain Python lists, so the writers do not care
+# which one produced a row. The two engines draw different streams, so a
+# seeded run is reproducible for the same engine only.
+
+from datetime import timedelta
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+@lru_cache(maxsize=32)
+def day_labels(anchor, low, high, fmt):
+    """Formatted `anchor - d days` for d = low..high, built once per run."""
+    return tuple((anchor - timedelta(days=d)).strftime(fmt) for d in range(low, high + 1))
+
+
+class PyColumns:
+    """Column draws with random.Random."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def integers(self, low, high, n):
+        """n integers in low..high (inclusive)."""
+        randint = self.rng.randint
+        return [randint(low, high) for _ in range(n)]
+
+    def below(self, bounds):
+        """One integer in 0..b-1 for every b in `bounds`."""
+        random = self.rng.random
+        return [int(random() * b) for b in bounds]
+
+    def uniform(self, low, high, n, digits):
+        uniform = self.rng.uniform
+        return [round(uniform(low, high), digits) for _ in range(n)]
+
+    def coin(self, n, p=0.5):
+        random = self.rng.random
+        return [random() < p for _ in range(n)]
+
+    def choice(self, values, n):
+        return [values[i] for i in self.integers(0, len(values) - 1, n)]
+
+    def sample_sorted(self, n, k):
+        """k distinct integers from 0..n-1, ascending."""
+        return sorted(self.rng.sample(range(n), k))
+
+    def weighted(self, table, n):
+        """n draws from a keys.AliasTable."""
+        draw, rng = table.draw, self.rng
+        return [draw(rng) for _ in range(n)]
+
+    def weighted_each(self, tables):
+        """One draw from every AliasTable in `tables`; None stands for a single key (0)."""
+        rng = self.rng
+        return [table.draw(rng) if table else 0 for table in tables]
+
+    def days_ago(self, anchor, low, high, n, fmt):
+        """n values of `anchor - randint(low, high) days`, formatted with `fmt`."""
+        labels = day_labels(anchor, low, high, fmt)
+        return [labels[d] for d in self.integers(0, high - low, n)]
+
+
+class NumpyColumns(PyColumns):
+    """Column draws with a numpy Generator."""
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.gen = np.random.default_rng(rng.getrandbits(64))
+
+    def integers(self, low, high, n):
+        return self.gen.integers(low, high + 1, n).tolist()
+
+    def below(self, bounds):
+        bounds = np.asarray(bounds, dtype=np.int64)
+        return (self.gen.random(len(bounds)) * bounds).astype(np.int64).tolist()
+
+    def uniform(self, low, high, n, digits):
+        return np.round(self.gen.uniform(low, high, n), digits).tolist()
+
+    def coin(self, n, p=0.5):
+        return (self.gen.random(n) < p).tolist()
+
+    def choice(self, values, n):
+        return np.asarray(values, dtype=object)[self.gen.integers(0, len(values), n)].tolist()
+
+    def sample_sorted(self, n, k):
+        return np.sort(self.gen.choice(n, k, replace=False)).tolist()
+
+    def weighted(self, table, n):
+        u = self.gen.random(n) * len(table)
+        i = u.astype(np.int64)
+        prob = np.frombuffer(table.prob, dtype=np.float64)
+        alias = np.frombuffer(table.alias, dtype=np.uint32)
+        return np.where(u - i < prob[i], i, alias[i]).tolist()
+
+    def weighted_each(self, tables):
+        result = []
+        for table, u in zip(tables, self.gen.random(len(tables)).tolist()):
+            if not table:
+                result.append(0)
+                continue
+            u *= len(table)
+            i = int(u)
+            result.append(i if u - i < table.prob[i] else table.alias[i])
+        return result
+
+    def days_ago(self, anchor, low, high, n, fmt):
+        labels = np.asarray(day_labels(anchor, low, high, fmt), dtype=object)
+        return labels[self.gen.integers(0, high - low + 1, n)].tolist()
+
+
+def column_source(ds, rng):
+    """Column engine for one chunk/table, seeded from its Random."""
+    return NumpyColumns(rng) if ds.vectorized else PyColumns(rng)
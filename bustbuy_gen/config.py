@@ -0,0 +1,32 @@
+# Row counts and value vocabularies used by the generator
+
+# Jumlah baris pada scale 1 (sama dengan Bustbuy.py versi awal)
+BASE_COUNTS = {
+    'pengguna': 50,
+    'alamat': 100,
+    'friend': 100,
+    'alamat_alternatif': 50,
+    'produk': 200,
+    'pesanan': 100,
+    'ulasan': 50,
+}
+
+domains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'aol.com', 'mail.com', 'protonmail.com']
+produk_nama = ['Kaos Polos', 'Jaket Hoodie', 'Celana Jeans', 'Sepatu Sneakers', 'Tas Ransel', 'Kemeja Formal', 'Dress Midi', 'Topi Baseball']
+deskripsi = ['Produk berkualitas tinggi', 'Nyaman dipakai', 'Desain modern', 'Tahan lama']
+tags = ['Fashion', 'Casual', 'Formal', 'Sport', 'Aksesoris', 'Pria', 'Wanita']
+warna = ['BLACK', 'BLUE', 'RED', 'WHITE', 'NAVY', 'GREEN', 'GREY']
+ukuran = ['S', 'M', 'L', '28', '30', '32']
+status_pesanan = ['Menunggu Pembayaran', 'Diproses', 'Dikirim', 'Selesai', 'Dibatalkan']
+metode_bayar = ['Transfer Bank', 'COD', 'E-Wallet', 'Kartu Kredit']
+metode_kirim = ['Kurir Standar', 'Same Day', 'Ambil di Tempat', 'Instant Courier']
+
+
+def scaled_counts(scale=1, overrides=None):
+    """Return BASE_COUNTS multiplied by `scale`, with per-table overrides applied."""
+    counts = {table: max(1, int(round(n * scale))) for table, n in BASE_COUNTS.items()}
+    for table, n in (overrides or {}).items():
+        if table not in counts:
+            raise ValueError(f"Tabel tidak dikenal untuk --count: {table}")
+        counts[table] = int(n)
+    return counts
@@ -0,0 +1,95 @@
+# Convert existing dumps into another output format without regenerating.
+#
+# The legacy snapshots (Bustbuy(v2).sql, Bustbuy(v3)-add-constraint.sql,
+# test.txt) hold one INSERT per row, which replays slowly. convert() streams
+# any dump that dumpreader.iter_dump reads into any writer: batched INSERTs
+# (ExtendedInsertWriter), csv/tsv files for LOAD DATA (DelimitedWriter), the
+# columnar cache (ColumnarWriter) or a database (DbWriter). The input is read
+# once in blocks and the writers stream, so time is linear in the size of
+# the dump and memory stays constant.
+#
+# Consecutive rows with the same table and column list form one segment,
+# i.e. one begin_table/end_table on the writer. Per-table file formats need
+# one column list per table, so with `normalize` every row is laid out in
+# schema.COLUMNS order and columns missing from an INSERT get their DEFAULT.
+
+import re
+
+from .dumpreader import Expression, iter_dump
+from .schema import COLUMN_TYPES, COLUMNS
+
+_DEFAULT = re.compile(r'\bDEFAULT\s+(\S+)', re.I)
+_DEFAULT_VALUES = {'NULL': None, 'TRUE': True, 'FALSE': False}
+
+
+def column_default(table, column):
+    """Value of the DEFAULT of `column` (None without one)."""
+    m = _DEFAULT.search(dict(zip(COLUMNS[table], COLUMN_TYPES[table]))[column])
+    if m is None:
+        return None
+    text = m.group(1).upper()
+    if text in _DEFAULT_VALUES:
+        return _DEFAULT_VALUES[text]
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def layout(table, columns):
+    """Function putting values for `columns` in schema.COLUMNS order, or None
+    when they already are."""
+    columns = tuple(columns)
+    if columns == COLUMNS[table]:
+        return None
+    unknown = set(columns) - set(COLUMNS[table])
+    if unknown:
+        raise ValueError(f"Kolom tidak dikenal di {table}: {', '.join(sorted(unknown))}")
+    position = {column: i for i, column in enumerate(columns)}
+    plan = [(position.get(column), column_default(table, column)) for column in COLUMNS[table]]
+    return lambda values: [default if i is None else values[i] for i, default in plan]
+
+
+def convert(paths, writer, tables=None, normalize=False):
+    """Stream the rows of the dumps at `paths` into `writer`; returns a report.
+
+    `tables` limits the output to those tables. Tables that are not in
+    schema.COLUMNS are skipped and listed in the report. The writer is not
+    closed.
+    """
+    rows = {}
+    unknown = set()
+    table = columns = arrange = None
+    count = 0
+
+    def finish():
+        writer.end_table(table, count)
+        rows[table] = rows.get(table, 0) + count
+
+    for path in paths:
+        for next_table, next_columns, values in iter_dump(path):
+            if next_table != table or next_columns != columns:
+                if table is not None:
+                    finish()
+                    table = None
+                if next_table not in COLUMNS:
+                    unknown.add(next_table)
+                    continue
+                if tables is not None and next_table not in tables:
+                    continue
+                table, columns, count = next_table, next_columns, 0
+                arrange = layout(table, columns) if normalize else None
+                writer.begin_table(table, COLUMNS[table] if normalize else columns)
+            if len(values) != len(columns) or Expression in map(type, values):
+                row = rows.get(table, 0) + count + 1
+                if len(values) != len(columns):
+                    raise ValueError(f"{table} baris {row}: {len(values)} nilai untuk {len(columns)} kolom")
+                expression = next(value for value in values if type(value) is Expression)
+                raise ValueError(f"{table} baris {row}: {expression} bukan literal, tidak bisa dikonversi")
+            writer.write_row(values if arrange is None else arrange(values))
+            count += 1
+        # Segmen tidak berlanjut ke file berikutnya
+        if table is not None:
+            finish()
+            table = None
+    return {'rows': rows, 'unknown_tables': sorted(unknown)}
@@ -0,0 +1,416 @@
+# Streaming readers for generated dumps.
+#
+# iter_dump(path) yields (table, columns, values) for every row of a dump in
+# any output format of Bustbuy.py: a single SQL file (rows or extended
+# INSERTs, optionally .gz/.zst), a directory with manifest.json (sharded
+# output, see sinks.py), a csv/tsv directory with load.sql or a columnar
+# cache (columnar.py). SQL text is
+# scanned with regular expressions over 1 MB blocks, so a dump is read once
+# with constant memory: the usual INSERT head and a tuple of literals are
+# matched whole, anything else goes token by token. Values come back typed:
+# strings, int, float, bool and None; a value that is not a literal, such as
+# NOW(), comes back as an Expression holding its SQL text.
+#
+# Hand-written files such as Bustbuy(v3)-add-constraint.sql also carry
+# schema and trigger definitions. Statements other than INSERT are skipped
+# up to their delimiter, and the mysql client command DELIMITER is followed,
+# so a trigger body between DELIMITER // and DELIMITER ; is skipped whole
+# even when it contains INSERTs or semicolons.
+
+import gzip
+import io
+import json
+import os
+import re
+
+from .columnar import COLUMNAR_EXTENSION, iter_columnar
+from .schema import COLUMN_TYPES, COLUMNS, load_order
+
+BLOCK_SIZE = 1 << 20
+
+_STRING = r"""'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'|"[^"\\]*(?:(?:\\.|"")[^"\\]*)*\""""
+_SKIP = r"""(?:\s+|--[^\n]*(?:\n|\Z)|\#[^\n]*(?:\n|\Z)|/\*.*?\*/)*"""
+
+_TOKEN = re.compile(_SKIP + r"""(?:
+    (?P<string>""" + _STRING + r""")
+  | (?P<name>`(?:[^`]|``)*`)
+  | (?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)
+  | (?P<word>[A-Za-z_][\w$]*)
+  | (?P<other>.))""", re.S | re.X)
+
+# Jalur cepat: kepala INSERT yang umum dan satu tuple berisi literal saja
+_HEAD = re.compile(_SKIP + r"INSERT\s+INTO\s+`?(\w+)`?\s*\(([\w\s,`]*)\)\s*VALUES\s*", re.I)
+_ROW = re.compile(r"\s*\(((?:" + _STRING + r"""|[^'"()]++)*+)(\))?""", re.S)
+_VALUE = re.compile(r"\s*(?:(" + _STRING + r")|(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)|([A-Za-z_]\w*))\s*(?:,|$)", re.S)
+
+_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+_escape = re.compile(r"\\(.)|''|\"\"", re.S)
+_WORDS = {'NULL': None, 'TRUE': True, 'FALSE': False}
+
+
+class Expression(str):
+    """SQL text of a value that is not a literal, e.g. NOW() or 1 + 2."""
+
+    __slots__ = ()
+
+
+def _unescape_match(m):
+    if m.group(1) is None:
+        return m.group(0)[0]
+    return _ESCAPES.get(m.group(1), m.group(1))
+
+
+def unquote(text):
+    """Value of a quoted SQL string literal."""
+    body = text[1:-1]
+    if '\\' in body or "''" in body or '""' in body:
+        return _escape.sub(_unescape_match, body)
+    return body
+
+
+def _number(text):
+    return float(text) if '.' in text or 'e' in text or 'E' in text else int(text)
+
+
+def _value(kind, text):
+    if kind == 'string':
+        return unquote(text)
+    if kind == 'number':
+        return _number(text)
+    if kind == 'word':
+        return _WORDS.get(text.upper(), text)
+    return text
+
+
+def _identifier(text):
+    return text[1:-1].replace('``', '`') if text.startswith('`') else text
+
+
+def open_text(path):
+    """Open a plain, .gz or .zst dump as text."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    if path.endswith('.zst'):
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True),
+                                encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+class Scanner:
+    """SQL tokens of a text stream, read in BLOCK_SIZE blocks.
+
+    Spaces and comments are skipped. A match that reaches the end of the
+    buffer, or a string or comment that is not closed yet, is retried after
+    the next block is appended.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.heads = {}  # teks kepala INSERT -> (table, columns)
+
+    def fill(self):
+        if self.eof:
+            return False
+        block = self.f.read(BLOCK_SIZE)
+        self.eof = not block
+        self.buf = self.buf[self.pos:] + block
+        self.pos = 0
+        return not self.eof
+
+    def token(self):
+        """(kind, text) of the next token, None at the end."""
+        # Jalur cepat untuk ',' atau ';' tepat sesudah tuple
+        c = self.buf[self.pos:self.pos + 1]
+        if c == ',' or c == ';':
+            self.pos += 1
+            return 'other', c
+        while True:
+            m = _TOKEN.match(self.buf, self.pos)
+            if m is None:
+                if self.fill():
+                    continue
+                return None
+            kind = m.lastgroup
+            text = m.group(kind)
+            if kind == 'other':
+                unterminated = text in '\'"`' or self.buf.startswith('/*', m.start(kind))
+            else:
+                # 'a' langsung diikuti ' adalah awal 'a''b' yang belum lengkap
+                unterminated = kind == 'string' and self.buf.startswith(text[0], m.end())
+            if (unterminated or m.end() == len(self.buf)) and self.fill():
+                continue
+            if unterminated:
+                raise ValueError(f"String atau komentar tidak ditutup: {self.buf[m.start(kind):][:60]!r}")
+            self.pos = m.end()
+            return kind, text
+
+    def line(self):
+        """Rest of the current line, for client commands such as DELIMITER."""
+        end = self.buf.find('\n', self.pos)
+        while end < 0 and self.fill():
+            end = self.buf.find('\n', self.pos)
+        if end < 0:
+            end = len(self.buf)
+        text = self.buf[self.pos:end]
+        self.pos = end
+        return text
+
+    def ends(self, token, delimiter=';'):
+        """True if the statement ends at `token` (just read); the scanner is
+        moved past `delimiter`."""
+        kind, text = token
+        if text == delimiter:
+            return True
+        if delimiter == ';' or kind in ('string', 'name'):
+            return False
+        # Delimiter lain bisa menempel pada kata (END$$) atau lebih panjang dari satu token (//)
+        i = text.find(delimiter)
+        if i >= 0:
+            self.pos -= len(text) - i - len(delimiter)
+            return True
+        if len(self.buf) - self.pos < len(delimiter):
+            self.fill()
+        for k in range(min(len(text), len(delimiter) - 1), 0, -1):
+            if text.endswith(delimiter[:k]) and self.buf.startswith(delimiter[k:], self.pos):
+                self.pos += len(delimiter) - k
+                return True
+        return False
+
+    def skip_statement(self, token, delimiter=';'):
+        """Skip past the end of the statement that `token` belongs to."""
+        while token is not None and not self.ends(token, delimiter):
+            token = self.token()
+
+    def expect(self, table):
+        token = self.token()
+        if token is None:
+            raise ValueError(f"INSERT INTO {table} terpotong di akhir dump")
+        return token
+
+    def head(self):
+        """(table, columns) of a common INSERT ... VALUES head at the current position."""
+        while True:
+            m = _HEAD.match(self.buf, self.pos)
+            if m is None and len(self.buf) - self.pos < 4096 and self.fill():
+                continue
+            if m is None:
+                return None
+            self.pos = m.end()
+            key = m.group(1, 2)
+            head = self.heads.get(key)
+            if head is None:
+                head = (m.group(1), tuple(name.strip(' \t\r\n`') for name in m.group(2).split(',')))
+                if len(self.heads) < 4096:
+                    self.heads[key] = head
+            return head
+
+    def row(self):
+        """Values of a tuple holding only literals, or None (position unchanged)."""
+        while True:
+            m = _ROW.match(self.buf, self.pos)
+            if m is None:
+                return None
+            if m.group(2) is None:
+                # Tuple belum lengkap di buffer ini, atau berisi ekspresi
+                end = m.end()
+                if (end == len(self.buf) or self.buf[end] in '\'"') and self.fill():
+                    continue
+                return None
+            self.pos = m.end()
+            return [unquote(string) if string else _number(number) if number else _WORDS.get(word.upper(), word)
+                    for string, number, word in _VALUE.findall(m.group(1))]
+
+    def tuple(self, table):
+        """Values of the next tuple, token by token; an expression such as
+        NOW() becomes an Expression."""
+        kind, text = self.expect(table)
+        if text != '(':
+            raise ValueError(f"INSERT INTO {table}: '(' diharapkan, bukan {text!r}")
+        values = []
+        parts = []
+        depth = 0
+        while True:
+            kind, text = self.expect(table)
+            if depth == 0 and text in (',', ')'):
+                if len(parts) == 1:
+                    values.append(_value(*parts[0]))
+                elif parts:
+                    values.append(_expression(parts))
+                parts = []
+                if text == ')':
+                    return values
+                continue
+            depth += (text == '(') - (text == ')')
+            parts.append((kind, text))
+
+
+def _expression(parts):
+    # Spasi hanya di antara dua kata/literal: DATE_SUB(NOW(),INTERVAL 1 DAY)
+    text = parts[0][1]
+    for (before, _), (kind, part) in zip(parts, parts[1:]):
+        text += ' ' + part if before != 'other' and kind != 'other' else part
+    return Expression(text)
+
+
+def _insert_head(scanner):
+    # Sesudah kata INSERT: [IGNORE] [INTO] [db.]tabel [(kolom, ...)] VALUES
+    table = '?'
+    kind, text = scanner.expect(table)
+    while kind == 'word' and text.upper() in ('IGNORE', 'INTO', 'LOW_PRIORITY', 'DELAYED', 'HIGH_PRIORITY'):
+        kind, text = scanner.expect(table)
+    table = _identifier(text)
+    kind, text = scanner.expect(table)
+    if text == '.':
+        table = _identifier(scanner.expect(table)[1])
+        kind, text = scanner.expect(table)
+    columns = COLUMNS.get(table, ())
+    if text == '(':
+        names = []
+        kind, text = scanner.expect(table)
+        while text != ')':
+            if text != ',':
+                names.append(_identifier(text))
+            kind, text = scanner.expect(table)
+        columns = tuple(names)
+        kind, text = scanner.expect(table)
+    if text.upper() not in ('VALUES', 'VALUE'):
+        raise ValueError(f"INSERT INTO {table}: VALUES diharapkan, bukan {text!r}")
+    return table, columns
+
+
+def iter_inserts(f):
+    """(table, columns, values) for every row of the INSERT statements in `f`.
+
+    Other statements are skipped. An INSERT without a column list gets the
+    columns of schema.COLUMNS.
+    """
+    scanner = Scanner(f)
+    delimiter = ';'
+    while True:
+        head = scanner.head()
+        if head is None:
+            token = scanner.token()
+            if token is None:
+                return
+            kind, text = token
+            if kind == 'word' and text.upper() == 'DELIMITER':
+                delimiter = scanner.line().strip() or ';'
+                continue
+            if kind != 'word' or text.upper() != 'INSERT':
+                scanner.skip_statement(token, delimiter)
+                continue
+            head = _insert_head(scanner)
+        table, columns = head
+        while True:
+            values = scanner.row()
+            yield table, columns, values if values is not None else scanner.tuple(table)
+            token = scanner.token()
+            if token is None or token[1] != ',':
+                break
+        scanner.skip_statement(token, delimiter)
+
+
+_csv_field = re.compile(r'"((?:[^"\\]|\\.)*)"|([^,]*)', re.S)
+_load_escape = re.compile(r'\\(.)', re.S)
+
+
+def _load_unescape(text):
+    if '\\' not in text:
+        return text
+    return _load_escape.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def converters(table, columns):
+    """Functions turning LOAD DATA text into values for `columns` of `table`."""
+    types = dict(zip(COLUMNS.get(table, ()), COLUMN_TYPES.get(table, ())))
+    result = []
+    for column in columns:
+        kind = types.get(column, '').split('(')[0].split(' ')[0]
+        if kind == 'INT':
+            result.append(int)
+        elif kind == 'DECIMAL':
+            result.append(float)
+        elif kind == 'BOOLEAN':
+            result.append(lambda text: text not in ('0', 'FALSE', 'false', ''))
+        else:
+            result.append(None)
+    return result
+
+
+def _convert(value, convert):
+    if convert is None:
+        return value
+    try:
+        return convert(value)
+    except ValueError:
+        return value
+
+
+def iter_delimited(f, table, columns, delimiter='\t'):
+    """Rows of one LOAD DATA file (MySQL escaping, \\N for NULL)."""
+    convert = converters(table, columns)
+    for line in f:
+        line = line[:-1] if line.endswith('\n') else line
+        if delimiter == ',':
+            fields = []
+            pos = 0
+            for conv in convert:
+                m = _csv_field.match(line, pos)
+                if m.group(1) is not None:
+                    fields.append(_load_unescape(m.group(1)))
+                elif m.group(2) == '\\N':
+                    fields.append(None)
+                else:
+                    fields.append(_convert(_load_unescape(m.group(2)), conv))
+                pos = m.end() + 1  # lewati ','
+            yield fields
+            continue
+        yield [None if field == '\\N' else _convert(_load_unescape(field), conv)
+               for field, conv in zip(line.split(delimiter), convert)]
+
+
+def _manifest_files(directory):
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    for table in manifest['tables']:
+        for shard in table['shards']:
+            yield table['table'], tuple(table['columns']), manifest['format'], os.path.join(directory, shard['file'])
+
+
+def _delimited_files(directory):
+    names = set(os.listdir(directory))
+    for table in load_order():
+        for extension in ('tsv', 'csv', COLUMNAR_EXTENSION):
+            if f"{table}.{extension}" in names:
+                yield table, COLUMNS[table], extension, os.path.join(directory, f"{table}.{extension}")
+
+
+def dump_files(path):
+    """(table, columns, format, file) for the parts of the dump at `path`.
+
+    For a single SQL file table and columns are None: they come from the
+    INSERT statements (for a .bbc file from its header).
+    """
+    if not os.path.isdir(path):
+        return [(None, None, COLUMNAR_EXTENSION if path.endswith('.' + COLUMNAR_EXTENSION) else 'sql', path)]
+    if os.path.exists(os.path.join(path, 'manifest.json')):
+        return list(_manifest_files(path))
+    return list(_delimited_files(path))
+
+
+def iter_dump(path):
+    """(table, columns, values) for every row of the dump at `path`."""
+    for table, columns, fmt, filename in dump_files(path):
+        if fmt == COLUMNAR_EXTENSION:
+            yield from iter_columnar(filename)
+            continue
+        with open_text(filename) as f:
+            if fmt in ('csv', 'tsv'):
+                for values in iter_delimited(f, table, columns, ',' if fmt == 'csv' else '\t'):
+                    yield table, columns, values
+            else:
+                yield from iter_inserts(f)
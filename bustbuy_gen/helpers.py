@@ -0,0 +1,48 @@
+import hashlib
+import string
+
+password_chars = string.ascii_letters + string.digits + "!@#$%^&*_-+"
+
+
+# Nomor telepon +62-XXX-XXX-XXX dari 9 digit acak (0 <= digits < 10**9)
+def format_phone_number(digits):
+    return f"+62-{digits//1000000:03d}-{digits//1000%1000:03d}-{digits%1000:03d}"
+
+
+# Function to generate password based on nama_panjang
+def generate_password(rng, nama, length=10):
+    nama_base = ''.join(c for c in nama if c.isalnum()).lower()[:3]
+    random_chars = ''.join(rng.choice(password_chars) for _ in range(length - 3))
+    return nama_base + random_chars
+
+
+# Rentang umur dalam hari (inklusif) untuk tgl_lahir pengguna, yang diambil
+# per chunk relatif terhadap `now` (cols.days_ago di tables.pengguna_chunk).
+# Trigger validate_pengguna_age_insert menolak umur <= 17, jadi minimal 18.
+# Batas bawah memakai jumlah hari kabisat terbanyak dalam minimum_age tahun,
+# sehingga TIMESTAMPDIFF(YEAR, tgl_lahir, today) selalu >= minimum_age
+def birth_day_range(minimum_age, maximum_age):
+    return minimum_age * 365 + -(-minimum_age // 4), int((maximum_age + 1) * 365.25) - 1
+
+
+# Function to generate fake file path
+def generate_file_path(fake, prefix='uploads'):
+    return f"{prefix}/{fake.uuid4()}.jpg"
+
+
+# Function to generate random wishlist/keranjang name
+def generate_list_name(rng, prefix="List"):
+    if rng.random() < 0.5:
+        return f"{prefix} {rng.randint(1, 10)}"
+    return None
+
+
+# Bagi `total` baris secara merata ke `n` induk; induk ke-i mendapat share(i)
+def even_share(total, n, i):
+    return total * (i + 1) // n - total * i // n
+
+
+# Seed turunan untuk satu chunk: stabil antar proses dan antar run
+def chunk_seed(seed, table, index):
+    digest = hashlib.blake2b(f"{seed}:{table}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
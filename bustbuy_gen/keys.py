@@ -0,0 +1,200 @@
+# Compact, array-backed key spaces for parent tables.
+#
+# Parent keys are kept as integer ids in array.array buffers instead of lists
+# of strings, so memory stays at a few bytes per row. String keys (email, sku)
+# are rebuilt from the ids when a row is written.
+
+from array import array
+from bisect import bisect_right
+
+from .config import domains, warna, ukuran
+
+
+class UserKeys:
+    """Id space for pengguna. User id `uid` (0-based) maps to one email.
+
+    A chunk of users generated on its own starts at `base`; merge() appends
+    such a chunk to the full key space.
+    """
+
+    def __init__(self, base=0):
+        self.base = base
+        self.first_names = []  # Pool nama depan (interned)
+        self._name_index = {}
+        self.name = array('I')  # uid -> index ke first_names
+        self.domain = array('B')  # uid -> index ke domains
+        self.pembeli = array('I')  # uid pembeli, urut
+        self.penjual = array('I')  # uid penjual, urut
+        self.verified = array('I')  # uid penjual terverifikasi, urut
+
+    def __len__(self):
+        return len(self.name)
+
+    def intern(self, local):
+        idx = self._name_index.get(local)
+        if idx is None:
+            idx = self._name_index[local] = len(self.first_names)
+            self.first_names.append(local)
+        return idx
+
+    def add(self, nama_depan, domain_index):
+        local = ''.join(c for c in nama_depan if c.isalnum()).lower() or 'user'
+        self.name.append(self.intern(local))
+        self.domain.append(domain_index)
+        return self.base + len(self.name) - 1
+
+    def merge(self, part):
+        """Append a chunk whose base is the current length."""
+        if part.base != len(self):
+            raise ValueError(f"Chunk pengguna mulai di {part.base}, diharapkan {len(self)}")
+        remap = [self.intern(local) for local in part.first_names]
+        self.name.extend(remap[idx] for idx in part.name)
+        self.domain.extend(part.domain)
+        self.pembeli.extend(part.pembeli)
+        self.penjual.extend(part.penjual)
+        self.verified.extend(part.verified)
+
+    def email(self, uid):
+        # uid + 1 di dalam email menjamin keunikan tanpa perlu lookup
+        i = uid - self.base
+        return f"{self.first_names[self.name[i]]}{uid + 1}@{domains[self.domain[i]]}"
+
+
+class Csr:
+    """Parent -> children index in compressed sparse row layout.
+
+    Parents are appended in id order; the children of parent i are
+    values[offsets[i]:offsets[i + 1]]. When the children are themselves
+    contiguous ids (produk per seller) only the offsets are kept, see
+    append_count().
+    """
+
+    def __init__(self, typecode='I'):
+        self.offsets = array('I', [0])
+        self.values = array(typecode)
+        self._nonempty = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def append(self, children):
+        self.values.extend(children)
+        self.offsets.append(len(self.values))
+        self._nonempty = None
+
+    def append_count(self, count):
+        self.offsets.append(self.offsets[-1] + count)
+        self._nonempty = None
+
+    def count(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def child(self, i, j):
+        return self.values[self.offsets[i] + j]
+
+    def nonempty(self):
+        """Parents with at least one child, ascending (computed once)."""
+        if self._nonempty is None:
+            offsets = self.offsets
+            self._nonempty = array('I', (i for i in range(len(self)) if offsets[i + 1] > offsets[i]))
+        return self._nonempty
+
+
+class ProdukKeys:
+    """Id space for produk and varian.
+
+    Produk are assigned to sellers in contiguous no_produk ranges, so
+    seller -> produk is a Csr of counts (by_seller). produk -> varian is a
+    Csr of variant codes indexed by no_produk - 1, with the harga of every
+    variant in var_harga at the same position.
+    """
+
+    def __init__(self):
+        self.seller = array('I')  # uid penjual yang punya produk
+        self.by_seller = Csr()  # posisi seller -> rentang no_produk
+        self.varian = Csr('H')  # no_produk - 1 -> kode varian (warna * 8 + ukuran + 1)
+        self.var_harga = array('d')  # sejajar dengan varian.values
+
+    def __len__(self):
+        return self.by_seller.offsets[-1]
+
+    def add_seller(self, uid, num_produk):
+        self.seller.append(uid)
+        self.by_seller.append_count(num_produk)
+
+    def produk_range(self, seller_pos):
+        """Return (first, last) no_produk owned by seller at `seller_pos`."""
+        offsets = self.by_seller.offsets
+        return offsets[seller_pos] + 1, offsets[seller_pos + 1]
+
+    def seller_of(self, no_produk):
+        return self.seller[bisect_right(self.by_seller.offsets, no_produk - 1) - 1]
+
+    def sellers_with_produk(self):
+        """Seller positions owning at least one produk."""
+        return self.by_seller.nonempty()
+
+    def produk_with_varian(self):
+        """no_produk - 1 of every produk with at least one varian."""
+        return self.varian.nonempty()
+
+    def add_varian(self, codes, harga):
+        self.varian.append(codes)
+        self.var_harga.extend(harga)
+
+    def varian_count(self, no_produk):
+        return self.varian.count(no_produk - 1)
+
+    def sku(self, no_produk, j):
+        return sku_for(no_produk, self.varian.child(no_produk - 1, j))
+
+    def harga(self, no_produk, j):
+        return self.var_harga[self.varian.offsets[no_produk - 1] + j]
+
+
+class AliasTable:
+    """Weighted sampling over 0..n-1 with O(1) draws (Vose's alias method)."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if not n or total <= 0:
+            raise ValueError("AliasTable butuh minimal satu bobot positif")
+        scaled = [w * n / total for w in weights]
+        self.prob = array('d', [1.0] * n)
+        self.alias = array('I', range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Sisa di small/large tinggal bobot ~1.0 karena pembulatan float
+
+    def __len__(self):
+        return len(self.prob)
+
+    def draw(self, rng):
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+
+def varian_code(warna_index, ukuran_index=None):
+    return warna_index * 8 + (0 if ukuran_index is None else ukuran_index + 1)
+
+
+def sku_for(no_produk, code):
+    w, u = divmod(code, 8)
+    if u:
+        return f"{no_produk}-{warna[w]}-{ukuran[u - 1]}"
+    return f"{no_produk}-{warna[w]}"
+
+
+def nama_varian_for(code):
+    w, u = divmod(code, 8)
+    if u:
+        return f"Warna: {warna[w]}, Ukuran: {ukuran[u - 1]}"
+    return f"Warna: {warna[w]}"
@@ -0,0 +1,268 @@
+# Runs the registered tables and streams their rows into a writer.
+#
+# Serial runs (workers=1) generate the tables one after another in registry
+# order. With workers > 1 a small scheduler starts every table in its own
+# forked process as soon as all of its dependencies are done, so wall-clock
+# time follows the critical path of the dependency graph instead of the sum
+# of all tables. Each table process writes its rows to a part (see
+# writers.py) and sends back the key spaces it exported; parts are added to
+# the output in registry order, so the output is the same for any number of
+# workers.
+#
+# Chunked tables are cut into ds.chunk_rows-sized id ranges which may in turn
+# run in a process pool; their results are consumed in chunk order.
+#
+# iter_dataset() and iter_records() hand the rows to the caller in process as
+# schema.ROW_TYPES records instead, for tools that do not need SQL text.
+#
+# Delta runs (ds.delta > 0, see state.py) mix the delta number into every
+# seed, so each delta draws fresh streams; delta 0 keeps the original seeds.
+
+import multiprocessing
+import random
+import tempfile
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from operator import attrgetter
+
+from .helpers import chunk_seed
+from .schema import COLUMNS, ROW_TYPES
+from .tables import REGISTRY, Chunked
+from .vocab import PooledFaker, load_pools, make_faker
+from .writers import NullWriter
+
+_worker_ds = None
+_process_fakers = {}
+
+
+def _process_faker(ds):
+    # Satu Faker (atau PooledFaker) per proses, di-seed ulang per tabel/chunk
+    key = (ds.locale, ds.seed) if ds.pools else ds.locale
+    fake = _process_fakers.get(key)
+    if fake is None:
+        if ds.pools:
+            fake = PooledFaker(load_pools(ds.locale, ds.seed, ds.cache_dir))
+        else:
+            fake = make_faker(ds.locale)
+        _process_fakers[key] = fake
+    return fake
+
+
+def seeded_random(ds, table, index=None):
+    """Random and Faker for one table (index=None) or one chunk of it."""
+    index = 'table' if index is None else index
+    seed = chunk_seed(ds.seed, table, f"{index}@{ds.delta}" if ds.delta else index)
+    fake = _process_faker(ds)
+    fake.seed_instance(seed)
+    return random.Random(seed), fake
+
+
+def run_chunk(ds, table, index, lo, hi):
+    """Generate chunk `index` (ids lo..hi-1) of a Chunked table."""
+    rng, fake = seeded_random(ds, table, index)
+    return REGISTRY[table].spec.chunk(ds, rng, fake, lo, hi)
+
+
+def _init_worker(ds):
+    global _worker_ds
+    _worker_ds = ds
+
+
+def _worker_chunk(table, index, lo, hi):
+    return run_chunk(_worker_ds, table, index, lo, hi)
+
+
+def chunk_bounds(units, size, start=0):
+    end = start + units
+    return [(i, lo, min(lo + size, end)) for i, lo in enumerate(range(start, end, size))]
+
+
+def iter_chunks(ds, table, units, workers=1):
+    """Yield (rows, part) for every chunk of `table`, in chunk order."""
+    bounds = chunk_bounds(units, ds.chunk_rows, REGISTRY[table].spec.start(ds))
+    if workers <= 1 or len(bounds) <= 1:
+        for index, lo, hi in bounds:
+            yield run_chunk(ds, table, index, lo, hi)
+        return
+    # Pool baru per tabel: worker perlu key space yang sudah terisi tabel sebelumnya
+    with multiprocessing.Pool(min(workers, len(bounds)), initializer=_init_worker, initargs=(ds,)) as pool:
+        pending = deque()
+        for index, lo, hi in bounds:
+            pending.append(pool.apply_async(_worker_chunk, (table, index, lo, hi)))
+            # Batasi chunk yang menunggu agar memori tetap terbatas
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def iter_rows(ds, table, workers=1):
+    """Yield the rows (and comment strings) of one table."""
+    spec = REGISTRY[table].spec
+    if not isinstance(spec, Chunked):
+        rng, fake = seeded_random(ds, table)
+        yield from spec(ds, rng, fake)
+        return
+    units = spec.units(ds)
+    if isinstance(units, str):
+        yield units
+        return
+    for rows, part in iter_chunks(ds, table, units, workers):
+        if spec.merge is not None:
+            spec.merge(ds, part)
+        yield from rows
+
+
+def iter_records(ds, table, workers=1):
+    """Yield the rows of one table as ROW_TYPES[table] records, without comments.
+
+    The tables it depends on must already be in `ds`, see iter_dataset.
+    """
+    make = ROW_TYPES[table]._make
+    for row in iter_rows(ds, table, workers):
+        if not isinstance(row, str):
+            yield make(row)
+
+
+def iter_dataset(ds, tables=None, workers=1, done=()):
+    """Yield (table, record) for `tables` (default: all but optional) in registry order.
+
+    The in-process counterpart of generate(): no writer and no text. Parent
+    tables outside `tables` are generated into `ds` but not yielded.
+    """
+    order = plan(tables, done)
+    emit = set(order) if tables is None else set(tables) - set(done)
+    _process_faker(ds)
+    for table in order:
+        if table in emit:
+            for record in iter_records(ds, table, workers):
+                yield table, record
+        else:
+            for _ in iter_rows(ds, table, workers):
+                pass
+
+
+def write_table(ds, table, writer, workers=1):
+    """Generate one table into `writer`; returns (row count, total note)."""
+    task = REGISTRY[table]
+    writer.begin_table(table, COLUMNS[table])
+    count = 0
+    for row in iter_rows(ds, table, workers):
+        if isinstance(row, str):
+            writer.comment(row)
+            continue
+        writer.write_row(row)
+        count += 1
+    note = task.note(ds) if task.note else ''
+    writer.end_table(table, count, note)
+    return count, note
+
+
+def plan(tables=None, done=()):
+    """Registry order of `tables` plus every table they depend on, minus `done`.
+
+    `tables` defaults to every table that is not optional.
+    """
+    if tables is None:
+        return [table for table, task in REGISTRY.items() if table not in done and not task.optional]
+    needed = set()
+    stack = list(tables)
+    while stack:
+        table = stack.pop()
+        if table not in REGISTRY:
+            raise ValueError(f"Tabel tidak dikenal: {table}")
+        if table not in needed and table not in done:
+            needed.add(table)
+            stack.extend(REGISTRY[table].deps)
+    return [table for table in REGISTRY if table in needed]
+
+
+def _table_process(ds, table, writer, tmpdir, workers, conn):
+    try:
+        part, handle = writer.part_writer(table, tmpdir)
+        count, note = write_table(ds, table, part, workers)
+        part.close()
+        exports = {path: attrgetter(path)(ds) for path in REGISTRY[table].exports}
+        conn.send(('ok', count, exports, handle))
+    except BaseException:
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _set_export(ds, path, value):
+    owner, _, attr = path.rpartition('.')
+    setattr(attrgetter(owner)(ds) if owner else ds, attr, value)
+
+
+def _generate_concurrent(ds, writer, order, emit, workers, tmpdir, restored):
+    ctx = multiprocessing.get_context('fork')
+    waiting = list(order)
+    running = {}  # conn -> (table, process)
+    done = {table: (0, None) for table in restored}  # table -> (count, handle)
+    next_out = 0
+    with tempfile.TemporaryDirectory(prefix='bustbuy-', dir=tmpdir) as parts_dir:
+        while waiting or running:
+            for table in list(waiting):
+                if len(running) >= workers:
+                    break
+                if all(dep in done for dep in REGISTRY[table].deps):
+                    # Sisa slot worker dipakai untuk pool chunk tabel ini
+                    chunk_workers = max(1, workers - len(running))
+                    recv_conn, send_conn = ctx.Pipe(duplex=False)
+                    target_writer = writer if table in emit else NullWriter()
+                    process = ctx.Process(target=_table_process,
+                                          args=(ds, table, target_writer, parts_dir, chunk_workers, send_conn))
+                    process.start()
+                    send_conn.close()
+                    running[recv_conn] = (table, process)
+                    waiting.remove(table)
+
+            for conn in wait(list(running)):
+                table, process = running.pop(conn)
+                try:
+                    result = conn.recv()
+                except EOFError:
+                    result = ('error', f"proses berhenti dengan exit code {process.exitcode}")
+                process.join()
+                if result[0] == 'error':
+                    for _, other in running.values():
+                        other.terminate()
+                    raise RuntimeError(f"Gagal membuat tabel {table}:\n{result[1]}")
+                _, count, exports, handle = result
+                for path, value in exports.items():
+                    _set_export(ds, path, value)
+                done[table] = (count, handle)
+
+            while next_out < len(order) and order[next_out] in done:
+                table = order[next_out]
+                count, handle = done[table]
+                if table in emit:
+                    writer.add_part(table, COLUMNS[table], count, handle)
+                next_out += 1
+    return {table: done[table][0] for table in order if table in emit}
+
+
+def generate(ds, writer, workers=1, tables=None, tmpdir=None, done=()):
+    """Generate `tables` (default: all but optional) into `writer`; returns {table: row count}.
+
+    Tables outside `tables` that they depend on are generated too, but their
+    rows are discarded, except tables in `done` whose key spaces are already
+    in `ds` (restored from a state manifest). With workers > 1 independent
+    tables run concurrently (this needs the 'fork' start method; elsewhere
+    tables run serially) and table parts are staged in a temporary directory
+    under `tmpdir`.
+    """
+    order = plan(tables, done)
+    emit = set(order) if tables is None else set(tables) - set(done)
+    # Pool dibuat sekali di sini sehingga proses tabel/chunk mewarisinya lewat fork
+    _process_faker(ds)
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        return _generate_concurrent(ds, writer, order, emit, workers, tmpdir, set(done))
+    totals = {}
+    for table in order:
+        count, _ = write_table(ds, table, writer if table in emit else NullWriter(), workers)
+        if table in emit:
+            totals[table] = count
+    return totals
@@ -0,0 +1,201 @@
+# Column order per table, following schemav2.txt
+
+from collections import namedtuple
+
+COLUMNS = {
+    'pengguna': ('email', 'kata_sandi', 'nama_panjang', 'no_telp', 'tgl_lahir', 'foto_profil', 'is_pembeli', 'is_penjual'),
+    'friend': ('email', 'email_following'),
+    'pembeli': ('email', 'alamat_utama_id'),
+    'penjual': ('email', 'foto_ktp', 'foto_diri', 'is_verified'),
+    'alamat': ('alamat_id', 'provinsi', 'kota', 'jalan'),
+    'alamat_alternatif': ('email', 'alamat_id'),
+    'pesanan': ('no_pesanan', 'status_pesanan', 'harga_total', 'metode_bayar', 'catatan', 'waktu_pesan', 'metode_kirim', 'email_pembeli', 'alamat_id', 'email_penjual'),
+    'ulasan': ('email_pembeli', 'no_pesanan', 'konten', 'nilai'),
+    'rincian_pesanan': ('no_pesanan', 'no_produk', 'sku', 'jumlah'),
+    'produk': ('no_produk', 'nama_produk', 'deskripsi', 'email_penjual'),
+    'gambar_produk': ('no_produk', 'gambar'),
+    'tag_produk': ('no_produk', 'tag'),
+    'varian': ('no_produk', 'sku', 'nama_varian', 'stok', 'harga'),
+    'wishlist': ('wishlist_id', 'email_pembeli', 'nama_wishlist'),
+    'keranjang': ('keranjang_id', 'email_pembeli', 'nama_keranjang'),
+    'rincian_wishlist': ('wishlist_id', 'no_produk'),
+    'rincian_keranjang': ('keranjang_id', 'no_produk', 'sku', 'jumlah'),
+    # Tabel ringkasan (summary.py), bukan bagian schemav2.txt
+    'buyer_stats': ('email_pembeli', 'jumlah_pesanan', 'total_belanja', 'jumlah_ulasan_positif'),
+    'tag_counts': ('tag', 'jumlah_produk'),
+}
+
+# Record per tabel (RincianPesanan untuk rincian_pesanan, dst.): tuple
+# bernama, jadi tetap bisa langsung diberikan ke writer. Kelasnya juga
+# atribut modul ini agar bisa di-pickle antar proses.
+ROW_TYPES = {}
+for _table, _columns in COLUMNS.items():
+    _name = ''.join(part.capitalize() for part in _table.split('_'))
+    ROW_TYPES[_table] = globals()[_name] = namedtuple(_name, _columns)
+del _table, _columns, _name
+
+# FOREIGN KEY dari schemav2.txt: (tabel, kolom) --> (tabel induk, kolom induk)
+FOREIGN_KEYS = [
+    ('friend', ('email',), 'pengguna', ('email',)),
+    ('friend', ('email_following',), 'pengguna', ('email',)),
+    ('pembeli', ('email',), 'pengguna', ('email',)),
+    ('pembeli', ('alamat_utama_id',), 'alamat', ('alamat_id',)),
+    ('penjual', ('email',), 'pengguna', ('email',)),
+    ('alamat_alternatif', ('email',), 'pembeli', ('email',)),
+    ('alamat_alternatif', ('alamat_id',), 'alamat', ('alamat_id',)),
+    ('pesanan', ('email_pembeli',), 'pembeli', ('email',)),
+    ('pesanan', ('alamat_id',), 'alamat', ('alamat_id',)),
+    ('pesanan', ('email_penjual',), 'penjual', ('email',)),
+    ('ulasan', ('email_pembeli',), 'pembeli', ('email',)),
+    ('ulasan', ('no_pesanan',), 'pesanan', ('no_pesanan',)),
+    ('rincian_pesanan', ('no_pesanan',), 'pesanan', ('no_pesanan',)),
+    ('rincian_pesanan', ('no_produk', 'sku'), 'varian', ('no_produk', 'sku')),
+    ('produk', ('email_penjual',), 'penjual', ('email',)),
+    ('gambar_produk', ('no_produk',), 'produk', ('no_produk',)),
+    ('tag_produk', ('no_produk',), 'produk', ('no_produk',)),
+    ('varian', ('no_produk',), 'produk', ('no_produk',)),
+    ('wishlist', ('email_pembeli',), 'pembeli', ('email',)),
+    ('keranjang', ('email_pembeli',), 'pembeli', ('email',)),
+    ('rincian_wishlist', ('wishlist_id',), 'wishlist', ('wishlist_id',)),
+    ('rincian_wishlist', ('no_produk',), 'produk', ('no_produk',)),
+    ('rincian_keranjang', ('keranjang_id',), 'keranjang', ('keranjang_id',)),
+    ('rincian_keranjang', ('no_produk', 'sku'), 'varian', ('no_produk', 'sku')),
+    ('buyer_stats', ('email_pembeli',), 'pembeli', ('email',)),
+]
+
+
+def parents(table):
+    """Tables referenced by `table` through a foreign key."""
+    return sorted({parent for child, _, parent, _ in FOREIGN_KEYS if child == table and parent != table})
+
+
+def load_order(tables=None):
+    """Topological order of `tables` (default: all) so parents come before children.
+
+    Ties keep the order of COLUMNS, i.e. schemav2.txt.
+    """
+    tables = list(COLUMNS if tables is None else tables)
+    position = {t: i for i, t in enumerate(COLUMNS)}
+    waiting = {t: set(parents(t)) & set(tables) for t in tables}
+    order = []
+    while waiting:
+        ready = sorted((t for t, deps in waiting.items() if not deps), key=position.get)
+        if not ready:
+            raise ValueError(f"Siklus foreign key di antara: {', '.join(sorted(waiting))}")
+        for t in ready:
+            order.append(t)
+            del waiting[t]
+        for deps in waiting.values():
+            deps.difference_update(ready)
+    return order
+
+
+# Tipe kolom, sama dengan Bustbuy(v3)-add-constraint.sql (tanpa AUTO_INCREMENT
+# agar juga bisa dipakai di SQLite)
+COLUMN_TYPES = {
+    'pengguna': ('VARCHAR(50) NOT NULL', 'VARCHAR(255) NOT NULL', 'VARCHAR(100) NOT NULL', 'VARCHAR(20) NOT NULL',
+                 'DATE NOT NULL', 'VARCHAR(255) DEFAULT NULL', 'BOOLEAN DEFAULT FALSE', 'BOOLEAN DEFAULT FALSE'),
+    'friend': ('VARCHAR(50) NOT NULL', 'VARCHAR(50) NOT NULL'),
+    'pembeli': ('VARCHAR(50) NOT NULL', 'INT NOT NULL'),
+    'penjual': ('VARCHAR(50) NOT NULL', 'VARCHAR(255) DEFAULT NULL', 'VARCHAR(255) DEFAULT NULL', 'BOOLEAN DEFAULT FALSE'),
+    'alamat': ('INT NOT NULL', 'VARCHAR(50) NOT NULL', 'VARCHAR(50) NOT NULL', 'VARCHAR(50) NOT NULL'),
+    'alamat_alternatif': ('VARCHAR(50) NOT NULL', 'INT NOT NULL'),
+    'pesanan': ('INT NOT NULL', 'VARCHAR(50) NOT NULL', 'DECIMAL(15,2) NOT NULL', 'VARCHAR(50) NOT NULL',
+                'VARCHAR(200) DEFAULT NULL', 'DATETIME NOT NULL', 'VARCHAR(50) NOT NULL', 'VARCHAR(50) NOT NULL',
+                'INT NOT NULL', 'VARCHAR(50) NOT NULL'),
+    'ulasan': ('VARCHAR(50) NOT NULL', 'INT NOT NULL', 'TEXT DEFAULT NULL', 'DECIMAL(2,1) NOT NULL'),
+    'rincian_pesanan': ('INT NOT NULL', 'INT NOT NULL', 'VARCHAR(50) NOT NULL', 'INT NOT NULL DEFAULT 1'),
+    'produk': ('INT NOT NULL', 'VARCHAR(100) NOT NULL', 'TEXT DEFAULT NULL', 'VARCHAR(50) NOT NULL'),
+    'gambar_produk': ('INT NOT NULL', 'VARCHAR(255) NOT NULL'),
+    'tag_produk': ('INT NOT NULL', 'VARCHAR(50) NOT NULL'),
+    'varian': ('INT NOT NULL', 'VARCHAR(50) NOT NULL', 'VARCHAR(100) NOT NULL', 'INT NOT NULL DEFAULT 0',
+               'DECIMAL(12,2) NOT NULL'),
+    'wishlist': ('INT NOT NULL', 'VARCHAR(100) NOT NULL', 'VARCHAR(20) DEFAULT NULL'),
+    'keranjang': ('INT NOT NULL', 'VARCHAR(100) NOT NULL', 'VARCHAR(20) DEFAULT NULL'),
+    'rincian_wishlist': ('INT NOT NULL', 'INT NOT NULL'),
+    'rincian_keranjang': ('INT NOT NULL', 'INT NOT NULL', 'VARCHAR(50) NOT NULL', 'INT NOT NULL DEFAULT 1'),
+    'buyer_stats': ('VARCHAR(50) NOT NULL', 'INT NOT NULL DEFAULT 0', 'DECIMAL(20,2) NOT NULL DEFAULT 0',
+                    'INT NOT NULL DEFAULT 0'),
+    'tag_counts': ('VARCHAR(50) NOT NULL', 'INT NOT NULL DEFAULT 0'),
+}
+
+# PRIMARY KEY dari schemav2.txt
+PRIMARY_KEYS = {
+    'pengguna': ('email',),
+    'pembeli': ('email',),
+    'penjual': ('email',),
+    'alamat': ('alamat_id',),
+    'pesanan': ('no_pesanan',),
+    'ulasan': ('email_pembeli', 'no_pesanan'),
+    'rincian_pesanan': ('no_pesanan', 'no_produk', 'sku'),
+    'produk': ('no_produk',),
+    'varian': ('no_produk', 'sku'),
+    'wishlist': ('wishlist_id',),
+    'keranjang': ('keranjang_id',),
+    'buyer_stats': ('email_pembeli',),
+    'tag_counts': ('tag',),
+}
+
+# UNIQUE pada tabel tanpa primary key (Bustbuy(v3)-add-constraint.sql)
+UNIQUE_KEYS = {
+    'friend': ('email', 'email_following'),
+    'alamat_alternatif': ('email', 'alamat_id'),
+    'gambar_produk': ('no_produk', 'gambar'),
+    'tag_produk': ('no_produk', 'tag'),
+    'rincian_wishlist': ('wishlist_id', 'no_produk'),
+    'rincian_keranjang': ('keranjang_id', 'no_produk', 'sku'),
+}
+
+
+def create_table_sql(table):
+    """CREATE TABLE IF NOT EXISTS for `table`, valid in both MySQL and SQLite."""
+    lines = [f"    {column} {type_}" for column, type_ in zip(COLUMNS[table], COLUMN_TYPES[table])]
+    if table in PRIMARY_KEYS:
+        lines.append(f"    PRIMARY KEY ({', '.join(PRIMARY_KEYS[table])})")
+    if table in UNIQUE_KEYS:
+        lines.append(f"    UNIQUE ({', '.join(UNIQUE_KEYS[table])})")
+    for child, columns, parent, parent_columns in FOREIGN_KEYS:
+        if child == table:
+            lines.append(f"    FOREIGN KEY ({', '.join(columns)}) REFERENCES {parent}({', '.join(parent_columns)})")
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n" + ',\n'.join(lines) + "\n)"
+
+
+# Index sekunder dari blok INDEXING di Bustbuy(v3)-add-constraint.sql
+INDEXES = {
+    'idx_pengguna_is_pembeli': ('pengguna', ('is_pembeli',)),
+    'idx_pengguna_is_penjual': ('pengguna', ('is_penjual',)),
+    'idx_friend_email_following': ('friend', ('email_following',)),
+    'idx_pembeli_alamat': ('pembeli', ('alamat_utama_id',)),
+    'idx_penjual_is_verified': ('penjual', ('is_verified',)),
+    'idx_alternatif_alamat': ('alamat_alternatif', ('alamat_id',)),
+    'idx_pesanan_email_pembeli': ('pesanan', ('email_pembeli',)),
+    'idx_pesanan_email_penjual': ('pesanan', ('email_penjual',)),
+    'idx_pesanan_alamat_id': ('pesanan', ('alamat_id',)),
+    'idx_ulasan_nilai': ('ulasan', ('nilai',)),
+    'idx_rincian_no_produk_sku': ('rincian_pesanan', ('no_produk', 'sku')),
+    'idx_produk_email_penjual': ('produk', ('email_penjual',)),
+    'idx_gambar_produk': ('gambar_produk', ('no_produk',)),
+    'idx_tag_produk': ('tag_produk', ('tag',)),
+    'idx_varian_stok': ('varian', ('stok',)),
+    'idx_varian_harga': ('varian', ('harga',)),
+    'idx_wishlist_id': ('wishlist', ('wishlist_id',)),
+    'idx_rincian_wishlist': ('rincian_wishlist', ('wishlist_id',)),
+    'idx_keranjang_id': ('keranjang', ('keranjang_id',)),
+    'idx_rincian_keranjang': ('rincian_keranjang', ('keranjang_id',)),
+    # Urutan dashboard di tabel ringkasan (Summary.sql)
+    'idx_buyer_stats_total': ('buyer_stats', ('total_belanja',)),
+    'idx_buyer_stats_pesanan': ('buyer_stats', ('jumlah_pesanan',)),
+    'idx_tag_counts_jumlah': ('tag_counts', ('jumlah_produk',)),
+}
+
+
+def create_index_sql(name):
+    table, columns = INDEXES[name]
+    return f"CREATE INDEX {name} ON {table}({', '.join(columns)})"
+
+
+def drop_index_sql(name, dialect):
+    # MySQL butuh nama tabel, SQLite tidak menerimanya
+    if dialect == 'mysql':
+        return f"DROP INDEX {name} ON {INDEXES[name][0]}"
+    return f"DROP INDEX {name}"
@@ -0,0 +1,336 @@
+# Sharded, compressed output for dumps too large for one serial file.
+#
+# ShardedWriter cuts every table into shards of about `shard_bytes`
+# uncompressed bytes, <directory>/<table>/<table>-00001.sql.gz and so on.
+# Every shard stands on its own (INSERT prefix, SET/transaction lines, or
+# plain LOAD DATA input), so a loader can ingest the shards of one table in
+# parallel. Writes are collected in a buffer and handed to a background
+# thread in blocks of `buffer_size` bytes; the thread compresses (gzip, or
+# zstd when the zstandard package is installed) and writes them, so the
+# generator only blocks when more than `max_pending` blocks are waiting.
+#
+# manifest.json lists the tables in foreign key order with their columns,
+# row counts and shards (file, rows, uncompressed and compressed bytes).
+
+import gzip
+import json
+import os
+import queue
+import threading
+
+from .schema import load_order
+from .writers import ExtendedInsertWriter, SqlRowWriter, csv_field, tsv_field, write_load_script
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MANIFEST_VERSION = 1
+
+CODECS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+FORMATS = {'rows': 'sql', 'extended': 'sql', 'csv': 'csv', 'tsv': 'tsv'}
+
+
+def parse_size(text):
+    """'256M' -> 268435456; K, M and G are powers of 1024."""
+    text = text.strip().upper()
+    scale = 1
+    if text and text[-1] in 'KMG':
+        scale = 1024 ** ('KMG'.index(text[-1]) + 1)
+        text = text[:-1]
+    return int(float(text) * scale)
+
+
+class ShardStream:
+    """Binary output file of one shard, optionally compressed."""
+
+    def __init__(self, path, codec='none', level=None):
+        if codec not in CODECS:
+            raise ValueError(f"Kompresi tidak dikenal: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise RuntimeError("Kompresi zstd membutuhkan paket zstandard (pip install zstandard)")
+        self.path = path
+        self.codec = codec
+        self.raw = open(path, 'wb')
+        if codec == 'gzip':
+            # mtime=0 dan tanpa nama file: output identik untuk seed yang sama
+            self.out = gzip.GzipFile(filename='', mode='wb', fileobj=self.raw,
+                                     compresslevel=6 if level is None else level, mtime=0)
+        elif codec == 'zstd':
+            self.out = zstandard.ZstdCompressor(level=3 if level is None else level).stream_writer(self.raw)
+        else:
+            self.out = self.raw
+
+    def write(self, data):
+        self.out.write(data)
+
+    def close(self):
+        if self.codec == 'gzip':
+            self.out.close()
+        elif self.codec == 'zstd':
+            self.out.flush(zstandard.FLUSH_FRAME)
+        self.raw.close()
+
+
+class ShardIO:
+    """Background thread that compresses and writes blocks for shard files.
+
+    After the first error later blocks are dropped, but every shard stream is
+    still closed: by the thread when its close is queued, or by close() for
+    streams that never got that far.
+    """
+
+    def __init__(self, max_pending=16):
+        self.max_pending = max_pending
+        self.queue = None
+        self.thread = None
+        self.error = None
+        self.streams = set()  # stream yang belum ditutup
+
+    def _start(self):
+        self.queue = queue.Queue(maxsize=self.max_pending)
+        self.thread = threading.Thread(target=self._work, daemon=True)
+        self.thread.start()
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            stream, data, entry = item
+            try:
+                if data is None:
+                    self.streams.discard(stream)
+                    stream.close()
+                    entry['compressed_bytes'] = os.path.getsize(stream.path)
+                elif self.error is None:
+                    stream.write(data)
+            except Exception as exc:
+                if self.error is None:
+                    self.error = exc
+
+    def check(self):
+        if self.error is not None:
+            raise RuntimeError(f"Gagal menulis shard: {self.error}") from self.error
+
+    def track(self, stream):
+        self.streams.add(stream)
+
+    def put(self, stream, data, entry=None):
+        if self.thread is None:
+            self._start()
+        self.check()
+        self.queue.put((stream, data, entry))
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        # Shard yang terbuka saat error terjadi tidak sempat mengantre close
+        while self.streams:
+            stream = self.streams.pop()
+            try:
+                stream.close()
+            except Exception as exc:
+                if self.error is None:
+                    self.error = exc
+        self.check()
+
+
+class ShardFile:
+    """Text file object of one shard; whole blocks go to a ShardIO."""
+
+    def __init__(self, io, path, entry, codec='none', level=None, buffer_size=1 << 20):
+        self.io = io
+        self.entry = entry
+        self.stream = ShardStream(path, codec, level)
+        io.track(self.stream)
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.size = 0  # byte tidak terkompresi yang sudah diserahkan ke thread
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def tell(self):
+        return self.size + self.buffered
+
+    def flush(self):
+        if self.buffer:
+            data = ''.join(self.buffer).encode('utf-8')
+            self.buffer = []
+            self.buffered = 0
+            self.size += len(data)
+            self.io.put(self.stream, data)
+
+    def close(self):
+        self.flush()
+        self.entry['bytes'] = self.size
+        self.io.put(self.stream, None, self.entry)
+
+
+class LineWriter:
+    """Shard content for csv/tsv: one LOAD DATA line per row."""
+
+    def __init__(self, f, delimiter='\t'):
+        self.f = f
+        self.delimiter = delimiter
+        self.field = csv_field if delimiter == ',' else tsv_field
+
+    def begin_table(self, table, columns):
+        pass
+
+    def write_row(self, row):
+        self.f.write(self.delimiter.join(map(self.field, row)) + '\n')
+
+    def comment(self, text):
+        pass
+
+    def end_table(self, table, count, note=''):
+        pass
+
+    def close(self):
+        pass
+
+
+class ShardedWriter:
+    """Write every table as shards of about `shard_bytes` plus manifest.json.
+
+    `fmt` is rows, extended, csv or tsv; the keyword arguments of
+    ExtendedInsertWriter (batch_size, max_packet, transactions) are only
+    used by extended, except transactions, which rows uses too. With
+    `disable_checks` every SQL shard switches the checks off and back on
+    itself, since parallel loaders use separate sessions. For uncompressed
+    csv/tsv a load.sql with one LOAD DATA per shard is written too.
+    """
+
+    def __init__(self, directory, fmt='rows', shard_bytes=256 << 20, codec='none', level=None,
+                 buffer_size=1 << 20, max_pending=16, disable_checks=False, **options):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {fmt}")
+        if codec not in CODECS:
+            raise ValueError(f"Kompresi tidak dikenal: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise RuntimeError("Kompresi zstd membutuhkan paket zstandard (pip install zstandard)")
+        if shard_bytes < 1:
+            raise ValueError("shard_bytes harus >= 1")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.shard_bytes = shard_bytes
+        self.codec = codec
+        self.level = level
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.disable_checks = disable_checks
+        self.options = options
+        self.extension = FORMATS[fmt] + CODECS[codec]
+        self.io = ShardIO(max_pending)
+        self.is_part = False
+        self.written = {}  # table -> entry manifest
+        self.table = None
+        self.columns = ()
+        self.file = None
+        self.inner = None
+        self.shard_rows = 0
+
+    def clone(self):
+        return ShardedWriter(self.directory, self.fmt, self.shard_bytes, self.codec, self.level,
+                             self.buffer_size, self.max_pending, self.disable_checks, **self.options)
+
+    def _inner(self, f):
+        if self.fmt == 'rows':
+            return SqlRowWriter(f, self.options.get('transactions', False), self.disable_checks)
+        if self.fmt == 'extended':
+            return ExtendedInsertWriter(f, disable_checks=self.disable_checks, **self.options)
+        return LineWriter(f, ',' if self.fmt == 'csv' else '\t')
+
+    def _open_shard(self):
+        shards = self.written[self.table]['shards']
+        filename = f"{self.table}/{self.table}-{len(shards) + 1:05d}.{self.extension}"
+        entry = {'file': filename, 'rows': 0, 'bytes': 0, 'compressed_bytes': 0}
+        shards.append(entry)
+        self.file = ShardFile(self.io, os.path.join(self.directory, filename), entry,
+                              self.codec, self.level, self.buffer_size)
+        self.inner = self._inner(self.file)
+        self.inner.begin_table(self.table, self.columns)
+        self.shard_rows = 0
+
+    def _close_shard(self):
+        entry = self.file.entry
+        entry['rows'] = self.shard_rows
+        self.inner.end_table(self.table, self.shard_rows, f" (shard {len(self.written[self.table]['shards'])})")
+        self.inner.close()
+        self.file.close()
+        self.file = None
+        self.inner = None
+
+    def begin_table(self, table, columns):
+        os.makedirs(os.path.join(self.directory, table), exist_ok=True)
+        self.table = table
+        self.columns = columns
+        self.written[table] = {'table': table, 'columns': list(columns), 'rows': 0, 'note': '', 'shards': []}
+        self._open_shard()
+
+    def write_row(self, row):
+        # Shard berikutnya baru dibuka saat ada baris, agar tidak ada shard kosong di akhir tabel
+        if self.file is None:
+            self._open_shard()
+        self.inner.write_row(row)
+        self.shard_rows += 1
+        # Extended menahan baris sampai statement penuh, jadi pergantian
+        # shard selalu jatuh di batas statement
+        if self.file.tell() >= self.shard_bytes:
+            self._close_shard()
+
+    def comment(self, text):
+        if self.file is None:
+            self._open_shard()
+        self.inner.comment(text)
+
+    def end_table(self, table, count, note=''):
+        if self.file is not None:
+            self._close_shard()
+        self.written[table]['rows'] = count
+        self.written[table]['note'] = note.strip()
+
+    def part_writer(self, table, tmpdir):
+        # Shard langsung ditulis ke direktori output; entry manifest-nya
+        # dikirim balik setelah part ditutup
+        part = self.clone()
+        part.is_part = True
+        return part, part.written
+
+    def add_part(self, table, columns, count, written):
+        self.written[table] = written[table]
+
+    def manifest(self):
+        return {
+            'version': MANIFEST_VERSION,
+            'format': self.fmt,
+            'codec': self.codec,
+            'shard_bytes': self.shard_bytes,
+            'disable_checks': self.disable_checks,
+            'tables': [self.written[table] for table in load_order(self.written)],
+        }
+
+    def close(self):
+        self.io.close()
+        if self.is_part:
+            return
+        manifest = self.manifest()
+        if self.fmt in ('csv', 'tsv') and self.codec == 'none':
+            entries = [(table['table'], shard['file'], table['columns'], shard['rows'])
+                       for table in manifest['tables'] for shard in table['shards']]
+            write_load_script(os.path.join(self.directory, 'load.sql'), entries,
+                              ',' if self.fmt == 'csv' else '\t', self.disable_checks)
+        tmp = os.path.join(self.directory, 'manifest.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.directory, 'manifest.json'))
@@ -0,0 +1,95 @@
+# Skewed key distributions for foreign key columns.
+#
+# By default every FK is drawn uniformly. ds.skew maps a column of
+# SKEW_COLUMNS to a profile:
+#
+#   uniform          every key equally likely (default)
+#   zipf[:S]         key of rank r gets weight 1 / r^S (default S = 1.0)
+#   power[:A]        every key gets a Pareto(A) weight (default A = 1.16, ~80/20)
+#   hot:P/Q          P% of the keys take Q% of the draws, e.g. hot:20/80
+#
+# Ranks are shuffled over the key space with a seed derived from (seed,
+# column), so hot keys are spread over the ids instead of all being the
+# first ones, and every process builds the same table. Weights go into a
+# keys.AliasTable, so a draw stays O(1); tables are built once per process
+# and cached. rincian_pesanan.no_produk draws inside the seller's own produk
+# range, so it uses one table per range length.
+
+import random
+from functools import lru_cache
+
+from .helpers import chunk_seed
+from .keys import AliasTable
+
+SKEW_COLUMNS = ('pesanan.email_penjual', 'rincian_pesanan.no_produk', 'rincian_keranjang.no_produk',
+                'rincian_wishlist.no_produk')
+
+
+def parse_profile(text):
+    """Canonical form of a profile string; ValueError if it is not valid."""
+    name, _, arg = text.strip().lower().partition(':')
+    try:
+        if name == 'uniform' and not arg:
+            return 'uniform'
+        if name == 'zipf':
+            s = float(arg or 1.0)
+            if s <= 0:
+                raise ValueError
+            return f"zipf:{s:g}"
+        if name == 'power':
+            a = float(arg or 1.16)
+            if a <= 0:
+                raise ValueError
+            return f"power:{a:g}"
+        if name == 'hot':
+            keys, _, draws = arg.partition('/')
+            keys, draws = float(keys), float(draws)
+            if not (0 < keys < 100 and 0 < draws < 100):
+                raise ValueError
+            return f"hot:{keys:g}/{draws:g}"
+    except ValueError:
+        pass
+    raise ValueError(f"Profil distribusi tidak valid: {text!r} (uniform, zipf[:S], power[:A], hot:P/Q)")
+
+
+def parse_skew(text):
+    """'COLUMN=PROFILE' or 'PROFILE' (all SKEW_COLUMNS) -> {column: profile}."""
+    column, sep, profile = text.partition('=')
+    if not sep:
+        return dict.fromkeys(SKEW_COLUMNS, parse_profile(text))
+    if column not in SKEW_COLUMNS:
+        raise ValueError(f"Kolom tidak dikenal untuk skew: {column} (pilih: {', '.join(SKEW_COLUMNS)})")
+    return {column: parse_profile(profile)}
+
+
+def profile_weights(profile, n, rng):
+    """n weights for `profile`, in shuffled rank order."""
+    name, _, arg = profile.partition(':')
+    if name == 'power':
+        alpha = float(arg)
+        return [rng.paretovariate(alpha) for _ in range(n)]
+    if name == 'zipf':
+        s = float(arg)
+        weights = [1.0 / (r + 1) ** s for r in range(n)]
+    else:
+        keys, _, draws = arg.partition('/')
+        hot = min(n, max(1, round(n * float(keys) / 100)))
+        if hot == n:
+            return [1.0] * n
+        share = float(draws) / 100
+        weights = [share / hot] * hot + [(1 - share) / (n - hot)] * (n - hot)
+    rng.shuffle(weights)
+    return weights
+
+
+@lru_cache(maxsize=64)
+def _alias_table(profile, n, seed, column):
+    return AliasTable(profile_weights(profile, n, random.Random(chunk_seed(seed, column, f"skew:{n}"))))
+
+
+def skew_table(ds, column, n):
+    """AliasTable over 0..n-1 for `column`, or None when it is drawn uniformly."""
+    profile = ds.skew.get(column, 'uniform')
+    if profile == 'uniform' or n <= 1:
+        return None
+    return _alias_table(profile, n, ds.seed, column)
@@ -0,0 +1,117 @@
+# Persisted generation state for incremental (delta) runs.
+#
+# save_state() writes a JSON manifest next to a pickle of the Dataset key
+# spaces (UserKeys, ProdukKeys, pesanan_seller and the id counters). The
+# manifest records the seed, the key ranges and counters, and the delta
+# number, which is the RNG position: every table/chunk seed derives from
+# (seed, table, chunk, delta), so delta n+1 continues with fresh streams
+# without replaying anything. load_state() rebuilds a Dataset whose ds.base
+# marks the existing ids; generate_delta() then emits only DELTA_TABLES, all
+# referencing the restored keys, in time proportional to the delta.
+
+import json
+import os
+import pickle
+from datetime import datetime
+
+from .runner import generate
+from .tables import REGISTRY, Dataset
+
+STATE_VERSION = 1
+
+# Atribut Dataset yang disimpan; cukup untuk semua key yang dirujuk tabel delta
+STATE_ATTRS = ('users', 'produk', 'pesanan_seller', 'jumlah_alamat', 'jumlah_wishlist', 'jumlah_keranjang')
+
+# Tabel yang ditambah oleh delta run; tabel lain dianggap sudah lengkap
+DELTA_TABLES = ['pengguna', 'pembeli', 'penjual', 'pesanan', 'rincian_pesanan', 'ulasan',
+                'wishlist', 'keranjang', 'rincian_wishlist', 'rincian_keranjang']
+
+
+def keys_path(path):
+    return f"{os.path.splitext(path)[0]}.keys"
+
+
+def key_ranges(ds):
+    users, produk = ds.users, ds.produk
+    return {
+        'pengguna': len(users),
+        'pembeli': len(users.pembeli),
+        'penjual': len(users.penjual),
+        'penjual_terverifikasi': len(users.verified),
+        'alamat': ds.jumlah_alamat,
+        'produk': len(produk),
+        'varian': len(produk.varian.values),
+        'pesanan': len(ds.pesanan_seller),
+        'wishlist_id_counter': ds.jumlah_wishlist,
+        'keranjang_id_counter': ds.jumlah_keranjang,
+    }
+
+
+def save_state(ds, path, totals, previous=None):
+    """Write the manifest `path` (JSON) and its key space pickle."""
+    keys_file = keys_path(path)
+    tmp = f"{keys_file}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump({attr: getattr(ds, attr) for attr in STATE_ATTRS}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, keys_file)
+    history = list(previous['history']) if previous else []
+    history.append({'delta': ds.delta, 'now': ds.now.isoformat(sep=' '), 'rows': totals})
+    manifest = {
+        'version': STATE_VERSION,
+        'seed': ds.seed,
+        'locale': ds.locale,
+        'chunk_rows': ds.chunk_rows,
+        'vectorized': ds.vectorized,
+        'pools': ds.pools,
+        'skew': ds.skew,
+        'delta': ds.delta,
+        'rng': {'next_delta': ds.delta + 1},
+        'keys': key_ranges(ds),
+        'keys_file': os.path.basename(keys_file),
+        'history': history,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+    return manifest
+
+
+def read_manifest(path):
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != STATE_VERSION:
+        raise ValueError(f"Versi state {path} tidak didukung: {manifest.get('version')}")
+    return manifest
+
+
+def load_state(path, counts=None, now=None, cache_dir=None, skew=None):
+    """Dataset for the next delta of the state at `path`; `counts` are the delta sizes.
+
+    The delta keeps the skew profiles of the state unless `skew` is given.
+    """
+    manifest = read_manifest(path)
+    with open(os.path.join(os.path.dirname(os.path.abspath(path)), manifest['keys_file']), 'rb') as f:
+        keys = pickle.load(f)
+    ds = Dataset(counts, seed=manifest['seed'], locale=manifest['locale'], now=now or datetime.now(),
+                 chunk_rows=manifest['chunk_rows'], vectorized=manifest['vectorized'], pools=manifest['pools'],
+                 cache_dir=cache_dir, skew=manifest.get('skew') if skew is None else skew)
+    for attr in STATE_ATTRS:
+        setattr(ds, attr, keys[attr])
+    if ds.users.base != 0:
+        raise ValueError(f"Key space pengguna di {path} tidak lengkap")
+    ds.delta = manifest['rng']['next_delta']
+    ds.base = {
+        'pengguna': len(ds.users),
+        'pesanan': len(ds.pesanan_seller),
+        'wishlist': ds.jumlah_wishlist,
+        'keranjang': ds.jumlah_keranjang,
+    }
+    return ds, manifest
+
+
+def generate_delta(ds, writer, workers=1, tmpdir=None):
+    """Generate DELTA_TABLES on top of a restored ds; returns {table: row count}."""
+    # Selalu semua tabel delta: state yang disimpan harus cocok dengan baris yang dimuat
+    done = [table for table in REGISTRY if table not in DELTA_TABLES]
+    return generate(ds, writer, workers, DELTA_TABLES, tmpdir, done=done)
@@ -0,0 +1,208 @@
+# Summary tables for the hot analytics queries.
+#
+# query_e.sql aggregates pesanan and ulasan per pembeli and top_5_tags groups
+# all of tag_produk on every read. buyer_stats (jumlah_pesanan, total_belanja
+# and jumlah_ulasan_positif per pembeli) and tag_counts (jumlah_produk per
+# tag) keep those aggregates in one row per pembeli or tag:
+#
+# - the generator writes them when SUMMARY_TABLES are requested (Bustbuy.py
+#   --summary): pesanan, ulasan and tag_produk add to per-pembeli and per-tag
+#   counters while their chunks are merged (tables.py), so there is no second
+#   pass over the rows;
+# - install_summary() adds triggers that keep them current on INSERT, UPDATE
+#   and DELETE of pesanan, ulasan and tag_produk, and points the top_5_tags
+#   view at tag_counts;
+# - refresh_summary() rebuilds them from the base tables in one transaction,
+#   for rows that were loaded while the triggers were not installed.
+#
+# A row whose counters all drop to zero is deleted, so the generator, the
+# triggers and a rebuild leave exactly the same rows. Summary.sql (tables)
+# and Summary-trigger.sql (triggers, procedure refresh_summary, view) are the
+# MySQL version for the mysql client; summary_script() writes them.
+
+from .loader import connector, create_schema
+from .schema import COLUMNS, INDEXES, create_index_sql, create_table_sql
+
+SUMMARY_TABLES = ('buyer_stats', 'tag_counts')
+
+POSITIVE = 4.0  # nilai ulasan positif, sama dengan query_e.sql
+
+# (tabel sumber, tabel ringkasan, baris OLD/NEW -> nilai per kolom ringkasan,
+#  baris OLD/NEW -> syarat baris ikut dihitung, syarat UPDATE mengubah ringkasan)
+_SOURCES = [
+    ('pesanan', 'buyer_stats', lambda row: (f"{row}.email_pembeli", '1', f"{row}.harga_total", '0'), None,
+     "OLD.email_pembeli <> NEW.email_pembeli OR OLD.harga_total <> NEW.harga_total"),
+    ('ulasan', 'buyer_stats', lambda row: (f"{row}.email_pembeli", '0', '0', '1'),
+     lambda row: f"{row}.nilai >= {POSITIVE}",
+     f"OLD.email_pembeli <> NEW.email_pembeli OR (OLD.nilai >= {POSITIVE}) <> (NEW.nilai >= {POSITIVE})"),
+    ('tag_produk', 'tag_counts', lambda row: (f"{row}.tag", '1'), None, "OLD.tag <> NEW.tag"),
+]
+
+# Baris ringkasan dihapus jika semua penghitung ini nol (total_belanja ikut nol)
+_COUNTERS = {
+    'buyer_stats': ('jumlah_pesanan', 'jumlah_ulasan_positif'),
+    'tag_counts': ('jumlah_produk',),
+}
+
+REBUILD = [
+    "DELETE FROM buyer_stats",
+    f"""INSERT INTO buyer_stats (email_pembeli, jumlah_pesanan, total_belanja, jumlah_ulasan_positif)
+SELECT email_pembeli, SUM(jumlah_pesanan), SUM(total_belanja), SUM(jumlah_ulasan_positif)
+FROM (
+    SELECT email_pembeli, COUNT(*) AS jumlah_pesanan, SUM(harga_total) AS total_belanja,
+        0 AS jumlah_ulasan_positif
+    FROM pesanan
+    GROUP BY email_pembeli
+    UNION ALL
+    SELECT email_pembeli, 0, 0, COUNT(*)
+    FROM ulasan
+    WHERE nilai >= {POSITIVE}
+    GROUP BY email_pembeli
+) AS s
+GROUP BY email_pembeli""",
+    "DELETE FROM tag_counts",
+    """INSERT INTO tag_counts (tag, jumlah_produk)
+SELECT tag, COUNT(*)
+FROM tag_produk
+GROUP BY tag""",
+]
+
+# top_5_tags (Bustbuy(v3)-add-constraint.sql) dari tag_counts, tanpa GROUP BY atas tag_produk
+TOP_5_TAGS = """SELECT tag, jumlah_produk
+FROM tag_counts
+ORDER BY jumlah_produk DESC
+LIMIT 5"""
+
+
+def _add(dialect, summary, values, where=None):
+    # Upsert yang menambahkan `values` ke baris ringkasan
+    key = COLUMNS[summary][0]
+    changed = [column for column, value in zip(COLUMNS[summary][1:], values[1:]) if value != '0']
+    if where:
+        source = f"SELECT {', '.join(values)}{' FROM DUAL' if dialect == 'mysql' else ''} WHERE {where}"
+    else:
+        source = f"VALUES ({', '.join(values)})"
+    insert = f"INSERT INTO {summary} ({', '.join(COLUMNS[summary])}) {source}"
+    if dialect == 'mysql':
+        return insert + " ON DUPLICATE KEY UPDATE " + ', '.join(f"{c} = {c} + VALUES({c})" for c in changed)
+    return insert + f" ON CONFLICT ({key}) DO UPDATE SET " + ', '.join(f"{c} = {c} + excluded.{c}" for c in changed)
+
+
+def _subtract(summary, values, where=None):
+    # Kurangi `values` dari baris ringkasan, lalu hapus baris yang penghitungnya nol
+    key = COLUMNS[summary][0]
+    condition = f"{key} = {values[0]}" + (f" AND {where}" if where else '')
+    amounts = [(column, value) for column, value in zip(COLUMNS[summary][1:], values[1:]) if value != '0']
+    return [
+        f"UPDATE {summary} SET " + ', '.join(f"{c} = {c} - {a}" for c, a in amounts) + f" WHERE {condition}",
+        f"DELETE FROM {summary} WHERE {condition} AND " + ' AND '.join(f"{c} = 0" for c in _COUNTERS[summary]),
+    ]
+
+
+def triggers():
+    """[(name, event, table, condition or None, {dialect: [statement]})]."""
+    result = []
+    for table, summary, values, counted, changed in _SOURCES:
+        when = counted or (lambda row: None)
+        old, new = values('OLD'), values('NEW')
+        statements = {
+            'INSERT': lambda dialect: [_add(dialect, summary, new)],
+            'UPDATE': lambda dialect: _subtract(summary, old, when('OLD')) + [_add(dialect, summary, new, when('NEW'))],
+            'DELETE': lambda dialect: _subtract(summary, old),
+        }
+        conditions = {'INSERT': when('NEW'), 'UPDATE': changed, 'DELETE': when('OLD')}
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            result.append((f"trg_{summary}_{table}_{event.lower()}", event, table, conditions[event],
+                           {dialect: statements[event](dialect) for dialect in ('mysql', 'sqlite')}))
+    return result
+
+
+def trigger_sql(name, event, table, condition, statements, dialect):
+    """CREATE TRIGGER for one entry of triggers()."""
+    head = f"CREATE TRIGGER {name}\nAFTER {event} ON {table}\nFOR EACH ROW\n"
+    if dialect == 'mysql':
+        indent = '        ' if condition else '    '
+        body = ''.join(f"{indent}{statement};\n" for statement in statements[dialect])
+        if condition:
+            body = f"    IF {condition} THEN\n{body}    END IF;\n"
+        return f"{head}BEGIN\n{body}END"
+    body = ''.join(f"    {statement};\n" for statement in statements[dialect])
+    return head + (f"WHEN {condition}\n" if condition else '') + f"BEGIN\n{body}END"
+
+
+def install_summary(url):
+    """Create the summary tables (if missing), their triggers and the top_5_tags view.
+
+    The tables are not filled: load them with the generator or call
+    refresh_summary() afterwards.
+    """
+    create_schema(url, SUMMARY_TABLES)
+    connect, _, dialect = connector(url)
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        for name, event, table, condition, statements in triggers():
+            cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cur.execute(trigger_sql(name, event, table, condition, statements, dialect))
+        if dialect == 'mysql':
+            cur.execute(f"CREATE OR REPLACE VIEW top_5_tags AS\n{TOP_5_TAGS}")
+        else:
+            cur.execute("DROP VIEW IF EXISTS top_5_tags")
+            cur.execute(f"CREATE VIEW top_5_tags AS\n{TOP_5_TAGS}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def refresh_summary(url):
+    """Rebuild the summary tables from pesanan, ulasan and tag_produk; returns {table: rows}."""
+    connect, _, _ = connector(url)
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        for statement in REBUILD:
+            cur.execute(statement)
+        counts = {}
+        for table in SUMMARY_TABLES:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cur.fetchone()[0]
+        conn.commit()
+        return counts
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+_SCRIPT_HEADER = {
+    'tables': """-- Tabel ringkasan buyer_stats dan tag_counts (dibuat dari bustbuy_gen/summary.py,
+-- summary_script('tables')). Jalankan sesudah skema utama dan sebelum memuat dump dari
+-- Bustbuy.py --summary.
+
+""",
+    'triggers': """-- Trigger yang menjaga buyer_stats dan tag_counts, prosedur refresh_summary() dan view
+-- top_5_tags dari tag_counts (dibuat dari bustbuy_gen/summary.py, summary_script('triggers')).
+-- Jalankan sesudah data dimuat. Jika dump tidak dibuat dengan --summary, isi tabelnya
+-- sekali dengan: CALL refresh_summary();
+
+""",
+}
+
+
+def summary_script(part):
+    """MySQL script for the mysql client: 'tables' (Summary.sql) or 'triggers' (Summary-trigger.sql)."""
+    if part == 'tables':
+        statements = [create_table_sql(table) for table in SUMMARY_TABLES]
+        statements += [create_index_sql(name) for name, (table, _) in INDEXES.items() if table in SUMMARY_TABLES]
+        return (_SCRIPT_HEADER['tables'] + '\n'.join(f"{statement};\n" for statement in statements))
+    lines = [_SCRIPT_HEADER['triggers'] + "DELIMITER //", ""]
+    for name, event, table, condition, statements in triggers():
+        lines += [f"DROP TRIGGER IF EXISTS {name}//",
+                  trigger_sql(name, event, table, condition, statements, 'mysql') + "//", ""]
+    lines += ["DROP PROCEDURE IF EXISTS refresh_summary//",
+              "CREATE PROCEDURE refresh_summary()\nBEGIN\n    START TRANSACTION;\n"
+              + ''.join('    ' + statement.replace('\n', '\n    ') + ';\n' for statement in REBUILD)
+              + "    COMMIT;\nEND//", "", "DELIMITER ;", "",
+              f"CREATE OR REPLACE VIEW top_5_tags AS\n{TOP_5_TAGS};", ""]
+    return '\n'.join(lines)
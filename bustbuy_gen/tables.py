@@ -0,0 +1,557 @@
+# Per-table row generators and the table registry.
+#
+# Small tables are generator functions fn(ds, rng, fake) that yield rows as
+# tuples in the column order of schema.COLUMNS. A generator may also yield a
+# plain string, which writers emit as an SQL comment. The large tables are
+# Chunked: they are split into fixed id ranges and every chunk gets its own
+# rng/Faker. All seeds derive from (seed, table[, chunk]), so a table's rows
+# depend only on the seed and its parent key spaces, never on the order or
+# the process in which tables run (see runner.py).
+#
+# Every table is registered with the tables it depends on: its foreign key
+# parents from schema.FOREIGN_KEYS plus any extra key space it reads
+# (`after`), and the Dataset attributes it fills for its children
+# (`exports`). No generator keeps per-row state beyond the compact arrays in
+# keys.py, so memory stays bounded as the scale grows.
+#
+# For delta runs (state.py) the Dataset starts from restored key spaces:
+# ds.base holds how many ids of a table already exist, Chunked tables number
+# their new ids after it and the child generators only visit new parents.
+#
+# The numeric, date and categorical columns of the big tables are drawn per
+# chunk (or per block of produk) with the column engine from columns.py;
+# the row loops only assemble strings and call Faker.
+
+import random
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from . import config
+from .columns import HAVE_NUMPY, column_source
+from .config import scaled_counts
+from .helpers import (
+    birth_day_range, even_share, format_phone_number, generate_file_path, generate_list_name,
+    generate_password,
+)
+from .keys import ProdukKeys, UserKeys, nama_varian_for, sku_for, varian_code
+from .schema import parents
+from .skew import skew_table
+from .vocab import default_cache_dir
+
+# Ukuran chunk tetap; mengubahnya mengubah output untuk seed yang sama
+CHUNK_ROWS = 10000
+# Jumlah produk per blok kolom varian
+VARIAN_BLOCK = 10000
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class Dataset:
+    """Generation state: counts, random sources and parent key spaces."""
+
+    def __init__(self, counts=None, seed=None, locale='id_ID', now=None, chunk_rows=CHUNK_ROWS,
+                 vectorized=None, pools=True, cache_dir=None, skew=None):
+        if vectorized and not HAVE_NUMPY:
+            raise RuntimeError("vectorized=True perlu numpy")
+        self.counts = counts or scaled_counts()
+        # Pool kosakata (vocab.py) hanya disimpan di disk untuk seed yang bisa dipakai ulang
+        self.pools = pools
+        self.cache_dir = cache_dir or (default_cache_dir() if seed is not None else None)
+        self.seed = seed if seed is not None else random.randrange(1 << 63)
+        self.locale = locale
+        self.chunk_rows = chunk_rows
+        # None: pakai numpy jika terpasang (output berbeda dengan engine Python)
+        self.vectorized = HAVE_NUMPY if vectorized is None else vectorized
+        self.now = (now or datetime.now()).replace(microsecond=0)
+        # Kolom FK -> profil distribusi (skew.py); kolom lain diundi merata
+        self.skew = dict(skew or {})
+        self.users = UserKeys()
+        self.produk = ProdukKeys()
+        self.pesanan_seller = array('I')  # no_pesanan - 1 -> posisi seller di produk.seller
+        # Agregat untuk tabel ringkasan, dijumlah saat chunk di-merge: per posisi
+        # di users.pembeli (harga_total dalam sen agar penjumlahan eksak) dan per tag
+        self.buyer_orders = array('I')
+        self.buyer_cents = array('q')
+        self.buyer_reviews = array('I')
+        self.tag_counts = {}
+        self.jumlah_alamat = 0
+        self.jumlah_wishlist = 0
+        self.jumlah_keranjang = 0
+        # Delta run: nomor delta dan jumlah id yang sudah ada per tabel (lihat state.py)
+        self.delta = 0
+        self.base = {}
+
+    def new_ids(self, table, ids):
+        """The ids in sorted array `ids` created in this run (all of them unless delta)."""
+        start = self.base.get(table, 0)
+        return ids[bisect_left(ids, start):] if start else ids
+
+
+class Chunked:
+    """A table generated in independent id-range chunks.
+
+    units(ds) is the size of the id range, or a string explaining why the
+    table is skipped. chunk(ds, rng, fake, lo, hi) returns (rows, part) for
+    ids lo..hi-1 using only the given rng/fake; merge(ds, part) folds `part`
+    into the parent key spaces and is called in chunk order. The id range
+    starts at ds.base[base] (0 outside delta runs).
+    """
+
+    def __init__(self, units, chunk, merge=None, base=None):
+        self.units = units
+        self.chunk = chunk
+        self.merge = merge
+        self.base = base
+
+    def start(self, ds):
+        return ds.base.get(self.base, 0) if self.base else 0
+
+
+# 1. Tabel pengguna (chunk: uid lo..hi-1)
+def pengguna_chunk(ds, rng, fake, lo, hi):
+    part = UserKeys(base=lo)
+    cols = column_source(ds, rng)
+    n = hi - lo
+    domains = cols.integers(0, len(config.domains) - 1, n)
+    phones = cols.integers(0, 10 ** 9 - 1, n)
+    birth_dates = cols.days_ago(ds.now.date(), *birth_day_range(18, 80), n, '%Y-%m-%d')
+    # edit for specialization
+    roles = cols.coin(n, 2 / 3)
+    rows = []
+    for k in range(n):
+        nama_depan = fake.first_name()
+        nama_belakang = fake.last_name()
+        nama_panjang = f"{nama_depan} {nama_belakang}"
+        uid = part.add(nama_depan, domains[k])
+        kata_sandi = generate_password(rng, nama_panjang)
+        no_telp = format_phone_number(phones[k])
+        tgl_lahir = birth_dates[k]
+
+        is_pembeli = roles[k]
+        if is_pembeli:
+            part.pembeli.append(uid)
+        else:
+            part.penjual.append(uid)
+
+        rows.append((part.email(uid), kata_sandi, nama_panjang, no_telp, tgl_lahir, None, is_pembeli, not is_pembeli))
+    return rows, part
+
+
+pengguna = Chunked(
+    units=lambda ds: ds.counts['pengguna'],
+    chunk=pengguna_chunk,
+    merge=lambda ds, part: ds.users.merge(part),
+    base='pengguna',
+)
+
+
+# 2. Tabel alamat
+def alamat(ds, rng, fake):
+    for i in range(1, ds.counts['alamat'] + 1):
+        ds.jumlah_alamat = i
+        yield (i, fake.administrative_unit(), fake.city(), fake.street_address())
+
+
+# 3. Tabel pembeli (pengguna dengan is_pembeli = TRUE)
+def pembeli(ds, rng, fake):
+    users = ds.users
+    if not ds.jumlah_alamat:
+        yield "Tidak ada alamat untuk pembeli"
+        return
+    for uid in ds.new_ids('pengguna', users.pembeli):
+        yield (users.email(uid), rng.randint(1, ds.jumlah_alamat))
+
+
+# 4. Tabel penjual (pengguna dengan is_penjual = TRUE)
+def penjual(ds, rng, fake):
+    users = ds.users
+    for uid in ds.new_ids('pengguna', users.penjual):
+        foto_ktp = generate_file_path(fake, 'ktp')
+        foto_diri = generate_file_path(fake, 'selfie')
+        is_verified = rng.random() < 0.5
+        if is_verified:
+            users.verified.append(uid)
+        yield (users.email(uid), foto_ktp, foto_diri, is_verified)
+
+
+# 5. Tabel friend: setiap pengguna mendapat bagian yang sama dari jumlah relasi,
+# followee diambil dengan random.sample sehingga pasangan selalu unik
+def friend(ds, rng, fake):
+    users = ds.users
+    n = len(users)
+    total = min(ds.counts['friend'], n * (n - 1))
+    for uid in range(n):
+        email = users.email(uid)
+        for other in rng.sample(range(n - 1), even_share(total, n, uid)):
+            yield (email, users.email(other if other < uid else other + 1))
+
+
+# 6. Tabel alamat_alternatif: pola yang sama dengan friend, per pembeli
+def alamat_alternatif(ds, rng, fake):
+    users = ds.users
+    n = len(users.pembeli)
+    total = min(ds.counts['alamat_alternatif'], n * ds.jumlah_alamat)
+    for i, uid in enumerate(users.pembeli):
+        email = users.email(uid)
+        for alamat_id in rng.sample(range(1, ds.jumlah_alamat + 1), even_share(total, n, i)):
+            yield (email, alamat_id)
+
+
+# 7. Tabel produk (distribusi merata ke penjual terverifikasi)
+def produk(ds, rng, fake):
+    users, keys = ds.users, ds.produk
+    jumlah_produk = ds.counts['produk']
+    if not users.verified:
+        yield "Tidak ada penjual terverifikasi untuk produk"
+        return
+    produk_per_penjual = max(5, jumlah_produk // len(users.verified))  # Minimal 5 produk
+    produk_index = 1
+    for uid in users.verified:
+        num_produk = min(produk_per_penjual, jumlah_produk - len(keys))
+        if num_produk <= 0:
+            break
+        keys.add_seller(uid, num_produk)
+        email_penjual = users.email(uid)
+        for _ in range(num_produk):
+            nama_produk = f"{rng.choice(config.produk_nama)} {fake.word().capitalize()}"
+            yield (produk_index, nama_produk, rng.choice(config.deskripsi), email_penjual)
+            produk_index += 1
+
+
+# 8. Tabel gambar_produk (1-3 gambar per produk, uuid sudah unik)
+def gambar_produk(ds, rng, fake):
+    for no_produk in range(1, len(ds.produk) + 1):
+        for _ in range(rng.randint(1, 3)):
+            yield (no_produk, generate_file_path(fake, 'produk'))
+
+
+# 9. Tabel tag_produk (1-3 tag per produk), sekaligus menghitung produk per tag
+def tag_produk(ds, rng, fake):
+    ds.tag_counts = counts = {}
+    for no_produk in range(1, len(ds.produk) + 1):
+        for tag in rng.sample(config.tags, rng.randint(1, 3)):
+            counts[tag] = counts.get(tag, 0) + 1
+            yield (no_produk, tag)
+
+
+# 10. Tabel varian (2-5 varian per produk, kolom diambil per blok produk)
+def varian(ds, rng, fake):
+    keys = ds.produk
+    cols = column_source(ds, rng)
+    for start in range(1, len(keys) + 1, VARIAN_BLOCK):
+        stop = min(start + VARIAN_BLOCK, len(keys) + 1)
+        attempts = cols.integers(2, 5, stop - start)
+        n = sum(attempts)
+        warna = cols.integers(0, len(config.warna) - 1, n)
+        has_ukuran = cols.coin(n)
+        ukuran = cols.integers(0, len(config.ukuran) - 1, n)
+        stok = cols.integers(0, 100, n)
+        harga = cols.uniform(50000, 1000000, n, 2)
+        pos = 0
+        for no_produk, tries in zip(range(start, stop), attempts):
+            codes, prices = [], []
+            for k in range(pos, pos + tries):
+                code = varian_code(warna[k], ukuran[k] if has_ukuran[k] else None)
+                if code in codes:
+                    continue
+                codes.append(code)
+                prices.append(harga[k])
+                yield (no_produk, sku_for(no_produk, code), nama_varian_for(code), stok[k], harga[k])
+            pos += tries
+            keys.add_varian(codes, prices)
+
+
+def buyer_array(ds, attr, typecode):
+    # Array agregat nol sepanjang users.pembeli, dibuat sebelum chunk pertama
+    values = array(typecode, bytes(array(typecode).itemsize * len(ds.users.pembeli)))
+    setattr(ds, attr, values)
+    return values
+
+
+# 11. Tabel pesanan (chunk: no_pesanan lo+1..hi)
+def pesanan_units(ds):
+    buyer_array(ds, 'buyer_orders', 'I')
+    buyer_array(ds, 'buyer_cents', 'q')
+    if not ds.produk.sellers_with_produk():
+        return "Tidak ada penjual dengan produk untuk pesanan"
+    if not ds.users.pembeli or not ds.jumlah_alamat:
+        return "Tidak ada pembeli atau alamat untuk pesanan"
+    # Tabel alias dibangun di sini agar proses chunk mewarisinya lewat fork
+    skew_table(ds, 'pesanan.email_penjual', len(ds.produk.sellers_with_produk()))
+    return ds.counts['pesanan']
+
+
+def pesanan_chunk(ds, rng, fake, lo, hi):
+    users, keys = ds.users, ds.produk
+    cols = column_source(ds, rng)
+    n = hi - lo
+    status = cols.choice(config.status_pesanan, n)
+    harga_total = cols.uniform(100000, 5000000, n, 2)
+    metode_bayar = cols.choice(config.metode_bayar, n)
+    has_catatan = cols.coin(n)
+    waktu_pesan = cols.days_ago(ds.now, 1, 365, n, TIMESTAMP_FORMAT)
+    metode_kirim = cols.choice(config.metode_kirim, n)
+    pembeli = cols.integers(0, len(users.pembeli) - 1, n)
+    alamat_id = cols.integers(1, ds.jumlah_alamat, n)
+    with_produk = keys.sellers_with_produk()
+    skewed = skew_table(ds, 'pesanan.email_penjual', len(with_produk))
+    picks = cols.weighted(skewed, n) if skewed else cols.integers(0, len(with_produk) - 1, n)
+    sellers = array('I', (with_produk[k] for k in picks))
+
+    rows = []
+    for k in range(n):
+        catatan = fake.sentence() if has_catatan[k] else None
+        rows.append((lo + 1 + k, status[k], harga_total[k], metode_bayar[k], catatan, waktu_pesan[k],
+                     metode_kirim[k], users.email(users.pembeli[pembeli[k]]), alamat_id[k],
+                     users.email(keys.seller[sellers[k]])))
+    return rows, (sellers, pembeli, [round(harga * 100) for harga in harga_total])
+
+
+def pesanan_merge(ds, part):
+    sellers, pembeli, cents = part
+    ds.pesanan_seller.extend(sellers)
+    orders, spent = ds.buyer_orders, ds.buyer_cents
+    for k, sen in zip(pembeli, cents):
+        orders[k] += 1
+        spent[k] += sen
+
+
+pesanan = Chunked(
+    units=pesanan_units,
+    chunk=pesanan_chunk,
+    merge=pesanan_merge,
+    base='pesanan',
+)
+
+
+# Baris rincian (induk, no_produk, sku, jumlah) dari item yang sudah diundi;
+# varian ganda dalam satu induk dilewati
+def rincian_rows(keys, cols, parents, items, produk):
+    variants = cols.below([keys.varian_count(no_produk) for no_produk in produk])
+    jumlah = cols.integers(1, 5, len(produk))  # jumlah > 0 sesuai CHECK
+    rows = []
+    pos = 0
+    for parent, count in zip(parents, items):
+        used = set()
+        for k in range(pos, pos + count):
+            item = (produk[k], variants[k])
+            if item not in used:
+                used.add(item)
+                rows.append((parent, produk[k], keys.sku(*item), jumlah[k]))
+        pos += count
+    return rows
+
+
+# 12. Tabel rincian_pesanan (1-3 item per pesanan, sesuai penjual)
+def rincian_pesanan_chunk(ds, rng, fake, lo, hi):
+    keys = ds.produk
+    cols = column_source(ds, rng)
+    ranges = [keys.produk_range(pos) for pos in ds.pesanan_seller[lo:hi]]
+    items = [1 + k for k in cols.below([min(3, last - first + 1) for first, last in ranges])]
+    spans = [(first, last - first + 1) for (first, last), count in zip(ranges, items) for _ in range(count)]
+    if ds.skew.get('rincian_pesanan.no_produk', 'uniform') != 'uniform':
+        # Satu tabel alias per panjang rentang produk penjual
+        offsets = cols.weighted_each([skew_table(ds, 'rincian_pesanan.no_produk', span) for _, span in spans])
+    else:
+        offsets = cols.below([span for _, span in spans])
+    produk = [first + offset for (first, _), offset in zip(spans, offsets)]
+    return rincian_rows(keys, cols, range(lo + 1, hi + 1), items, produk), None
+
+
+rincian_pesanan = Chunked(
+    units=lambda ds: len(ds.pesanan_seller) - ds.base.get('pesanan', 0),
+    chunk=rincian_pesanan_chunk,
+    base='pesanan',
+)
+
+
+# 13. Tabel ulasan: pesanan dipilih tanpa pengulangan, jadi
+# (email_pembeli, no_pesanan) selalu unik. Setiap chunk pesanan mendapat
+# bagian ulasan sebanding dengan ukurannya.
+def ulasan_units(ds):
+    buyer_array(ds, 'buyer_reviews', 'I')
+    jumlah_pesanan = len(ds.pesanan_seller) - ds.base.get('pesanan', 0)
+    if not jumlah_pesanan:
+        return "Tidak ada pesanan untuk ulasan"
+    return jumlah_pesanan
+
+
+def ulasan_chunk(ds, rng, fake, lo, hi):
+    users = ds.users
+    cols = column_source(ds, rng)
+    # Hanya pesanan baru (delta) yang diulas, jadi posisinya relatif terhadap base
+    start = ds.base.get('pesanan', 0)
+    jumlah_pesanan = len(ds.pesanan_seller) - start
+    total = min(ds.counts['ulasan'], jumlah_pesanan)
+    quota = total * (hi - start) // jumlah_pesanan - total * (lo - start) // jumlah_pesanan
+    no_pesanan = cols.sample_sorted(hi - lo, quota)
+    pembeli = cols.integers(0, len(users.pembeli) - 1, quota)
+    has_konten = cols.coin(quota)
+    nilai = cols.uniform(0, 5, quota, 1)
+    rows = []
+    for k in range(quota):
+        konten = fake.paragraph() if has_konten[k] else None
+        rows.append((users.email(users.pembeli[pembeli[k]]), lo + 1 + no_pesanan[k], konten, nilai[k]))
+    # Ulasan positif (nilai >= 4, seperti query_e.sql) per pembeli untuk buyer_stats
+    return rows, [k for k, v in zip(pembeli, nilai) if v >= 4]
+
+
+def ulasan_merge(ds, positive):
+    reviews = ds.buyer_reviews
+    for k in positive:
+        reviews[k] += 1
+
+
+ulasan = Chunked(units=ulasan_units, chunk=ulasan_chunk, merge=ulasan_merge, base='pesanan')
+
+
+# 14. Tabel wishlist (1-3 per pembeli, dengan nama_wishlist)
+def wishlist(ds, rng, fake):
+    users = ds.users
+    for uid in ds.new_ids('pengguna', users.pembeli):
+        email = users.email(uid)
+        for _ in range(rng.randint(1, 3)):
+            ds.jumlah_wishlist += 1
+            yield (ds.jumlah_wishlist, email, generate_list_name(rng, "Wishlist"))
+
+
+# 15. Tabel keranjang (1-3 per pembeli, dengan nama_keranjang)
+def keranjang(ds, rng, fake):
+    users = ds.users
+    for uid in ds.new_ids('pengguna', users.pembeli):
+        email = users.email(uid)
+        for _ in range(rng.randint(1, 3)):
+            ds.jumlah_keranjang += 1
+            yield (ds.jumlah_keranjang, email, generate_list_name(rng, "Keranjang"))
+
+
+# 16. Tabel rincian_wishlist (1-5 produk per wishlist)
+def rincian_wishlist_chunk(ds, rng, fake, lo, hi):
+    cols = column_source(ds, rng)
+    items = cols.integers(1, 5, hi - lo)
+    skewed = skew_table(ds, 'rincian_wishlist.no_produk', len(ds.produk))
+    if skewed:
+        produk = [k + 1 for k in cols.weighted(skewed, sum(items))]
+    else:
+        produk = cols.integers(1, len(ds.produk), sum(items))
+    rows = []
+    pos = 0
+    for wishlist_id, count in zip(range(lo + 1, hi + 1), items):
+        used_produk = set()
+        for no_produk in produk[pos:pos + count]:
+            if no_produk not in used_produk:
+                used_produk.add(no_produk)
+                rows.append((wishlist_id, no_produk))
+        pos += count
+    return rows, None
+
+
+def rincian_wishlist_units(ds):
+    if not len(ds.produk):
+        return 0
+    skew_table(ds, 'rincian_wishlist.no_produk', len(ds.produk))
+    return ds.jumlah_wishlist - ds.base.get('wishlist', 0)
+
+
+rincian_wishlist = Chunked(
+    units=rincian_wishlist_units,
+    chunk=rincian_wishlist_chunk,
+    base='wishlist',
+)
+
+
+# 17. Tabel rincian_keranjang (1-3 varian per keranjang, dengan jumlah)
+def rincian_keranjang_chunk(ds, rng, fake, lo, hi):
+    keys = ds.produk
+    cols = column_source(ds, rng)
+    with_varian = keys.produk_with_varian()
+    items = cols.integers(1, 3, hi - lo)
+    skewed = skew_table(ds, 'rincian_keranjang.no_produk', len(with_varian))
+    picks = cols.weighted(skewed, sum(items)) if skewed else cols.integers(0, len(with_varian) - 1, sum(items))
+    produk = [with_varian[k] + 1 for k in picks]
+    return rincian_rows(keys, cols, range(lo + 1, hi + 1), items, produk), None
+
+
+def rincian_keranjang_units(ds):
+    with_varian = ds.produk.produk_with_varian()
+    if not with_varian:
+        return 0
+    skew_table(ds, 'rincian_keranjang.no_produk', len(with_varian))
+    return ds.jumlah_keranjang - ds.base.get('keranjang', 0)
+
+
+rincian_keranjang = Chunked(
+    units=rincian_keranjang_units,
+    chunk=rincian_keranjang_chunk,
+    base='keranjang',
+)
+
+
+# 18. Tabel buyer_stats: jumlah pesanan, total belanja dan ulasan positif per
+# pembeli yang punya pesanan atau ulasan, dari agregat pesanan dan ulasan
+def buyer_stats(ds, rng, fake):
+    users = ds.users
+    orders, cents, reviews = ds.buyer_orders, ds.buyer_cents, ds.buyer_reviews
+    for k, uid in enumerate(users.pembeli):
+        if orders[k] or reviews[k]:
+            yield (users.email(uid), orders[k], cents[k] / 100, reviews[k])
+
+
+# 19. Tabel tag_counts: jumlah produk per tag, dari agregat tag_produk
+def tag_counts(ds, rng, fake):
+    for tag in config.tags:
+        if tag in ds.tag_counts:
+            yield (tag, ds.tag_counts[tag])
+
+
+class TableTask:
+    """A registered table: its generator and its place in the dependency graph."""
+
+    def __init__(self, name, spec, after=(), exports=(), note=None, optional=False):
+        self.name = name
+        self.spec = spec  # generator function atau Chunked
+        self.deps = tuple(sorted(set(parents(name)) | set(after)))
+        self.exports = exports  # atribut Dataset (bertitik) yang diisi tabel ini
+        self.note = note  # ds -> teks tambahan untuk baris "-- Total"
+        self.optional = optional  # hanya ditulis jika diminta lewat `tables`
+
+
+REGISTRY = {}
+
+
+def register(name, spec, after=(), exports=(), note=None, optional=False):
+    """Add a table to REGISTRY; tables must be registered after their dependencies.
+
+    Optional tables are left out of a run unless they are named in its `tables`.
+    """
+    task = TableTask(name, spec, after, exports, note, optional)
+    missing = [dep for dep in task.deps if dep not in REGISTRY]
+    if missing:
+        raise ValueError(f"Tabel {name} bergantung pada tabel yang belum terdaftar: {', '.join(missing)}")
+    REGISTRY[name] = task
+    return task
+
+
+register('pengguna', pengguna, exports=('users',))
+register('alamat', alamat, exports=('jumlah_alamat',))
+register('pembeli', pembeli)
+register('penjual', penjual, exports=('users.verified',),
+         note=lambda ds: f", terverifikasi: {len(ds.users.verified)}")
+register('friend', friend)
+register('alamat_alternatif', alamat_alternatif)
+register('produk', produk, exports=('produk',))
+register('gambar_produk', gambar_produk)
+register('tag_produk', tag_produk, exports=('tag_counts',))
+register('varian', varian, exports=('produk.varian', 'produk.var_harga'))
+# pesanan memilih penjual yang sudah punya produk
+register('pesanan', pesanan, after=('produk',), exports=('pesanan_seller', 'buyer_orders', 'buyer_cents'))
+register('rincian_pesanan', rincian_pesanan)
+register('ulasan', ulasan, exports=('buyer_reviews',))
+register('wishlist', wishlist, exports=('jumlah_wishlist',))
+register('keranjang', keranjang, exports=('jumlah_keranjang',))
+register('rincian_wishlist', rincian_wishlist)
+register('rincian_keranjang', rincian_keranjang)
+# Tabel ringkasan (summary.py)
+register('buyer_stats', buyer_stats, after=('pesanan', 'ulasan'), optional=True)
+register('tag_counts', tag_counts, after=('tag_produk',), optional=True)
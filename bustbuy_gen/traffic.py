@@ -0,0 +1,316 @@
+# Transactional traffic simulator for the keranjang -> pesanan flow.
+#
+# N simulated buyers run as asyncio tasks against a database that was loaded
+# by the generator (Bustbuy.py --db with the same scale and seed). The key
+# spaces are regenerated in-process (rows discarded), so every operation
+# draws keranjang ids, produk and varian from the generated population, and
+# new pesanan continue after the highest existing no_pesanan. Each buyer
+# owns one connection; its blocking DB-API calls run in a thread pool so the
+# event loop can interleave the buyers and their think times.
+#
+# Operations:
+#   cart_add     add one varian to a keranjang (or bump its jumlah), as one upsert
+#   cart_remove  remove one line from a keranjang
+#   checkout     turn a keranjang into one pesanan per penjual, decrement
+#                varian.stok and empty the keranjang, in one transaction
+#   status       move a pesanan one step along the status flow guarded by
+#                trg_pesanan_status_transisi / validate_pesanan_status_transition
+#
+# Lock timeouts, deadlocks and SQLite "database is locked" errors are
+# retried with backoff and counted per operation. SQLite connections turn
+# on PRAGMA foreign_keys, so both dialects enforce the foreign keys.
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import scaled_counts
+from .helpers import chunk_seed
+from .keys import AliasTable
+from .loader import connector
+from .runner import generate
+from .schema import UNIQUE_KEYS
+from .tables import Dataset
+from .workload import percentiles
+from .writers import NullWriter
+
+OPERATIONS = ('cart_add', 'cart_remove', 'checkout', 'status')
+DEFAULT_MIX = {'cart_add': 50, 'cart_remove': 10, 'checkout': 25, 'status': 15}
+
+# Alur status yang diizinkan trigger; 'Dibatalkan' boleh dari status yang belum final
+NEXT_STATUS = {'Menunggu Pembayaran': 'Diproses', 'Diproses': 'Dikirim', 'Dikirim': 'Selesai'}
+CANCEL_RATE = 0.1
+
+# Versi SQLite dari trg_pesanan_status_transisi (Bustbuy(v3)-add-constraint.sql)
+STATUS_TRIGGER_SQLITE = """CREATE TRIGGER IF NOT EXISTS trg_pesanan_status_transisi
+BEFORE UPDATE OF status_pesanan ON pesanan
+FOR EACH ROW
+WHEN OLD.status_pesanan IN ('Selesai', 'Dibatalkan') OR NOT (
+    (OLD.status_pesanan = 'Menunggu Pembayaran' AND NEW.status_pesanan = 'Diproses') OR
+    (OLD.status_pesanan = 'Diproses' AND NEW.status_pesanan = 'Dikirim') OR
+    (OLD.status_pesanan = 'Dikirim' AND NEW.status_pesanan = 'Selesai') OR
+    (NEW.status_pesanan = 'Dibatalkan'))
+BEGIN
+    SELECT RAISE(ABORT, 'Transisi status tidak valid. Hanya boleh ke next step atau "Dibatalkan"');
+END"""
+
+
+def is_retryable(exc):
+    code = getattr(exc, 'errno', None)
+    if code is None and exc.args and isinstance(exc.args[0], int):
+        code = exc.args[0]
+    if code in (1205, 1213):  # MySQL: lock wait timeout, deadlock
+        return True
+    message = str(exc).lower()
+    return 'locked' in message or 'busy' in message or 'deadlock' in message
+
+
+class OpStats:
+    def __init__(self):
+        self.latencies = []
+        self.outcomes = {}
+        self.retries = 0
+
+    def record(self, outcome, seconds, retries):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.latencies.append(seconds)
+        self.retries += retries
+
+
+class Simulator:
+    """Replay a weighted mix of operations with `buyers` concurrent sessions."""
+
+    def __init__(self, url, ds, buyers=8, mix=None, think_ms=0.0, max_retries=5, start_pesanan=None):
+        self.url = url
+        self.ds = ds
+        self.buyers = buyers
+        self.mix = dict(mix or DEFAULT_MIX)
+        unknown = [op for op in self.mix if op not in OPERATIONS]
+        if unknown:
+            raise ValueError(f"Operasi tidak dikenal: {', '.join(unknown)}")
+        self.ops = [op for op in OPERATIONS if self.mix.get(op)]
+        self.op_table = AliasTable([self.mix[op] for op in self.ops])
+        self.think_ms = think_ms
+        self.max_retries = max_retries
+        self._connect, self.placeholder, self.dialect = connector(url)
+        self.begin = 'BEGIN' if self.dialect == 'sqlite' else 'START TRANSACTION'
+        self.for_update = '' if self.dialect == 'sqlite' else ' FOR UPDATE'
+        self.stats = {op: OpStats() for op in self.ops}
+        self.start_pesanan = start_pesanan
+        self.next_pesanan = 0
+        self.lock = threading.Lock()
+        self.with_varian = ds.produk.produk_with_varian()
+        insert = self.sql("INSERT INTO rincian_keranjang (keranjang_id, no_produk, sku, jumlah) VALUES (?, ?, ?, 1)")
+        if self.dialect == 'mysql':
+            self.cart_upsert = insert + " ON DUPLICATE KEY UPDATE jumlah = jumlah + 1"
+        else:
+            key = ', '.join(UNIQUE_KEYS['rincian_keranjang'])
+            self.cart_upsert = insert + f" ON CONFLICT ({key}) DO UPDATE SET jumlah = jumlah + 1"
+
+    def connect(self):
+        conn = self._connect()
+        if self.dialect == 'sqlite':
+            # SQLite memeriksa foreign key hanya jika diaktifkan per koneksi
+            conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def sql(self, text):
+        return text.replace('?', self.placeholder)
+
+    # Operasi: dijalankan di thread pool dengan koneksi milik buyer
+    def cart_add(self, conn, rng):
+        keys = self.ds.produk
+        keranjang_id = rng.randint(1, self.ds.jumlah_keranjang)
+        no_produk = self.with_varian[rng.randrange(len(self.with_varian))] + 1
+        sku = keys.sku(no_produk, rng.randrange(keys.varian_count(no_produk)))
+        # Satu upsert: UPDATE lalu INSERT bisa bentrok di UNIQUE jika dua buyer menambah baris yang sama
+        conn.cursor().execute(self.cart_upsert, (keranjang_id, no_produk, sku))
+        conn.commit()
+        return 'ok'
+
+    def cart_remove(self, conn, rng):
+        keranjang_id = rng.randint(1, self.ds.jumlah_keranjang)
+        cur = conn.cursor()
+        cur.execute(self.begin)
+        cur.execute(self.sql("SELECT no_produk, sku FROM rincian_keranjang WHERE keranjang_id = ?" + self.for_update),
+                    (keranjang_id,))
+        lines = cur.fetchall()
+        if not lines:
+            conn.rollback()
+            return 'kosong'
+        no_produk, sku = lines[rng.randrange(len(lines))]
+        cur.execute(self.sql("DELETE FROM rincian_keranjang WHERE keranjang_id = ? AND no_produk = ? AND sku = ?"),
+                    (keranjang_id, no_produk, sku))
+        conn.commit()
+        return 'ok'
+
+    def checkout(self, conn, rng):
+        users, keys = self.ds.users, self.ds.produk
+        keranjang_id = rng.randint(1, self.ds.jumlah_keranjang)
+        cur = conn.cursor()
+        cur.execute(self.begin)
+        cur.execute(self.sql("SELECT k.email_pembeli, p.alamat_utama_id FROM keranjang k "
+                             "JOIN pembeli p ON p.email = k.email_pembeli WHERE k.keranjang_id = ?"), (keranjang_id,))
+        email_pembeli, alamat_id = cur.fetchone()
+        cur.execute(self.sql("SELECT r.no_produk, r.sku, r.jumlah, v.harga FROM rincian_keranjang r "
+                             "JOIN varian v ON v.no_produk = r.no_produk AND v.sku = r.sku "
+                             "WHERE r.keranjang_id = ? ORDER BY r.no_produk, r.sku" + self.for_update), (keranjang_id,))
+        lines = cur.fetchall()
+        if not lines:
+            conn.rollback()
+            return 'kosong'
+        # Satu pesanan per penjual; stok dikurangi hanya jika masih cukup
+        per_seller = {}
+        for no_produk, sku, jumlah, harga in lines:
+            cur.execute(self.sql("UPDATE varian SET stok = stok - ? WHERE no_produk = ? AND sku = ? AND stok >= ?"),
+                        (jumlah, no_produk, sku, jumlah))
+            if cur.rowcount:
+                per_seller.setdefault(keys.seller_of(no_produk), []).append((no_produk, sku, jumlah, harga))
+        if not per_seller:
+            conn.rollback()
+            return 'stok_habis'
+        waktu_pesan = time.strftime('%Y-%m-%d %H:%M:%S')
+        for seller_uid, items in per_seller.items():
+            no_pesanan = self.allocate_pesanan()
+            harga_total = round(sum(float(harga) * jumlah for _, _, jumlah, harga in items), 2)
+            cur.execute(self.sql(
+                "INSERT INTO pesanan (no_pesanan, status_pesanan, harga_total, metode_bayar, catatan, waktu_pesan, "
+                "metode_kirim, email_pembeli, alamat_id, email_penjual) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"),
+                (no_pesanan, 'Menunggu Pembayaran', harga_total, rng.choice(('Transfer Bank', 'COD', 'E-Wallet')),
+                 None, waktu_pesan, 'Kurir Standar', email_pembeli, alamat_id, users.email(seller_uid)))
+            cur.executemany(self.sql("INSERT INTO rincian_pesanan (no_pesanan, no_produk, sku, jumlah) "
+                                     "VALUES (?, ?, ?, ?)"),
+                            [(no_pesanan, no_produk, sku, jumlah) for no_produk, sku, jumlah, _ in items])
+        cur.execute(self.sql("DELETE FROM rincian_keranjang WHERE keranjang_id = ?"), (keranjang_id,))
+        conn.commit()
+        return 'ok' if len(per_seller) == 1 else 'ok_multi_penjual'
+
+    def status(self, conn, rng):
+        last = self.next_pesanan - 1
+        if last < 1:
+            return 'kosong'
+        no_pesanan = rng.randint(1, last)
+        cur = conn.cursor()
+        cur.execute(self.begin)
+        cur.execute(self.sql("SELECT status_pesanan FROM pesanan WHERE no_pesanan = ?" + self.for_update), (no_pesanan,))
+        row = cur.fetchone()
+        if row is None or row[0] not in NEXT_STATUS:
+            conn.rollback()
+            return 'final'
+        new_status = 'Dibatalkan' if rng.random() < CANCEL_RATE else NEXT_STATUS[row[0]]
+        try:
+            cur.execute(self.sql("UPDATE pesanan SET status_pesanan = ? WHERE no_pesanan = ? AND status_pesanan = ?"),
+                        (new_status, no_pesanan, row[0]))
+        except Exception as exc:
+            if is_retryable(exc):
+                raise
+            # Ditolak trigger transisi status
+            conn.rollback()
+            return 'ditolak'
+        conn.commit()
+        return 'ok' if cur.rowcount else 'berubah'
+
+    def allocate_pesanan(self):
+        # no_pesanan dibagikan di sisi klien (kolomnya tanpa AUTO_INCREMENT di create_schema)
+        with self.lock:
+            no_pesanan = self.next_pesanan
+            self.next_pesanan += 1
+        return no_pesanan
+
+    def run_op(self, conn, op, rng):
+        """Run `op` with retries; returns (outcome, retries)."""
+        retries = 0
+        while True:
+            try:
+                return getattr(self, op)(conn, rng), retries
+            except Exception as exc:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                if not is_retryable(exc) or retries >= self.max_retries:
+                    return f"gagal: {type(exc).__name__}", retries
+                retries += 1
+                time.sleep(0.001 * 2 ** retries * rng.random())
+
+    async def buyer(self, index, deadline, ops_left, executor):
+        loop = asyncio.get_running_loop()
+        rng = random.Random(chunk_seed(self.ds.seed, 'traffic', index))
+        conn = await loop.run_in_executor(executor, self.connect)
+        try:
+            while time.perf_counter() < deadline and (ops_left is None or ops_left[0] > 0):
+                if ops_left is not None:
+                    ops_left[0] -= 1
+                op = self.ops[self.op_table.draw(rng)]
+                started_at = time.perf_counter()
+                outcome, retries = await loop.run_in_executor(executor, self.run_op, conn, op, rng)
+                self.stats[op].record(outcome, time.perf_counter() - started_at, retries)
+                if self.think_ms:
+                    await asyncio.sleep(rng.expovariate(1000.0 / self.think_ms))
+        finally:
+            await loop.run_in_executor(executor, conn.close)
+
+    def prepare(self):
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM keranjang")
+            if cur.fetchone()[0] != self.ds.jumlah_keranjang:
+                raise RuntimeError("Jumlah keranjang di database tidak sama dengan hasil generator; "
+                                   "pakai --scale/--count/--seed yang sama seperti saat load")
+            if self.start_pesanan is None:
+                cur.execute("SELECT MAX(no_pesanan) FROM pesanan")
+                self.start_pesanan = (cur.fetchone()[0] or 0) + 1
+            conn.commit()
+        finally:
+            conn.close()
+        self.next_pesanan = self.start_pesanan
+
+    async def run_async(self, duration, total_ops):
+        deadline = time.perf_counter() + duration if duration else float('inf')
+        ops_left = [total_ops] if total_ops else None
+        with ThreadPoolExecutor(max_workers=self.buyers) as executor:
+            await asyncio.gather(*(self.buyer(i, deadline, ops_left, executor) for i in range(self.buyers)))
+
+    def run(self, duration=10.0, total_ops=None):
+        """Run until `duration` seconds or `total_ops` operations; returns the report dict."""
+        if not self.ds.jumlah_keranjang or not len(self.with_varian):
+            raise RuntimeError("Tidak ada keranjang atau varian untuk disimulasikan")
+        self.prepare()
+        started_at = time.perf_counter()
+        asyncio.run(self.run_async(duration, total_ops))
+        elapsed = time.perf_counter() - started_at
+        report = {'buyers': self.buyers, 'seconds': round(elapsed, 3), 'mix': self.mix, 'operations': {}}
+        for op, stats in self.stats.items():
+            count = len(stats.latencies)
+            report['operations'][op] = {
+                'count': count,
+                'ops_per_sec': round(count / elapsed, 1) if elapsed > 0 else None,
+                'retries': stats.retries,
+                'outcomes': stats.outcomes,
+                'latency_ms': percentiles(stats.latencies) if count else None,
+            }
+        return report
+
+
+def population(scale=1, overrides=None, seed=None, now=None):
+    """Regenerate the key spaces the simulator samples from (rows discarded)."""
+    ds = Dataset(scaled_counts(scale, overrides), seed=seed, now=now)
+    generate(ds, NullWriter(), tables=['varian', 'keranjang'])
+    return ds
+
+
+def install_status_trigger(url):
+    """Create the SQLite version of trg_pesanan_status_transisi (MySQL: run the v3 DDL)."""
+    connect, _, dialect = connector(url)
+    if dialect != 'sqlite':
+        return False
+    conn = connect()
+    try:
+        conn.execute(STATUS_TRIGGER_SQLITE)
+        conn.commit()
+    finally:
+        conn.close()
+    return True
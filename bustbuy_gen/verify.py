@@ -0,0 +1,341 @@
+# Constraint verifier for generated dumps, without a database.
+#
+# Verifier.feed() takes rows in any order (see dumpreader.iter_dump) and
+# checks them against the PRIMARY KEY / UNIQUE / FOREIGN KEY lists of
+# schema.py, the CHECK constraints and NOT NULL/VARCHAR limits of
+# Bustbuy(v3)-add-constraint.sql, and the insert triggers of v3 and
+# Fiturtambahan.sql (specialization, umur > 17, email .com, produk only for
+# verified penjual, pesanan and varian from the same penjual).
+#
+# Keys are kept compactly: single INT keys (alamat_id, no_pesanan, ...) in a
+# bitmap, other keys as 64-bit hashes in a set, and the penjual of every
+# pesanan/produk as a hash in an array indexed by id. A hash collision can
+# at worst hide a violation or report a false duplicate, with probability
+# around n^2 / 2^64. Rows whose parent is not known yet are checked again at
+# the end, so children may come before their parents in the dump.
+
+import re
+from array import array
+from datetime import date
+
+from . import config
+from .schema import COLUMN_TYPES, COLUMNS, FOREIGN_KEYS, PRIMARY_KEYS, UNIQUE_KEYS
+
+NO_TELP = re.compile(r'^\+[0-9]{1,3}(-[0-9]{3})+(-[0-9]{1,})$')
+EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.com$')
+MINIMUM_AGE = 18
+
+
+def truthy(value):
+    return value not in (None, False, 0, '0', 'FALSE', 'false', '')
+
+
+def age(born, today):
+    """TIMESTAMPDIFF(YEAR, born, today) for a 'YYYY-MM-DD' string."""
+    year, month, day = int(born[0:4]), int(born[5:7]), int(born[8:10])
+    return today.year - year - ((today.month, today.day) < (month, day))
+
+
+# (tabel, nama, kolom, predikat): CHECK constraint dan trigger per baris
+CHECKS = [
+    ('pengguna', 'specialization', ('is_pembeli', 'is_penjual'), lambda a, b: truthy(a) != truthy(b)),
+    ('pengguna', 'chk_no_telp_format', ('no_telp',), NO_TELP.match),
+    ('pengguna', 'validate_pengguna_email', ('email',), EMAIL.match),
+    ('friend', 'friend_bukan_diri_sendiri', ('email', 'email_following'), lambda a, b: a != b),
+    ('pesanan', 'status_pesanan', ('status_pesanan',), set(config.status_pesanan).__contains__),
+    ('pesanan', 'metode_bayar', ('metode_bayar',), set(config.metode_bayar).__contains__),
+    ('pesanan', 'metode_kirim', ('metode_kirim',), set(config.metode_kirim).__contains__),
+    ('ulasan', 'nilai', ('nilai',), lambda v: 0 <= v <= 5),
+    ('varian', 'stok', ('stok',), lambda v: v >= 0),
+    ('varian', 'harga', ('harga',), lambda v: v >= 0),
+    ('rincian_pesanan', 'jumlah', ('jumlah',), lambda v: v > 0),
+    ('rincian_keranjang', 'jumlah', ('jumlah',), lambda v: v > 0),
+]
+
+
+# Id int masuk bitmap/array hanya selama tidak jauh di atas jumlah id yang
+# sudah dilihat; id jarang (mis. no_pesanan = 2147483647) masuk ke set/dict
+DENSE_SLACK = 1 << 20
+
+
+class KeySet:
+    """Set of keys: a bitmap for dense non-negative int ids, 64-bit hashes otherwise."""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.sparse = set()  # id int di luar rentang bitmap
+        self.hashes = set()
+        self.size = 0
+
+    def add(self, key):
+        """Add `key`; False if it was already there."""
+        if type(key) is not int or key < 0:
+            h = hash(key)
+            if h in self.hashes:
+                return False
+            self.hashes.add(h)
+        elif key in self.sparse:
+            return False
+        elif key < 2 * self.size + DENSE_SLACK or key >> 3 < len(self.bits):
+            byte, bit = key >> 3, 1 << (key & 7)
+            if byte >= len(self.bits):
+                self.bits.extend(bytes(max(byte + 1 - len(self.bits), len(self.bits) // 2)))
+            if self.bits[byte] & bit:
+                return False
+            self.bits[byte] |= bit
+        else:
+            self.sparse.add(key)
+        self.size += 1
+        return True
+
+    def _in_bits(self, key):
+        byte = key >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (key & 7)))
+
+    def __contains__(self, key):
+        if type(key) is not int or key < 0:
+            return hash(key) in self.hashes
+        return self._in_bits(key) or key in self.sparse
+
+    def __len__(self):
+        return self.size
+
+    def count_missing(self, other):
+        """Number of int ids in this set that are not in `other`."""
+        mask = int.from_bytes(other.bits[:len(self.bits)], 'little')
+        missing = (int.from_bytes(self.bits, 'little') & ~mask).bit_count()
+        # Id di bitmap sini yang di `other` tersimpan sebagai id jarang
+        missing -= sum(1 for key in other.sparse if self._in_bits(key))
+        return missing + sum(1 for key in self.sparse if key not in other)
+
+
+class IdMap:
+    """int id -> hash of a value, 0 for unknown ids."""
+
+    def __init__(self):
+        self.values = array('q')
+        self.sparse = {}  # id int di luar rentang array
+        self.size = 0
+
+    def set(self, i, value):
+        if type(i) is not int or i < 0:
+            return
+        value = hash(value) or 1
+        self.size += 1
+        if i in self.sparse or (i >= len(self.values) and i >= 2 * self.size + DENSE_SLACK):
+            self.sparse[i] = value
+            return
+        if i >= len(self.values):
+            self.values.extend(array('q', [0]) * max(i + 1 - len(self.values), len(self.values) // 2))
+        self.values[i] = value
+
+    def get(self, i):
+        if type(i) is not int or i < 0:
+            return 0
+        if i < len(self.values) and self.values[i]:
+            return self.values[i]
+        return self.sparse.get(i, 0)
+
+
+def _key(values, indexes):
+    if len(indexes) == 1:
+        return values[indexes[0]]
+    return tuple(values[i] for i in indexes)
+
+
+class Verifier:
+    """Collects violations of the rows passed to feed(); see report()."""
+
+    def __init__(self, today=None, max_examples=5):
+        self.today = today or date.today()
+        self.max_examples = max_examples
+        self.rows = {}
+        self.violations = {}
+        self.examples = {}
+        self.unknown_tables = set()
+        self.keys = {table: KeySet() for table in list(PRIMARY_KEYS) + list(UNIQUE_KEYS)}
+        self.flag_pembeli = KeySet()
+        self.flag_penjual = KeySet()
+        self.verified = KeySet()
+        self.seller_pesanan = IdMap()
+        self.seller_produk = IdMap()
+        self.rincian_pesanan = KeySet()  # no_pesanan yang punya rincian
+        self.deferred = []
+        self.layouts = {}
+
+    def _layout(self, table, columns):
+        # Posisi kolom schema di dalam baris, per daftar kolom INSERT
+        layout = self.layouts.get((table, columns))
+        if layout is not None:
+            return layout
+        position = {column: i for i, column in enumerate(columns)}
+
+        def indexes(names):
+            if any(name not in position for name in names):
+                return None
+            return tuple(position[name] for name in names)
+
+        types = dict(zip(COLUMNS[table], COLUMN_TYPES[table]))
+        not_null = [(column, position[column]) for column in COLUMNS[table]
+                    if column in position and 'NOT NULL' in types[column]]
+        lengths = []
+        for column in COLUMNS[table]:
+            m = re.match(r'VARCHAR\((\d+)\)', types[column])
+            if m and column in position:
+                lengths.append((column, position[column], int(m.group(1))))
+        checks = [(name, indexes(names), predicate) for t, name, names, predicate in CHECKS
+                  if t == table and indexes(names) is not None]
+        if table == 'pengguna' and indexes(('tgl_lahir',)):
+            today = self.today
+            checks.append(('validate_pengguna_age_insert', indexes(('tgl_lahir',)),
+                           lambda born: age(str(born), today) >= MINIMUM_AGE))
+        primary = PRIMARY_KEYS.get(table) or UNIQUE_KEYS.get(table)
+        foreign = [(parent, indexes(cols)) for child, cols, parent, _ in FOREIGN_KEYS
+                   if child == table and indexes(cols) is not None]
+        layout = {
+            'get': lambda values, column: values[position[column]] if column in position else None,
+            'key_kind': 'primary_key' if table in PRIMARY_KEYS else 'unique',
+            'key': indexes(primary) if primary else None,
+            'not_null': not_null,
+            'lengths': lengths,
+            'checks': checks,
+            'foreign': foreign,
+        }
+        self.layouts[(table, columns)] = layout
+        return layout
+
+    def violation(self, rule, table, row, detail):
+        self.violations[rule] = self.violations.get(rule, 0) + 1
+        examples = self.examples.setdefault(rule, [])
+        if len(examples) < self.max_examples:
+            examples.append({'table': table, 'row': row, 'detail': detail})
+
+    def feed(self, table, columns, values):
+        if table not in COLUMNS:
+            self.unknown_tables.add(table)
+            return
+        row = self.rows[table] = self.rows.get(table, 0) + 1
+        layout = self._layout(table, tuple(columns))
+        if len(values) != len(columns):
+            self.violation('jumlah_kolom', table, row, f"{len(values)} nilai untuk {len(columns)} kolom")
+            return
+
+        for column, i in layout['not_null']:
+            if values[i] is None:
+                self.violation('not_null', table, row, column)
+        for column, i, limit in layout['lengths']:
+            value = values[i]
+            if isinstance(value, str) and len(value) > limit:
+                self.violation('varchar', table, row, f"{column} {len(value)} > {limit} karakter")
+        for name, indexes, predicate in layout['checks']:
+            args = [values[i] for i in indexes]
+            if None in args:
+                continue
+            try:
+                ok = predicate(*args)
+            except (TypeError, ValueError):
+                ok = False
+            if not ok:
+                self.violation(name, table, row, ', '.join(map(repr, args)))
+
+        if layout['key'] is not None:
+            key = _key(values, layout['key'])
+            if not self.keys[table].add(key):
+                self.violation(layout['key_kind'], table, row, f"duplikat {key!r}")
+        for parent, indexes in layout['foreign']:
+            key = _key(values, indexes)
+            if key is not None and key not in self.keys[parent]:
+                self.deferred.append(('foreign_key', table, row, parent, key))
+
+        feed = getattr(self, f"_feed_{table}", None)
+        if feed is not None:
+            feed(layout['get'], values, row)
+
+    # Data tambahan untuk trigger yang membaca tabel lain
+
+    def _feed_pengguna(self, get, values, row):
+        email = get(values, 'email')
+        if truthy(get(values, 'is_pembeli')):
+            self.flag_pembeli.add(email)
+        if truthy(get(values, 'is_penjual')):
+            self.flag_penjual.add(email)
+
+    def _feed_pembeli(self, get, values, row):
+        self._check_role('before_insert_pembeli', 'pembeli', self.flag_pembeli, get(values, 'email'), row)
+
+    def _feed_penjual(self, get, values, row):
+        email = get(values, 'email')
+        self._check_role('before_insert_penjual', 'penjual', self.flag_penjual, email, row)
+        if truthy(get(values, 'is_verified')):
+            self.verified.add(email)
+
+    def _feed_pesanan(self, get, values, row):
+        self.seller_pesanan.set(get(values, 'no_pesanan'), get(values, 'email_penjual'))
+
+    def _feed_produk(self, get, values, row):
+        email = get(values, 'email_penjual')
+        self.seller_produk.set(get(values, 'no_produk'), email)
+        if email not in self.verified:
+            self.deferred.append(('verifikasi_penjual_trigger', 'produk', row, 'penjual', email))
+
+    def _feed_rincian_pesanan(self, get, values, row):
+        no_pesanan, no_produk = get(values, 'no_pesanan'), get(values, 'no_produk')
+        self.rincian_pesanan.add(no_pesanan)
+        if not self._same_seller(no_pesanan, no_produk):
+            self.deferred.append(('trg_check_penjual_consistency', 'rincian_pesanan', row, 'produk',
+                                  (no_pesanan, no_produk)))
+
+    def _check_role(self, rule, table, flags, email, row):
+        if email in self.keys['pengguna'] and email not in flags:
+            self.violation(rule, table, row, f"{email!r} bukan {table} di pengguna")
+
+    def _same_seller(self, no_pesanan, no_produk):
+        seller = self.seller_pesanan.get(no_pesanan)
+        return seller != 0 and seller == self.seller_produk.get(no_produk)
+
+    def finish(self):
+        """Re-check the rows whose parent was not seen yet; returns report()."""
+        deferred, self.deferred = self.deferred, []
+        for rule, table, row, parent, key in deferred:
+            if parent not in self.rows:
+                # Tabel induk tidak ada di input (mis. --tables atau delta); tidak bisa diperiksa
+                continue
+            if rule == 'foreign_key':
+                ok = key in self.keys[parent]
+                detail = f"{key!r} tidak ada di {parent}"
+            elif rule == 'verifikasi_penjual_trigger':
+                ok = key in self.verified
+                detail = f"{key!r} bukan penjual terverifikasi"
+            else:
+                ok = self._same_seller(*key)
+                detail = f"pesanan {key[0]} dan produk {key[1]} berbeda penjual"
+            if not ok:
+                self.violation(rule, table, row, detail)
+        if 'pesanan' in self.rows and 'rincian_pesanan' in self.rows:
+            missing = self.keys['pesanan'].count_missing(self.rincian_pesanan)
+            if missing:
+                self.violation('prevent_orphan_pesanan', 'pesanan', None,
+                               f"{missing} pesanan tanpa rincian_pesanan")
+        return self.report()
+
+    def report(self):
+        return {
+            'today': self.today.isoformat(),
+            'rows': dict(self.rows),
+            'violations': dict(sorted(self.violations.items())),
+            'examples': {rule: self.examples[rule] for rule in sorted(self.examples)},
+            'unknown_tables': sorted(self.unknown_tables),
+            'missing_parents': sorted({parent for child, _, parent, _ in FOREIGN_KEYS
+                                       if child in self.rows and parent not in self.rows}),
+        }
+
+
+def verify(paths, today=None, max_examples=5):
+    """Stream the dumps at `paths` (in order) through a Verifier; returns its report."""
+    from .dumpreader import iter_dump
+
+    verifier = Verifier(today, max_examples)
+    for path in paths:
+        for table, columns, values in iter_dump(path):
+            verifier.feed(table, columns, values)
+    return verifier.finish()
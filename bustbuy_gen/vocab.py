@@ -0,0 +1,146 @@
+# Vocabulary pools: precomputed Faker values sampled by index.
+#
+# Faker spends tens of microseconds per name, address or sentence, which
+# dominates the runtime of big runs. load_pools() materializes a few
+# thousand values of every Faker method the tables use, once per
+# (locale, seed), and keeps them in a pickle cache on disk so later runs with
+# the same seed start instantly. PooledFaker is a drop-in for the Faker
+# instance handed to the table generators: every call is one random index
+# into a pool, and uuid4() is a hash of (seed, counter) instead of a Faker
+# draw.
+#
+# faker itself is only imported when a pool has to be built or --no-pools
+# asks for it, and then only with the providers the tables call.
+
+import hashlib
+import os
+import pickle
+import random
+
+from .helpers import chunk_seed
+
+# Ukuran pool per method Faker; mengubahnya mengubah output untuk seed yang sama
+POOL_SIZES = {
+    'first_name': 5000,
+    'last_name': 5000,
+    'administrative_unit': 500,
+    'city': 2000,
+    'street_address': 20000,
+    'word': 2000,
+    'sentence': 20000,
+    'paragraph': 5000,
+}
+POOL_VERSION = 1
+
+# Provider yang dipakai tabel (nama, alamat, teks, uuid4); nilainya sama
+# dengan Faker(locale) yang memuat semua provider
+FAKER_PROVIDERS = (
+    'faker.providers.person',
+    'faker.providers.address',
+    'faker.providers.lorem',
+    'faker.providers.misc',
+)
+
+_loaded = {}
+
+
+def default_cache_dir():
+    return os.environ.get('BUSTBUY_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'bustbuy')
+
+
+def make_faker(locale):
+    """Faker generator for `locale` with only FAKER_PROVIDERS loaded."""
+    from faker import Factory
+    return Factory.create(locale, providers=list(FAKER_PROVIDERS))
+
+
+def build_pools(locale, seed):
+    """Generate every pool with Faker; each pool has its own derived seed."""
+    fake = make_faker(locale)
+    pools = {}
+    for name, size in POOL_SIZES.items():
+        fake.seed_instance(chunk_seed(seed, 'vocab', name))
+        method = getattr(fake, name)
+        pools[name] = tuple(method() for _ in range(size))
+    return pools
+
+
+def load_pools(locale, seed, cache_dir=None):
+    """Pools for (locale, seed), from memory, `cache_dir`, or freshly built."""
+    key = (locale, seed)
+    if key in _loaded:
+        return _loaded[key]
+    path = None
+    pools = None
+    if cache_dir:
+        path = os.path.join(cache_dir, f"vocab-{locale}-{seed}-v{POOL_VERSION}.pickle")
+        try:
+            with open(path, 'rb') as f:
+                pools = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pools = None
+        if pools is not None and set(pools) != set(POOL_SIZES):
+            pools = None
+    if pools is None:
+        pools = build_pools(locale, seed)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Tulis ke file sementara dulu agar proses lain tidak membaca cache setengah jadi
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, 'wb') as f:
+                    pickle.dump(pools, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except OSError:
+                pass  # cache hanya optimasi
+    _loaded[key] = pools
+    return pools
+
+
+class PooledFaker:
+    """Faker stand-in that samples its values from vocabulary pools."""
+
+    def __init__(self, pools):
+        self.pools = pools
+        self.random = random.Random()
+        self.seed = 0
+        self.counter = 0
+
+    def seed_instance(self, seed):
+        self.random.seed(seed)
+        self.seed = seed
+        self.counter = 0
+
+    def pick(self, name):
+        pool = self.pools[name]
+        return pool[int(self.random.random() * len(pool))]
+
+    def first_name(self):
+        return self.pick('first_name')
+
+    def last_name(self):
+        return self.pick('last_name')
+
+    def administrative_unit(self):
+        return self.pick('administrative_unit')
+
+    def city(self):
+        return self.pick('city')
+
+    def street_address(self):
+        return self.pick('street_address')
+
+    def word(self):
+        return self.pick('word')
+
+    def sentence(self):
+        return self.pick('sentence')
+
+    def paragraph(self):
+        return self.pick('paragraph')
+
+    def uuid4(self):
+        # Hash (seed, counter) dalam format UUID versi 4; unik per seed/chunk
+        self.counter += 1
+        h = hashlib.blake2b(b'%d:%d' % (self.seed, self.counter), digest_size=16).hexdigest()
+        return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
@@ -0,0 +1,312 @@
+# Query workload harness.
+#
+# Loads generated data into a database (see loader.py), builds the secondary
+# indexes from schema.INDEXES and the two views, then times the analytical
+# queries of the repo (query_e.sql, top_5_tags, pengguna_dengan_umur), the
+# same dashboards read from the summary tables (summary.py) and a set of
+# lookups that the indexes were written for. Every query runs
+# `repeat` times and is reported as latency percentiles together with its
+# EXPLAIN plan. Afterwards each index is dropped in turn, the queries on its
+# table are timed again, and the index is rebuilt, so the result shows what
+# every index buys next to what it costs to build.
+
+import statistics
+import time
+
+from .config import scaled_counts
+from .loader import DbWriter, connector, create_schema
+from .runner import generate, plan
+from .schema import INDEXES, create_index_sql, drop_index_sql, load_order
+from .summary import SUMMARY_TABLES, TOP_5_TAGS
+from .tables import Dataset
+
+
+class Query:
+    """One workload query.
+
+    sql is a string or {dialect: string}; `?` marks parameters, whose values
+    come from the first row of `sample` (run once against the loaded data).
+    """
+
+    def __init__(self, name, sql, tables, sample=None):
+        self.name = name
+        self.sql = sql
+        self.tables = tables
+        self.sample = sample
+
+    def text(self, dialect, placeholder):
+        sql = self.sql[dialect] if isinstance(self.sql, dict) else self.sql
+        return sql.replace('?', placeholder)
+
+
+# query_e.sql; SQLite tidak menerima SELECT ber-LIMIT dalam kurung di UNION,
+# jadi di sana setiap bagian dibungkus subquery
+_LOYAL_PARTS = (
+    """SELECT p_sub.email_pembeli
+        FROM pesanan p_sub
+        GROUP BY p_sub.email_pembeli
+        ORDER BY SUM(p_sub.harga_total) DESC
+        LIMIT 10""",
+    """SELECT p_sub.email_pembeli
+        FROM pesanan p_sub
+        GROUP BY p_sub.email_pembeli
+        ORDER BY COUNT(p_sub.no_pesanan) DESC
+        LIMIT 10""",
+    """SELECT u.email_pembeli
+        FROM ulasan u
+            JOIN pesanan ps_ulasan ON u.no_pesanan = ps_ulasan.no_pesanan
+            JOIN pembeli pb_ulasan ON u.email_pembeli = pb_ulasan.email
+        WHERE u.nilai >= 4.0
+        GROUP BY u.email_pembeli
+        HAVING COUNT(u.no_pesanan) > 1""",
+)
+_LOYAL = """SELECT p.email, pg.nama_panjang, SUM(ps.harga_total) AS total_nilai_pembelian
+FROM pengguna pg
+    JOIN pembeli p ON pg.email = p.email
+    JOIN pesanan ps ON p.email = ps.email_pembeli
+    JOIN (
+        {}
+    ) AS eligible_customers ON p.email = eligible_customers.email_pembeli
+GROUP BY p.email, pg.nama_panjang
+ORDER BY total_nilai_pembelian DESC"""
+
+# query_e.sql dari buyer_stats (summary.py): hasil sama (kecuali pilihan di antara nilai seri
+# pada LIMIT 10), tanpa agregasi pesanan dan ulasan
+_LOYAL_SUMMARY_PARTS = (
+    """SELECT email_pembeli
+        FROM buyer_stats
+        ORDER BY total_belanja DESC
+        LIMIT 10""",
+    """SELECT email_pembeli
+        FROM buyer_stats
+        ORDER BY jumlah_pesanan DESC
+        LIMIT 10""",
+    """SELECT email_pembeli
+        FROM buyer_stats
+        WHERE jumlah_ulasan_positif > 1""",
+)
+_LOYAL_SUMMARY = """SELECT b.email_pembeli AS email, pg.nama_panjang, b.total_belanja AS total_nilai_pembelian
+FROM buyer_stats b
+    JOIN pengguna pg ON pg.email = b.email_pembeli
+    JOIN (
+        {}
+    ) AS eligible_customers ON b.email_pembeli = eligible_customers.email_pembeli
+WHERE b.jumlah_pesanan > 0
+ORDER BY total_nilai_pembelian DESC"""
+
+
+def _union(template, parts):
+    return {
+        'mysql': template.format('\n        UNION\n        '.join(f"({part})" for part in parts)),
+        'sqlite': template.format('\n        UNION\n        '.join(f"SELECT * FROM ({part})" for part in parts)),
+    }
+
+
+QUERIES = [
+    Query('query_e', _union(_LOYAL, _LOYAL_PARTS), ('pengguna', 'pembeli', 'pesanan', 'ulasan')),
+    Query('top_5_tags', "SELECT * FROM top_5_tags", ('tag_produk',)),
+    # Versi dashboard yang membaca tabel ringkasan
+    Query('query_e_summary', _union(_LOYAL_SUMMARY, _LOYAL_SUMMARY_PARTS), ('pengguna', 'buyer_stats')),
+    Query('top_5_tags_summary', TOP_5_TAGS, ('tag_counts',)),
+    Query('pengguna_dengan_umur', "SELECT umur, COUNT(*) FROM pengguna_dengan_umur GROUP BY umur", ('pengguna',)),
+    # Lookup yang menjadi alasan index di blok INDEXING
+    Query('pembeli_aktif', "SELECT COUNT(*) FROM pengguna WHERE is_pembeli = TRUE", ('pengguna',)),
+    Query('follower', "SELECT email FROM friend WHERE email_following = ?", ('friend',),
+          "SELECT email_following FROM friend LIMIT 1"),
+    Query('pembeli_per_alamat', "SELECT email FROM pembeli WHERE alamat_utama_id = ?", ('pembeli',),
+          "SELECT alamat_utama_id FROM pembeli LIMIT 1"),
+    Query('penjual_terverifikasi', "SELECT COUNT(*) FROM penjual WHERE is_verified = TRUE", ('penjual',)),
+    Query('alamat_alternatif', "SELECT email FROM alamat_alternatif WHERE alamat_id = ?", ('alamat_alternatif',),
+          "SELECT alamat_id FROM alamat_alternatif LIMIT 1"),
+    Query('pesanan_pembeli', "SELECT * FROM pesanan WHERE email_pembeli = ? ORDER BY waktu_pesan DESC", ('pesanan',),
+          "SELECT email_pembeli FROM pesanan LIMIT 1"),
+    Query('pesanan_penjual', "SELECT status_pesanan, COUNT(*) FROM pesanan WHERE email_penjual = ? "
+          "GROUP BY status_pesanan", ('pesanan',), "SELECT email_penjual FROM pesanan LIMIT 1"),
+    Query('pesanan_per_alamat', "SELECT COUNT(*) FROM pesanan WHERE alamat_id = ?", ('pesanan',),
+          "SELECT alamat_id FROM pesanan LIMIT 1"),
+    Query('ulasan_positif', "SELECT COUNT(*) FROM ulasan WHERE nilai >= 4.5", ('ulasan',)),
+    Query('terjual_per_varian', "SELECT SUM(jumlah) FROM rincian_pesanan WHERE no_produk = ? AND sku = ?",
+          ('rincian_pesanan',), "SELECT no_produk, sku FROM rincian_pesanan LIMIT 1"),
+    Query('produk_penjual', "SELECT no_produk, nama_produk FROM produk WHERE email_penjual = ?", ('produk',),
+          "SELECT email_penjual FROM produk LIMIT 1"),
+    Query('gambar_produk', "SELECT gambar FROM gambar_produk WHERE no_produk = ?", ('gambar_produk',),
+          "SELECT no_produk FROM gambar_produk LIMIT 1"),
+    Query('produk_per_tag', "SELECT no_produk FROM tag_produk WHERE tag = ?", ('tag_produk',),
+          "SELECT tag FROM tag_produk LIMIT 1"),
+    Query('stok_habis', "SELECT no_produk, sku FROM varian WHERE stok = 0", ('varian',)),
+    Query('varian_harga', "SELECT no_produk, sku, harga FROM varian WHERE harga BETWEEN 100000 AND 110000",
+          ('varian',)),
+    Query('isi_wishlist', "SELECT w.nama_wishlist, r.no_produk FROM wishlist w "
+          "JOIN rincian_wishlist r ON r.wishlist_id = w.wishlist_id WHERE w.wishlist_id = ?",
+          ('wishlist', 'rincian_wishlist'), "SELECT wishlist_id FROM rincian_wishlist LIMIT 1"),
+    Query('isi_keranjang', "SELECT k.nama_keranjang, r.no_produk, r.sku, r.jumlah FROM keranjang k "
+          "JOIN rincian_keranjang r ON r.keranjang_id = k.keranjang_id WHERE k.keranjang_id = ?",
+          ('keranjang', 'rincian_keranjang'), "SELECT keranjang_id FROM rincian_keranjang LIMIT 1"),
+]
+
+# Blok VIEWS di Bustbuy(v3)-add-constraint.sql; umur di SQLite dihitung seperti TIMESTAMPDIFF(YEAR, ...)
+VIEWS = {
+    'pengguna_dengan_umur': {
+        'mysql': """CREATE OR REPLACE VIEW pengguna_dengan_umur AS
+SELECT email, kata_sandi, nama_panjang, no_telp, tgl_lahir, foto_profil, is_pembeli, is_penjual,
+    TIMESTAMPDIFF(YEAR, tgl_lahir, CURDATE()) AS umur
+FROM pengguna""",
+        'sqlite': """CREATE VIEW IF NOT EXISTS pengguna_dengan_umur AS
+SELECT email, kata_sandi, nama_panjang, no_telp, tgl_lahir, foto_profil, is_pembeli, is_penjual,
+    (strftime('%Y', 'now') - strftime('%Y', tgl_lahir))
+        - (strftime('%m-%d', 'now') < strftime('%m-%d', tgl_lahir)) AS umur
+FROM pengguna""",
+    },
+    'top_5_tags': {
+        'mysql': """CREATE OR REPLACE VIEW top_5_tags AS
+SELECT tag, COUNT(no_produk) AS jumlah_produk
+FROM tag_produk
+GROUP BY tag
+ORDER BY jumlah_produk DESC
+LIMIT 5""",
+        'sqlite': """CREATE VIEW IF NOT EXISTS top_5_tags AS
+SELECT tag, COUNT(no_produk) AS jumlah_produk
+FROM tag_produk
+GROUP BY tag
+ORDER BY jumlah_produk DESC
+LIMIT 5""",
+    },
+}
+
+
+def percentiles(samples):
+    """p50/p90/p99/max in milliseconds."""
+    ordered = sorted(samples)
+
+    def at(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+    return {'p50': at(0.50), 'p90': at(0.90), 'p99': at(0.99), 'max': round(ordered[-1] * 1000, 3),
+            'mean': round(statistics.fmean(ordered) * 1000, 3)}
+
+
+class Workload:
+    """Run QUERIES against one database URL."""
+
+    def __init__(self, url, repeat=20):
+        self.url = url
+        self.repeat = repeat
+        self.connect, self.placeholder, self.dialect = connector(url)
+
+    def reset(self, force=False):
+        """Drop and recreate the BustBuy tables; refuses to drop data unless `force`."""
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            if not force:
+                try:
+                    cur.execute("SELECT COUNT(*) FROM pengguna")
+                    has_rows = cur.fetchone()[0] > 0
+                except Exception:
+                    has_rows = False
+                    conn.rollback()
+                if has_rows:
+                    raise RuntimeError(f"{self.url} sudah berisi data; pakai database kosong atau --reset")
+            for view in VIEWS:
+                cur.execute(f"DROP VIEW IF EXISTS {view}")
+            for table in reversed(load_order()):
+                cur.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.commit()
+        finally:
+            conn.close()
+        # load() juga mengisi tabel ringkasan untuk query *_summary
+        create_schema(self.url, plan() + list(SUMMARY_TABLES))
+
+    def load(self, scale, seed=1, now=None, workers=1, skew=None):
+        """Generate `scale` into the database, summary tables included; returns {table: rows}."""
+        ds = Dataset(scaled_counts(scale), seed=seed, now=now, skew=skew)
+        writer = DbWriter(self.url)
+        totals = generate(ds, writer, workers, plan() + list(SUMMARY_TABLES))
+        writer.close()
+        return totals
+
+    def build(self, conn):
+        """Create every index and view; returns {index: seconds to build}."""
+        cur = conn.cursor()
+        seconds = {}
+        for name in INDEXES:
+            started_at = time.perf_counter()
+            cur.execute(create_index_sql(name))
+            conn.commit()
+            seconds[name] = round(time.perf_counter() - started_at, 4)
+        for view in VIEWS.values():
+            cur.execute(view[self.dialect])
+        cur.execute("ANALYZE" if self.dialect == 'sqlite' else f"ANALYZE TABLE {', '.join(load_order())}")
+        if self.dialect == 'mysql':
+            cur.fetchall()
+        conn.commit()
+        return seconds
+
+    def params(self, conn, query):
+        if query.sample is None:
+            return ()
+        cur = conn.cursor()
+        cur.execute(query.sample)
+        row = cur.fetchone()
+        return tuple(row) if row else None
+
+    def time_query(self, conn, query, params):
+        sql = query.text(self.dialect, self.placeholder)
+        cur = conn.cursor()
+        samples = []
+        for _ in range(self.repeat):
+            started_at = time.perf_counter()
+            cur.execute(sql, params)
+            cur.fetchall()
+            samples.append(time.perf_counter() - started_at)
+        return percentiles(samples)
+
+    def explain(self, conn, query, params):
+        sql = query.text(self.dialect, self.placeholder)
+        cur = conn.cursor()
+        cur.execute(("EXPLAIN QUERY PLAN " if self.dialect == 'sqlite' else "EXPLAIN ") + sql, params)
+        return [' | '.join('' if value is None else str(value) for value in row) for row in cur.fetchall()]
+
+    def run(self, compare_indexes=True):
+        """Time every query with all indexes, then without each index in turn."""
+        conn = self.connect()
+        try:
+            build_seconds = self.build(conn)
+            queries = {}
+            params = {}
+            for query in QUERIES:
+                params[query.name] = self.params(conn, query)
+                if params[query.name] is None:
+                    continue  # tabel kosong pada skala ini
+                queries[query.name] = {
+                    'latency_ms': self.time_query(conn, query, params[query.name]),
+                    'plan': self.explain(conn, query, params[query.name]),
+                }
+            indexes = {}
+            for name, (table, columns) in INDEXES.items():
+                used_by = [q for q, result in queries.items() if any(name in line for line in result['plan'])]
+                entry = {'table': table, 'columns': list(columns), 'build_seconds': build_seconds[name],
+                         'used_by': used_by, 'without': {}}
+                indexes[name] = entry
+                if not compare_indexes:
+                    continue
+                cur = conn.cursor()
+                try:
+                    cur.execute(drop_index_sql(name, self.dialect))
+                    conn.commit()
+                except Exception as exc:
+                    # MySQL menolak drop index yang menopang foreign key
+                    conn.rollback()
+                    entry['skipped'] = str(exc)
+                    continue
+                for query in QUERIES:
+                    if table in query.tables and query.name in queries:
+                        latency = self.time_query(conn, query, params[query.name])
+                        entry['without'][query.name] = {
+                            'p50_ms': latency['p50'],
+                            'with_p50_ms': queries[query.name]['latency_ms']['p50'],
+                        }
+                cur.execute(create_index_sql(name))
+                conn.commit()
+            return {'queries': queries, 'indexes': indexes}
+        finally:
+            conn.close()
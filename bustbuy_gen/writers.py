@@ -0,0 +1,318 @@
+# Output writers. A writer receives rows table by table:
+#   begin_table(table, columns) -> write_row(row)* / comment(text)* -> end_table(table, count, note)
+# and close() once at the end.
+#
+# For tables generated concurrently (runner.py) a writer also hands out a
+# part writer per table with part_writer(table, tmpdir) -> (writer, handle);
+# once that table is complete, add_part(table, columns, count, handle) puts
+# it into the final output.
+
+import os
+import shutil
+
+from .schema import load_order
+
+
+# Prolog/epilog seperti mysqldump untuk load tanpa pemeriksaan FK dan UNIQUE
+CHECKS_OFF = ("SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0;\n"
+              "SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0;\n\n")
+CHECKS_ON = "\nSET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS;\nSET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS;\n"
+
+
+def sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if value is True:
+        return 'TRUE'
+    if value is False:
+        return 'FALSE'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+class NullWriter:
+    """Discards everything; used for tables that only fill key spaces."""
+
+    def begin_table(self, table, columns):
+        pass
+
+    def write_row(self, row):
+        pass
+
+    def comment(self, text):
+        pass
+
+    def end_table(self, table, count, note=''):
+        pass
+
+    def close(self):
+        pass
+
+    def part_writer(self, table, tmpdir):
+        return self, None
+
+    def add_part(self, table, columns, count, handle):
+        pass
+
+
+class StreamParts:
+    """part_writer/add_part for writers that produce one stream.
+
+    Each table goes to `<tmpdir>/<table>.part` and is appended to the main
+    stream by add_part, so parts must be added in the final table order.
+    """
+
+    owns_file = False
+
+    def part_writer(self, table, tmpdir):
+        path = os.path.join(tmpdir, f"{table}.part")
+        part = self.clone(open(path, 'w', encoding='utf-8'))
+        part.owns_file = True
+        return part, path
+
+    def add_part(self, table, columns, count, path):
+        self.start_section()
+        with open(path, encoding='utf-8') as src:
+            shutil.copyfileobj(src, self.f, 1 << 20)
+        os.remove(path)
+
+    def close_file(self):
+        if self.owns_file:
+            self.f.close()
+
+
+class SqlRowWriter(StreamParts):
+    """One INSERT statement per row, the format of test.txt.
+
+    `transactions` and `disable_checks` work as in ExtendedInsertWriter.
+    """
+
+    def __init__(self, f, transactions=False, disable_checks=False):
+        self.f = f
+        self.transactions = transactions
+        self.disable_checks = disable_checks
+        self.first = True
+        self.prefix = ''
+
+    def clone(self, f):
+        # Prolog/epilog (disable_checks) hanya ditulis oleh writer utama
+        return SqlRowWriter(f, self.transactions)
+
+    def start_section(self):
+        if not self.first:
+            self.f.write("\n")
+        elif self.disable_checks:
+            self.f.write(CHECKS_OFF)
+        self.first = False
+
+    def begin_table(self, table, columns):
+        self.start_section()
+        self.f.write(f"-- INSERT INTO {table}\n")
+        if self.transactions:
+            self.f.write("START TRANSACTION;\n")
+        self.prefix = f"INSERT INTO {table} ({', '.join(columns)})\n                 VALUES ("
+
+    def write_row(self, row):
+        self.f.write(self.prefix + ', '.join(map(sql_literal, row)) + ");\n")
+
+    def comment(self, text):
+        self.f.write(f"-- {text}\n")
+
+    def end_table(self, table, count, note=''):
+        if self.transactions:
+            self.f.write("COMMIT;\n")
+        self.f.write(f"-- Total {table}: {count}{note}\n")
+
+    def close(self):
+        if not self.first and self.disable_checks:
+            self.f.write(CHECKS_ON)
+        self.close_file()
+
+
+class ExtendedInsertWriter(StreamParts):
+    """Multi-row INSERT ... VALUES (...),(...); statements.
+
+    A statement is closed after `batch_size` rows or before it would grow
+    past `max_packet` bytes (keep this below the server's
+    max_allowed_packet). With `transactions` every table is wrapped in
+    START TRANSACTION / COMMIT, and with `disable_checks` the foreign key
+    and unique checks are switched off for the load and restored at the end,
+    the same way mysqldump does it.
+    """
+
+    def __init__(self, f, batch_size=1000, max_packet=1 << 20, transactions=False, disable_checks=False):
+        if batch_size < 1:
+            raise ValueError("batch_size harus >= 1")
+        self.f = f
+        self.batch_size = batch_size
+        self.max_packet = max_packet
+        self.transactions = transactions
+        self.disable_checks = disable_checks
+        self.started = False
+        self.prefix = ''
+        self.pending = []
+        self.pending_bytes = 0
+
+    def clone(self, f):
+        # Prolog/epilog (disable_checks) hanya ditulis oleh writer utama
+        return ExtendedInsertWriter(f, self.batch_size, self.max_packet, self.transactions)
+
+    def start_section(self):
+        if not self.started:
+            self.started = True
+            if self.disable_checks:
+                self.f.write(CHECKS_OFF)
+        else:
+            self.f.write("\n")
+
+    def begin_table(self, table, columns):
+        self.start_section()
+        self.f.write(f"-- INSERT INTO {table}\n")
+        if self.transactions:
+            self.f.write("START TRANSACTION;\n")
+        self.prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n"
+
+    def write_row(self, row):
+        values = '(' + ', '.join(map(sql_literal, row)) + ')'
+        size = len(values) if values.isascii() else len(values.encode('utf-8'))
+        # +2 untuk pemisah ",\n"; prefix dan ";\n" ikut dihitung dalam paket
+        if self.pending and (len(self.pending) >= self.batch_size
+                             or len(self.prefix) + self.pending_bytes + size + 2 > self.max_packet):
+            self.flush()
+        self.pending.append(values)
+        self.pending_bytes += size + 2
+
+    def flush(self):
+        if self.pending:
+            self.f.write(self.prefix + ',\n'.join(self.pending) + ';\n')
+            self.pending = []
+            self.pending_bytes = 0
+
+    def comment(self, text):
+        self.flush()
+        self.f.write(f"-- {text}\n")
+
+    def end_table(self, table, count, note=''):
+        self.flush()
+        if self.transactions:
+            self.f.write("COMMIT;\n")
+        self.f.write(f"-- Total {table}: {count}{note}\n")
+
+    def close(self):
+        self.flush()
+        if self.started and self.disable_checks:
+            self.f.write(CHECKS_ON)
+        self.close_file()
+
+
+_tsv_escapes = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+_csv_escapes = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+
+def tsv_field(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return '1'
+    if value is False:
+        return '0'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return str(value).translate(_tsv_escapes)
+
+
+def csv_field(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return '1'
+    if value is False:
+        return '0'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).translate(_csv_escapes) + '"'
+
+
+class DelimitedWriter:
+    """One delimited file per table plus a LOAD DATA script (load.sql).
+
+    Files use MySQL's LOAD DATA encoding: NULL is \\N and special characters
+    are backslash-escaped. With delimiter ',' strings are also enclosed in
+    double quotes. A table that is begun again (with the same columns) is
+    appended to its file. load.sql lists the tables in foreign key order and
+    is meant to be run from inside `directory`:
+
+        cd dump && mysql --local-infile=1 bustbuy_db < load.sql
+    """
+
+    def __init__(self, directory, delimiter='\t', disable_checks=False):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.delimiter = delimiter
+        self.disable_checks = disable_checks
+        self.extension = 'csv' if delimiter == ',' else 'tsv'
+        self.field = csv_field if delimiter == ',' else tsv_field
+        self.f = None
+        self.is_part = False
+        self.written = {}  # table -> [nama file, kolom, jumlah baris]
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def begin_table(self, table, columns):
+        filename = f"{table}.{self.extension}"
+        if table in self.written:
+            if tuple(self.written[table][1]) != tuple(columns):
+                raise ValueError(f"Kolom {table} berbeda dengan bagian sebelumnya: {', '.join(columns)}")
+            self.f = open(self.path(filename), 'a', encoding='utf-8', newline='')
+            return
+        self.f = open(self.path(filename), 'w', encoding='utf-8', newline='')
+        self.written[table] = [filename, columns, 0]
+
+    def write_row(self, row):
+        self.f.write(self.delimiter.join(map(self.field, row)) + '\n')
+
+    def comment(self, text):
+        pass
+
+    def end_table(self, table, count, note=''):
+        self.f.close()
+        self.f = None
+        self.written[table][2] += count
+
+    def part_writer(self, table, tmpdir):
+        # File per tabel sudah terpisah; part langsung menulis ke direktori output
+        part = DelimitedWriter(self.directory, self.delimiter)
+        part.is_part = True
+        return part, None
+
+    def add_part(self, table, columns, count, handle):
+        self.written[table] = [f"{table}.{self.extension}", columns, count]
+
+    def close(self):
+        if self.is_part:
+            return
+        entries = [(table, *self.written[table]) for table in load_order(self.written)]
+        write_load_script(self.path('load.sql'), entries, self.delimiter, self.disable_checks)
+
+
+def write_load_script(path, entries, delimiter='\t', disable_checks=False):
+    """LOAD DATA script for `entries` of (table, filename, columns, rows), in that order."""
+    quoted = '\\t' if delimiter == '\t' else delimiter
+    enclosed = " OPTIONALLY ENCLOSED BY '\"'" if delimiter == ',' else ''
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("-- Jalankan dari direktori ini: mysql --local-infile=1 bustbuy_db < load.sql\n")
+        if disable_checks:
+            f.write("SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0;\n"
+                    "SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0;\n")
+        for table, filename, columns, count in entries:
+            f.write(f"\n-- {table}: {count} baris\n"
+                    f"LOAD DATA LOCAL INFILE '{filename}' INTO TABLE {table}\n"
+                    f"    CHARACTER SET utf8mb4\n"
+                    f"    FIELDS TERMINATED BY '{quoted}'{enclosed} ESCAPED BY '\\\\'\n"
+                    f"    LINES TERMINATED BY '\\n'\n"
+                    f"    ({', '.join(columns)});\n")
+        if disable_checks:
+            f.write("\nSET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS;\n"
+                    "SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS;\n")
@@ -0,0 +1,40 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bustbuy_gen import Dataset, generate, scaled_counts  # noqa: E402
+from bustbuy_gen.writers import SqlRowWriter  # noqa: E402
+
+SEED = 5
+# Output hanya identik jika seed dan waktu acuan sama
+NOW = datetime(2024, 1, 1)
+
+
+@pytest.fixture(scope='session')
+def cache_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('vocab'))
+
+
+@pytest.fixture
+def make_dataset(cache_dir):
+    def make(scale=10, **options):
+        options.setdefault('seed', SEED)
+        options.setdefault('now', NOW)
+        return Dataset(scaled_counts(scale), cache_dir=cache_dir, **options)
+    return make
+
+
+@pytest.fixture
+def write_dump(tmp_path):
+    """Generate a Dataset into an INSERT-per-row dump; returns (path, totals)."""
+    def write(ds, name='dump.sql', **options):
+        path = tmp_path / name
+        with open(path, 'w', encoding='utf-8') as f:
+            totals = generate(ds, SqlRowWriter(f), **options)
+        return path, totals
+    return write
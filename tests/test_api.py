@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+from bustbuy_gen import ROW_TYPES, iter_dataset, iter_dump
+from bustbuy_gen.cli import main
+
+from conftest import ROOT, SEED
+
+
+def test_iter_dataset_matches_dump(make_dataset, write_dump):
+    path, totals = write_dump(make_dataset(scale=5))
+    records = list(iter_dataset(make_dataset(scale=5)))
+    assert all(isinstance(record, ROW_TYPES[table]) for table, record in records)
+    assert [(table, tuple(record)) for table, record in records] == \
+        [(table, tuple(values)) for table, _, values in iter_dump(str(path))]
+    assert len(records) == sum(totals.values())
+
+
+def test_iter_dataset_yields_only_requested_tables(make_dataset):
+    tables = {table for table, _ in iter_dataset(make_dataset(scale=5), ['ulasan'])}
+    assert tables == {'ulasan'}
+
+
+def test_cli_writes_dump(cache_dir, tmp_path):
+    path = tmp_path / 'out.sql'
+    main(['--scale', '1', '--seed', str(SEED), '--now', '2024-01-01 00:00:00', '--cache-dir', cache_dir,
+          '--tables', 'pengguna', '-o', str(path)])
+    text = path.read_text(encoding='utf-8')
+    assert 'INSERT INTO pengguna' in text
+    assert 'INSERT INTO pembeli' not in text
+
+
+def test_faker_is_not_imported_with_cached_pools(cache_dir):
+    code = ("import sys; from bustbuy_gen import Dataset, NullWriter, generate, scaled_counts; "
+            "assert 'faker' not in sys.modules; "
+            f"generate(Dataset(scaled_counts(1), seed={SEED}, cache_dir={cache_dir!r}), NullWriter()); "
+            "print('faker' in sys.modules)")
+    # Run pertama mengisi cache jika belum ada; run kedua hanya membacanya
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True)
+    assert result.stdout.strip() == 'False'
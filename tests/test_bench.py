@@ -0,0 +1,23 @@
+from bustbuy_gen.bench import compare, run_case
+
+from conftest import NOW, SEED
+
+
+def test_run_case_measures_every_table(monkeypatch, cache_dir, tmp_path):
+    monkeypatch.setenv('BUSTBUY_CACHE', cache_dir)
+    result = run_case('rows', 1, seed=SEED, now=NOW, trace=True, workdir=str(tmp_path))
+    assert result['rows'] == sum(section['rows'] for section in result['tables'].values())
+    assert result['output_bytes'] > 0
+    assert all('tracemalloc_peak_kb' in section for section in result['tables'].values())
+
+
+def test_compare_reports_changes_above_threshold():
+    def runs(rate):
+        return {'runs': [{'mode': 'rows', 'scale': 1, 'rows_per_sec': rate,
+                          'tables': {'pengguna': {'rows_per_sec': rate}, 'produk': {'rows_per_sec': 100}}}]}
+
+    lines = compare(runs(100), runs(150))
+    assert len(lines) == 2
+    assert '(total)' in lines[0] and '+50%' in lines[0]
+    assert 'pengguna' in lines[1]
+    assert compare(runs(100), runs(105)) == []
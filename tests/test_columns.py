@@ -0,0 +1,48 @@
+import random
+import re
+from datetime import date, datetime
+
+import pytest
+
+from bustbuy_gen.columns import HAVE_NUMPY, NumpyColumns, PyColumns
+from bustbuy_gen.helpers import birth_day_range, format_phone_number
+
+ENGINES = [PyColumns] + ([NumpyColumns] if HAVE_NUMPY else [])
+
+
+def age(born, today):
+    # TIMESTAMPDIFF(YEAR, born, today)
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+@pytest.mark.parametrize('today', [date(2024, 2, 29), date(2024, 3, 1), date(2025, 1, 1)])
+def test_birth_day_range_keeps_ages_between_bounds(today):
+    cols = PyColumns(random.Random(1))
+    low, high = birth_day_range(18, 80)
+    edges = cols.days_ago(today, low, low, 1, '%Y-%m-%d') + cols.days_ago(today, high, high, 1, '%Y-%m-%d')
+    ages = [age(datetime.strptime(d, '%Y-%m-%d').date(), today) for d in edges]
+    assert ages[0] >= 18
+    assert ages[1] <= 80
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engine_draws_stay_in_range(engine):
+    cols = engine(random.Random(3))
+    assert all(2 <= v <= 5 for v in cols.integers(2, 5, 500))
+    assert all(0 <= v < b for v, b in zip(cols.below([1, 2, 10] * 100), [1, 2, 10] * 100))
+    assert all(1.0 <= v <= 2.0 for v in cols.uniform(1.0, 2.0, 500, 2))
+    picked = cols.sample_sorted(50, 20)
+    assert picked == sorted(set(picked)) and len(picked) == 20
+    days = cols.days_ago(date(2024, 1, 1), 1, 3, 100, '%Y-%m-%d')
+    assert set(days) <= {'2023-12-29', '2023-12-30', '2023-12-31'}
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engine_is_reproducible_for_same_seed(engine):
+    first = engine(random.Random(9)).integers(0, 10 ** 9 - 1, 50)
+    assert engine(random.Random(9)).integers(0, 10 ** 9 - 1, 50) == first
+
+
+def test_format_phone_number():
+    assert format_phone_number(12345678) == '+62-012-345-678'
+    assert re.fullmatch(r'\+62-\d{3}-\d{3}-\d{3}', format_phone_number(10 ** 9 - 1))
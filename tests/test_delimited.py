@@ -0,0 +1,27 @@
+import re
+
+import pytest
+
+from bustbuy_gen import verify
+from bustbuy_gen.runner import generate
+from bustbuy_gen.schema import load_order
+from bustbuy_gen.writers import DelimitedWriter
+
+from conftest import NOW
+
+
+@pytest.mark.parametrize('delimiter', ['\t', ','])
+def test_delimited_export_round_trips(make_dataset, tmp_path, delimiter):
+    directory = tmp_path / 'dump'
+    writer = DelimitedWriter(str(directory), delimiter, disable_checks=True)
+    totals = generate(make_dataset(scale=5), writer)
+    writer.close()
+
+    script = (directory / 'load.sql').read_text(encoding='utf-8')
+    loaded = re.findall(r"INTO TABLE (\w+)", script)
+    assert loaded == load_order(totals)
+    assert 'FOREIGN_KEY_CHECKS=0' in script
+
+    report = verify([str(directory)], today=NOW.date())
+    assert report['violations'] == {}
+    assert report['rows'] == {table: count for table, count in totals.items() if count}
@@ -0,0 +1,21 @@
+from bustbuy_gen import verify
+from bustbuy_gen.runner import generate
+from bustbuy_gen.writers import NullWriter
+
+from conftest import NOW
+
+
+def test_user_emails_are_unique(make_dataset):
+    ds = make_dataset(scale=20)
+    generate(ds, NullWriter(), tables=['pengguna'])
+    users = ds.users
+    emails = {users.email(uid) for uid in range(len(users))}
+    assert len(users) == ds.counts['pengguna']
+    assert len(emails) == len(users)
+
+
+def test_dump_passes_verify(make_dataset, write_dump):
+    path, totals = write_dump(make_dataset(scale=10))
+    report = verify([str(path)], today=NOW.date())
+    assert report['violations'] == {}
+    assert report['rows'] == {table: count for table, count in totals.items() if count}
@@ -0,0 +1,57 @@
+import random
+from collections import Counter
+
+import pytest
+
+from bustbuy_gen.keys import AliasTable, Csr, ProdukKeys, nama_varian_for, sku_for, varian_code
+
+
+def test_csr_children_and_nonempty():
+    csr = Csr()
+    for children in ([3, 4], [], [7]):
+        csr.append(children)
+    assert len(csr) == 3
+    assert [csr.count(i) for i in range(3)] == [2, 0, 1]
+    assert csr.child(2, 0) == 7
+    assert list(csr.nonempty()) == [0, 2]
+    csr.append([])
+    csr.append([9])
+    assert list(csr.nonempty()) == [0, 2, 4]
+
+
+def test_produk_ranges_per_seller():
+    keys = ProdukKeys()
+    keys.add_seller(10, 2)
+    keys.add_seller(11, 0)
+    keys.add_seller(12, 3)
+    assert len(keys) == 5
+    assert keys.produk_range(0) == (1, 2)
+    assert keys.produk_range(2) == (3, 5)
+    assert [keys.seller_of(no) for no in range(1, 6)] == [10, 10, 12, 12, 12]
+    assert list(keys.sellers_with_produk()) == [0, 2]
+
+
+def test_varian_sku_and_harga():
+    keys = ProdukKeys()
+    keys.add_seller(0, 2)
+    keys.add_varian([varian_code(0), varian_code(1, 2)], [1.5, 2.5])
+    keys.add_varian([], [])
+    assert keys.varian_count(1) == 2 and keys.varian_count(2) == 0
+    assert keys.sku(1, 1) == sku_for(1, varian_code(1, 2))
+    assert keys.harga(1, 1) == 2.5
+    assert list(keys.produk_with_varian()) == [0]
+    assert nama_varian_for(varian_code(0)).startswith('Warna: ')
+    assert ', Ukuran: ' in nama_varian_for(varian_code(1, 2))
+
+
+def test_alias_table_follows_weights():
+    table = AliasTable([1, 0, 3])
+    rng = random.Random(1)
+    counts = Counter(table.draw(rng) for _ in range(20000))
+    assert counts[1] == 0
+    assert counts[2] / counts[0] == pytest.approx(3, rel=0.1)
+
+
+def test_alias_table_needs_positive_weight():
+    with pytest.raises(ValueError):
+        AliasTable([0, 0])
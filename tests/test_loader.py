@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+
+from bustbuy_gen.loader import DbWriter, create_schema
+from bustbuy_gen.runner import generate
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_rows_load_into_sqlite_with_foreign_keys(make_dataset, tmp_path, workers):
+    path = tmp_path / 'bustbuy.db'
+    url = f"sqlite:///{path}"
+    create_schema(url)
+    writer = DbWriter(url, batch_size=50, commit_every=200)
+    totals = generate(make_dataset(scale=10), writer, workers)
+    writer.close()
+
+    conn = sqlite3.connect(path)
+    try:
+        for table, count in totals.items():
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == count
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        conn.close()
+    assert set(writer.stats) == {table for table, count in totals.items() if count}
+
+
+def test_load_error_is_raised(make_dataset, tmp_path):
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+    writer = DbWriter(url)
+    # Tanpa create_schema tabelnya tidak ada
+    with pytest.raises(RuntimeError):
+        generate(make_dataset(scale=1), writer, tables=['pengguna'])
+    # close() tetap menutup koneksi lalu melaporkan error yang sama
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert writer.pool is None
@@ -0,0 +1,34 @@
+import pytest
+
+from bustbuy_gen.runner import generate
+from bustbuy_gen.writers import NullWriter
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_output_is_identical_for_any_worker_count(make_dataset, write_dump, vectorized):
+    if vectorized:
+        pytest.importorskip('numpy')
+    dumps = []
+    for workers in (1, 2):
+        # Chunk kecil agar tabel besar terbagi ke beberapa chunk
+        ds = make_dataset(scale=10, chunk_rows=97, vectorized=vectorized)
+        path, _ = write_dump(ds, f"workers-{workers}.sql", workers=workers)
+        dumps.append(path.read_bytes())
+    assert dumps[0] == dumps[1]
+
+
+def test_output_depends_on_now(make_dataset, write_dump):
+    from datetime import datetime
+
+    first, _ = write_dump(make_dataset(scale=5), 'a.sql')
+    second, _ = write_dump(make_dataset(scale=5, now=datetime(2024, 6, 1)), 'b.sql')
+    assert first.read_bytes() != second.read_bytes()
+
+
+def test_chunked_key_spaces_match_serial(make_dataset):
+    serial = make_dataset(scale=10, chunk_rows=97)
+    generate(serial, NullWriter(), tables=['pesanan'])
+    chunked = make_dataset(scale=10, chunk_rows=97)
+    generate(chunked, NullWriter(), 2, tables=['pesanan'])
+    assert serial.pesanan_seller == chunked.pesanan_seller
+    assert list(serial.users.pembeli) == list(chunked.users.pembeli)
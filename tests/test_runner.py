@@ -0,0 +1,49 @@
+import importlib.util
+import os
+import re
+
+import pytest
+
+from bustbuy_gen.runner import plan
+from bustbuy_gen.tables import REGISTRY
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script():
+    path = os.path.join(ROOT, 'wishlist-keranjang-faker.py')
+    spec = importlib.util.spec_from_file_location('wishlist_keranjang_faker', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_plan_adds_dependencies_in_registry_order():
+    order = plan(['rincian_keranjang'])
+    assert order[-1] == 'rincian_keranjang'
+    for table in order:
+        for dep in REGISTRY[table].deps:
+            assert order.index(dep) < order.index(table)
+    assert plan(['rincian_keranjang'], done=['pengguna'])[0] != 'pengguna'
+
+
+def test_plan_rejects_unknown_table():
+    with pytest.raises(ValueError):
+        plan(['tidak_ada'])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_requested_tables_only_are_written(make_dataset, write_dump, workers):
+    tables = load_script().TABLES
+    path, totals = write_dump(make_dataset(scale=5), tables=tables, workers=workers)
+    written = set(re.findall(r"^INSERT INTO (\w+) \(", path.read_text(encoding='utf-8'), re.M))
+    assert written == set(tables)
+    assert {table for table, count in totals.items() if count} >= written
+
+
+def test_script_has_no_side_effects_on_import(monkeypatch, capsys, cache_dir):
+    monkeypatch.setenv('BUSTBUY_CACHE', cache_dir)
+    module = load_script()
+    assert capsys.readouterr().out == ''
+    module.main(['--scale', '1', '--seed', '5'])
+    assert 'INSERT INTO wishlist' in capsys.readouterr().out
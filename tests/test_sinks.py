@@ -0,0 +1,82 @@
+import gzip
+import json
+
+import pytest
+
+from bustbuy_gen import verify
+from bustbuy_gen.runner import generate
+from bustbuy_gen.sinks import ShardedWriter, ShardStream, parse_size
+
+from conftest import NOW
+
+
+def test_parse_size():
+    assert parse_size('256M') == 256 << 20
+    assert parse_size('1.5k') == 1536
+    assert parse_size('100') == 100
+
+
+@pytest.mark.parametrize('fmt', ['rows', 'extended'])
+def test_shards_and_manifest(make_dataset, tmp_path, fmt):
+    directory = tmp_path / 'dump'
+    writer = ShardedWriter(str(directory), fmt, shard_bytes=4096, codec='gzip', buffer_size=512,
+                           disable_checks=True, batch_size=20)
+    totals = generate(make_dataset(scale=5), writer)
+    writer.close()
+
+    manifest = json.loads((directory / 'manifest.json').read_text(encoding='utf-8'))
+    tables = {table['table']: table for table in manifest['tables']}
+    assert {table: entry['rows'] for table, entry in tables.items()} == totals
+    assert len(tables['pengguna']['shards']) > 1
+    for entry in tables.values():
+        assert sum(shard['rows'] for shard in entry['shards']) == entry['rows']
+        for shard in entry['shards']:
+            with gzip.open(directory / shard['file']) as f:
+                data = f.read()
+            assert len(data) == shard['bytes']
+            # Setiap shard berdiri sendiri
+            assert data.startswith(b'SET @OLD_UNIQUE_CHECKS')
+            assert data.rstrip().endswith(b'SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS;')
+    assert verify([str(directory)], today=NOW.date())['violations'] == {}
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'rows'])
+def test_no_empty_shards(make_dataset, tmp_path, fmt):
+    # Setiap baris melewati shard_bytes: shard baru hanya dibuka untuk baris berikutnya
+    directory = tmp_path / 'dump'
+    writer = ShardedWriter(str(directory), fmt, shard_bytes=1)
+    totals = generate(make_dataset(scale=0.2), writer)
+    writer.close()
+    manifest = json.loads((directory / 'manifest.json').read_text(encoding='utf-8'))
+    for table in manifest['tables']:
+        assert len(table['shards']) == totals[table['table']]
+        assert all(shard['rows'] == 1 for shard in table['shards'])
+    if fmt == 'csv':
+        load = (directory / 'load.sql').read_text(encoding='utf-8')
+        assert load.count('LOAD DATA') == sum(totals.values())
+
+
+def test_write_error_closes_every_shard(make_dataset, tmp_path, monkeypatch):
+    streams = []
+    init, write = ShardStream.__init__, ShardStream.write
+
+    def tracking_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        streams.append(self)
+
+    def failing_write(self, data):
+        if len(streams) > 3:
+            raise OSError("disk penuh")
+        write(self, data)
+
+    monkeypatch.setattr(ShardStream, '__init__', tracking_init)
+    monkeypatch.setattr(ShardStream, 'write', failing_write)
+    writer = ShardedWriter(str(tmp_path / 'dump'), 'rows', shard_bytes=2048, codec='gzip', buffer_size=256)
+    with pytest.raises(RuntimeError):
+        generate(make_dataset(scale=5), writer)
+        writer.close()
+    # Generator berhenti di tengah shard; close() tetap menutup semuanya
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert len(streams) > 3
+    assert all(stream.raw.closed for stream in streams)
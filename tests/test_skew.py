@@ -0,0 +1,45 @@
+import random
+from collections import Counter
+
+import pytest
+
+from bustbuy_gen import verify
+from bustbuy_gen.skew import SKEW_COLUMNS, _alias_table, parse_profile, parse_skew, profile_weights
+
+from conftest import NOW
+
+
+def test_parse_profile():
+    assert parse_profile('ZIPF') == 'zipf:1'
+    assert parse_profile('power') == 'power:1.16'
+    assert parse_profile(' hot:20/80 ') == 'hot:20/80'
+    for text in ('zipf:0', 'hot:20', 'hot:0/80', 'pareto', 'uniform:1'):
+        with pytest.raises(ValueError):
+            parse_profile(text)
+
+
+def test_parse_skew():
+    assert parse_skew('zipf:1.1') == dict.fromkeys(SKEW_COLUMNS, 'zipf:1.1')
+    assert parse_skew('pesanan.email_penjual=hot:10/90') == {'pesanan.email_penjual': 'hot:10/90'}
+    with pytest.raises(ValueError):
+        parse_skew('pesanan.no_pesanan=zipf')
+
+
+def test_hot_profile_share():
+    weights = profile_weights('hot:20/80', 1000, random.Random(1))
+    assert sum(sorted(weights, reverse=True)[:200]) == pytest.approx(0.8)
+    table = _alias_table('hot:20/80', 1000, 1, 'pesanan.email_penjual')
+    rng = random.Random(2)
+    counts = Counter(table.draw(rng) for _ in range(50000))
+    top = sum(count for _, count in counts.most_common(200))
+    assert top / 50000 == pytest.approx(0.8, abs=0.02)
+
+
+def test_skewed_sellers_in_dump(make_dataset, write_dump):
+    ds = make_dataset(scale=20, skew={'pesanan.email_penjual': 'hot:10/90'})
+    path, _ = write_dump(ds)
+    assert verify([str(path)], today=NOW.date())['violations'] == {}
+    counts = Counter(ds.pesanan_seller)
+    sellers = len(ds.produk.sellers_with_produk())
+    hot = sum(count for _, count in counts.most_common(max(1, round(sellers / 10))))
+    assert hot / len(ds.pesanan_seller) > 0.8
@@ -0,0 +1,29 @@
+from datetime import date, datetime
+
+from bustbuy_gen import scaled_counts, verify
+from bustbuy_gen.state import DELTA_TABLES, generate_delta, load_state, read_manifest, save_state
+from bustbuy_gen.writers import SqlRowWriter
+
+
+def test_delta_dumps_verify_with_base(make_dataset, write_dump, cache_dir, tmp_path):
+    state = str(tmp_path / 'state.json')
+    ds = make_dataset(scale=5)
+    base, totals = write_dump(ds, 'base.sql')
+    assert save_state(ds, state, totals)['delta'] == 0
+
+    paths = [str(base)]
+    for delta in (1, 2):
+        ds, manifest = load_state(state, scaled_counts(2), now=datetime(2024, 1, 1 + delta), cache_dir=cache_dir)
+        assert ds.delta == delta
+        path = tmp_path / f"delta-{delta}.sql"
+        with open(path, 'w', encoding='utf-8') as f:
+            totals = generate_delta(ds, SqlRowWriter(f))
+        assert {table for table, count in totals.items() if count} <= set(DELTA_TABLES)
+        assert totals['pesanan'] > 0
+        save_state(ds, state, totals, manifest)
+        paths.append(str(path))
+
+    # Baris delta merujuk key dari dump sebelumnya dan tidak bentrok dengannya
+    report = verify(paths, today=date(2024, 1, 3))
+    assert report['violations'] == {}
+    assert [entry['delta'] for entry in read_manifest(state)['history']] == [0, 1, 2]
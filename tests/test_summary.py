@@ -0,0 +1,119 @@
+import sqlite3
+
+import pytest
+
+from bustbuy_gen.cli import main
+from bustbuy_gen.loader import DbWriter, create_schema
+from bustbuy_gen.runner import generate, plan
+from bustbuy_gen.summary import REBUILD, SUMMARY_TABLES, install_summary, refresh_summary, summary_script
+
+from conftest import ROOT, SEED
+
+AGGREGATES = {
+    'buyer_stats': "SELECT email_pembeli, jumlah_pesanan, ROUND(total_belanja, 2), jumlah_ulasan_positif "
+                   "FROM buyer_stats ORDER BY email_pembeli",
+    'tag_counts': "SELECT tag, jumlah_produk FROM tag_counts ORDER BY tag",
+}
+
+
+def summaries(conn):
+    return {table: conn.execute(sql).fetchall() for table, sql in AGGREGATES.items()}
+
+
+def rebuilt(conn):
+    # Hasil REBUILD tanpa mengubah isi tabel ringkasan
+    conn.execute("SAVEPOINT rebuild")
+    for statement in REBUILD:
+        conn.execute(statement)
+    result = summaries(conn)
+    conn.execute("ROLLBACK TO rebuild")
+    conn.execute("RELEASE rebuild")
+    return result
+
+
+@pytest.fixture
+def loaded(make_dataset, tmp_path):
+    path = tmp_path / 'summary.db'
+    url = f"sqlite:///{path}"
+    create_schema(url)
+    create_schema(url, SUMMARY_TABLES)
+    writer = DbWriter(url)
+    totals = generate(make_dataset(scale=10), writer, tables=plan() + list(SUMMARY_TABLES))
+    writer.close()
+    conn = sqlite3.connect(path)
+    yield url, conn, totals
+    conn.close()
+
+
+def test_generated_summary_matches_base_tables(loaded):
+    _, conn, totals = loaded
+    assert totals['buyer_stats'] > 0 and totals['tag_counts'] > 0
+    assert summaries(conn) == rebuilt(conn)
+
+
+def test_triggers_keep_summary_current(loaded):
+    url, conn, _ = loaded
+    install_summary(url)
+    email, alamat_id, penjual = conn.execute(
+        "SELECT email_pembeli, alamat_id, email_penjual FROM pesanan LIMIT 1").fetchone()
+    conn.execute("INSERT INTO pesanan (no_pesanan, status_pesanan, harga_total, metode_bayar, waktu_pesan, "
+                 "metode_kirim, email_pembeli, alamat_id, email_penjual) "
+                 "VALUES (999999, 'Diproses', 12.5, 'Transfer', '2024-01-01 00:00:00', 'Reguler', ?, ?, ?)",
+                 (email, alamat_id, penjual))
+    conn.execute("UPDATE pesanan SET harga_total = harga_total + 1 WHERE no_pesanan = 1")
+    conn.execute("UPDATE ulasan SET nilai = CASE WHEN nilai >= 4 THEN 1 ELSE 5 END "
+                 "WHERE rowid IN (SELECT rowid FROM ulasan LIMIT 5)")
+    conn.execute("DELETE FROM tag_produk WHERE rowid IN (SELECT rowid FROM tag_produk LIMIT 10)")
+    conn.execute("UPDATE tag_produk SET tag = 'tag-baru' WHERE rowid IN "
+                 "(SELECT MIN(rowid) FROM tag_produk GROUP BY no_produk LIMIT 3)")
+    conn.execute("DELETE FROM ulasan WHERE email_pembeli = ? OR no_pesanan IN "
+                 "(SELECT no_pesanan FROM pesanan WHERE email_pembeli = ?)", (email, email))
+    conn.execute("DELETE FROM rincian_pesanan WHERE no_pesanan IN "
+                 "(SELECT no_pesanan FROM pesanan WHERE email_pembeli = ?)", (email,))
+    conn.execute("DELETE FROM pesanan WHERE email_pembeli = ?", (email,))
+    conn.commit()
+    assert summaries(conn) == rebuilt(conn)
+    assert conn.execute("SELECT COUNT(*) FROM buyer_stats WHERE email_pembeli = ?", (email,)).fetchone()[0] == 0
+    # Urutan tag dengan jumlah sama tidak ditentukan; cukup bandingkan jumlahnya
+    top = [count for _, count in conn.execute("SELECT * FROM top_5_tags")]
+    assert top == [count for count, in conn.execute(
+        "SELECT COUNT(*) FROM tag_produk GROUP BY tag ORDER BY COUNT(*) DESC LIMIT 5")]
+
+
+def test_refresh_summary_rebuilds_tables(loaded):
+    url, conn, totals = loaded
+    conn.execute("DELETE FROM buyer_stats")
+    conn.commit()
+    counts = refresh_summary(url)
+    assert counts == {table: totals[table] for table in SUMMARY_TABLES}
+
+
+@pytest.mark.parametrize('part, filename', [('tables', 'Summary.sql'), ('triggers', 'Summary-trigger.sql')])
+def test_shipped_scripts_are_current(part, filename):
+    with open(f"{ROOT}/{filename}", encoding='utf-8') as f:
+        assert f.read() == summary_script(part)
+
+
+def test_default_schema_has_no_summary_tables(tmp_path):
+    path = tmp_path / 'plain.db'
+    create_schema(f"sqlite:///{path}")
+    conn = sqlite3.connect(path)
+    try:
+        tables = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+    assert tables == set(plan())
+
+
+def test_cli_summary_creates_and_maintains_tables(cache_dir, tmp_path):
+    path = tmp_path / 'cli.db'
+    main(['--scale', '2', '--seed', str(SEED), '--cache-dir', cache_dir, '--db', f"sqlite:///{path}",
+          '--create-schema', '--summary'])
+    conn = sqlite3.connect(path)
+    try:
+        assert summaries(conn) == rebuilt(conn)
+        assert conn.execute("SELECT COUNT(*) FROM buyer_stats").fetchone()[0] > 0
+        triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+    finally:
+        conn.close()
+    assert triggers == 9
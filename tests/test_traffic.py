@@ -0,0 +1,88 @@
+import random
+import sqlite3
+
+import pytest
+
+from bustbuy_gen.loader import DbWriter, create_schema
+from bustbuy_gen.runner import generate
+from bustbuy_gen.traffic import Simulator, install_status_trigger, population
+
+from conftest import NOW, SEED
+
+
+@pytest.fixture
+def loaded(make_dataset, monkeypatch, cache_dir, tmp_path):
+    monkeypatch.setenv('BUSTBUY_CACHE', cache_dir)
+    path = tmp_path / 'traffic.db'
+    url = f"sqlite:///{path}"
+    create_schema(url)
+    writer = DbWriter(url)
+    generate(make_dataset(scale=5), writer)
+    writer.close()
+    install_status_trigger(url)
+    return path, url
+
+
+def test_simulated_traffic_keeps_constraints(loaded):
+    path, url = loaded
+    simulator = Simulator(url, population(5, seed=SEED, now=NOW), buyers=3)
+    report = simulator.run(duration=None, total_ops=120)
+    operations = report['operations']
+    assert sum(op['count'] for op in operations.values()) == 120
+    failed = [outcome for op in operations.values() for outcome in op['outcomes'] if outcome.startswith('gagal')]
+    assert failed == []
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert conn.execute("SELECT COUNT(*) FROM varian WHERE stok < 0").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_status_trigger_rejects_invalid_transition(loaded):
+    path, _ = loaded
+    conn = sqlite3.connect(path)
+    try:
+        no_pesanan = conn.execute("SELECT no_pesanan FROM pesanan WHERE status_pesanan = 'Selesai'").fetchone()
+        if no_pesanan is None:
+            pytest.skip("tidak ada pesanan Selesai pada skala ini")
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("UPDATE pesanan SET status_pesanan = 'Diproses' WHERE no_pesanan = ?", no_pesanan)
+    finally:
+        conn.close()
+
+
+def test_population_must_match_database(loaded):
+    _, url = loaded
+    with pytest.raises(RuntimeError):
+        Simulator(url, population(1, seed=SEED, now=NOW)).run(total_ops=1)
+
+
+def test_unknown_operation_is_rejected(loaded):
+    _, url = loaded
+    with pytest.raises(ValueError):
+        Simulator(url, population(1, seed=SEED, now=NOW), mix={'refund': 1})
+
+
+def test_cart_add_upserts_and_enforces_foreign_keys(loaded):
+    _, url = loaded
+    simulator = Simulator(url, population(5, seed=SEED, now=NOW))
+    conn = simulator.connect()
+    try:
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        # Random dengan state sama -> baris rincian_keranjang yang sama dua kali
+        state = random.Random(7).getstate()
+        for _ in range(2):
+            rng = random.Random()
+            rng.setstate(state)
+            assert simulator.cart_add(conn, rng) == 'ok'
+        rng = random.Random()
+        rng.setstate(state)
+        keranjang_id = rng.randint(1, simulator.ds.jumlah_keranjang)
+        jumlah = conn.execute("SELECT MAX(jumlah) FROM rincian_keranjang WHERE keranjang_id = ?",
+                              (keranjang_id,)).fetchone()[0]
+        assert jumlah >= 2
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(simulator.cart_upsert, (keranjang_id, 10 ** 9, 'tidak-ada'))
+    finally:
+        conn.close()
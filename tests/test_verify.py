@@ -0,0 +1,70 @@
+from datetime import date
+
+from bustbuy_gen import verify
+from bustbuy_gen.verify import IdMap, KeySet
+
+COLUMNS = "(email, kata_sandi, nama_panjang, no_telp, tgl_lahir, foto_profil, is_pembeli, is_penjual)"
+
+# Satu pelanggaran per aturan: no_telp salah format (baris 2), umur di bawah
+# 18 (baris 3) dan PK rincian_pesanan ganda (baris 2); baris 4 tepat 18 tahun
+BAD_DUMP = f"""-- Dump kecil dengan tiga pelanggaran
+INSERT INTO pengguna {COLUMNS} VALUES ('budi1@gmail.com', 'budXy12', 'Budi Santoso', '+62-812-345-678', '1990-05-01', NULL, 1, 0);
+INSERT INTO pengguna {COLUMNS} VALUES ('sari2@gmail.com', 'sarAb34', 'Sari Dewi', '0812345678', '1985-02-03', NULL, 0, 1);
+INSERT INTO pengguna {COLUMNS} VALUES ('andi3@gmail.com', 'andCd56', 'Andi Wijaya', '+62-813-000-111', '2010-06-30', NULL, 1, 0);
+INSERT INTO pengguna {COLUMNS} VALUES ('rina4@gmail.com', 'rinEf78', 'Rina Putri', '+62-814-222-333', '2006-01-01', NULL, 1, 0);
+INSERT INTO rincian_pesanan (no_pesanan, no_produk, sku, jumlah) VALUES (1, 1, '1-Merah', 2);
+INSERT INTO rincian_pesanan (no_pesanan, no_produk, sku, jumlah) VALUES (1, 1, '1-Merah', 3);
+"""
+
+
+def test_hand_written_violations_are_reported(tmp_path):
+    path = tmp_path / 'bad.sql'
+    path.write_text(BAD_DUMP, encoding='utf-8')
+    report = verify([str(path)], today=date(2024, 1, 1))
+    assert report['violations'] == {'chk_no_telp_format': 1, 'primary_key': 1, 'validate_pengguna_age_insert': 1}
+    examples = {rule: [(e['table'], e['row']) for e in found] for rule, found in report['examples'].items()}
+    assert examples == {
+        'chk_no_telp_format': [('pengguna', 2)],
+        'primary_key': [('rincian_pesanan', 2)],
+        'validate_pengguna_age_insert': [('pengguna', 3)],
+    }
+    assert report['rows'] == {'pengguna': 4, 'rincian_pesanan': 2}
+    # Tabel induk yang tidak ada di dump dilaporkan, bukan dihitung sebagai pelanggaran FK
+    assert report['missing_parents'] == ['pesanan', 'varian']
+
+
+def test_large_ids_use_sparse_storage(tmp_path):
+    path = tmp_path / 'big.sql'
+    path.write_text(
+        "INSERT INTO pesanan (no_pesanan, status_pesanan, metode_bayar, metode_kirim) "
+        "VALUES (2147483647, 'Diproses', 'COD', 'Same Day');\n"
+        "INSERT INTO pesanan (no_pesanan, status_pesanan, metode_bayar, metode_kirim) "
+        "VALUES (2147483647, 'Diproses', 'COD', 'Same Day');\n"
+        "INSERT INTO rincian_pesanan (no_pesanan, no_produk, sku, jumlah) VALUES (2147483647, 1, '1-Merah', 1);\n"
+        "INSERT INTO rincian_pesanan (no_pesanan, no_produk, sku, jumlah) VALUES (2147483646, 1, '1-Merah', 1);\n",
+        encoding='utf-8')
+    report = verify([str(path)], today=date(2024, 1, 1))
+    assert report['violations'] == {'foreign_key': 1, 'primary_key': 1}
+    assert report['examples']['foreign_key'][0]['detail'].startswith('2147483646')
+
+
+def test_key_set_and_id_map_mix_dense_and_sparse_ids():
+    keys, covered = KeySet(), KeySet()
+    ids = [0, 5, 2147483647, 7, 1 << 40]
+    for i in ids:
+        assert keys.add(i)
+        assert not keys.add(i)
+    assert len(keys) == len(ids)
+    assert len(keys.bits) < 1 << 20
+    assert all(i in keys for i in ids) and 6 not in keys
+    for i in (5, 1 << 40):
+        covered.add(i)
+    assert keys.count_missing(covered) == 3
+
+    seller = IdMap()
+    seller.set(3, 'a@gmail.com')
+    seller.set(2147483647, 'b@gmail.com')
+    assert len(seller.values) < 1 << 20
+    assert seller.get(2147483647) == hash('b@gmail.com')
+    assert seller.get(3) == hash('a@gmail.com')
+    assert seller.get(4) == 0
@@ -0,0 +1,37 @@
+import os
+import re
+
+from bustbuy_gen import verify, vocab
+from bustbuy_gen.vocab import POOL_SIZES, POOL_VERSION, PooledFaker, load_pools
+
+from conftest import NOW, SEED
+
+UUID4 = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}')
+
+
+def test_pools_are_cached_on_disk(cache_dir, monkeypatch):
+    pools = load_pools('id_ID', SEED, cache_dir)
+    assert {name: len(pool) for name, pool in pools.items()} == POOL_SIZES
+    assert os.path.exists(os.path.join(cache_dir, f"vocab-id_ID-{SEED}-v{POOL_VERSION}.pickle"))
+    # Tanpa cache di memori, pool dibaca dari disk tanpa membangun ulang
+    monkeypatch.setattr(vocab, '_loaded', {})
+    monkeypatch.setattr(vocab, 'build_pools', None)
+    assert load_pools('id_ID', SEED, cache_dir) == pools
+
+
+def test_pooled_faker_is_reproducible(cache_dir):
+    pools = load_pools('id_ID', SEED, cache_dir)
+    values = []
+    for _ in range(2):
+        fake = PooledFaker(pools)
+        fake.seed_instance(42)
+        values.append([fake.first_name(), fake.city(), fake.sentence(), fake.uuid4(), fake.uuid4()])
+    assert values[0] == values[1]
+    assert values[0][0] in pools['first_name']
+    assert all(UUID4.fullmatch(uuid) for uuid in values[0][3:])
+    assert values[0][3] != values[0][4]
+
+
+def test_dump_without_pools_passes_verify(make_dataset, write_dump):
+    path, _ = write_dump(make_dataset(scale=5, pools=False))
+    assert verify([str(path)], today=NOW.date())['violations'] == {}
@@ -0,0 +1,38 @@
+import pytest
+
+from bustbuy_gen.schema import INDEXES
+from bustbuy_gen.workload import QUERIES, Workload
+
+from conftest import NOW, SEED
+
+
+@pytest.fixture
+def workload(monkeypatch, cache_dir, tmp_path):
+    monkeypatch.setenv('BUSTBUY_CACHE', cache_dir)
+    workload = Workload(f"sqlite:///{tmp_path / 'queries.db'}", repeat=2)
+    workload.reset()
+    return workload
+
+
+def test_queries_run_with_and_without_each_index(workload):
+    totals = workload.load(1, seed=SEED, now=NOW)
+    assert totals['pengguna'] > 0
+    result = workload.run()
+    assert set(result['queries']) <= {query.name for query in QUERIES}
+    assert result['queries']
+    for query in result['queries'].values():
+        assert query['plan']
+        assert 0 <= query['latency_ms']['p50'] <= query['latency_ms']['p99']
+    assert set(result['indexes']) == set(INDEXES)
+    tables = {query.name: query.tables for query in QUERIES}
+    for index in result['indexes'].values():
+        # Hanya query atas tabel index itu yang diukur ulang
+        assert set(index['without']) == {q for q in result['queries'] if index['table'] in tables[q]}
+        assert set(index['used_by']) <= set(result['queries'])
+
+
+def test_reset_refuses_to_drop_data(workload):
+    workload.load(1, seed=SEED, now=NOW)
+    with pytest.raises(RuntimeError):
+        workload.reset()
+    workload.reset(force=True)
@@ -0,0 +1,54 @@
+import io
+
+from bustbuy_gen.dumpreader import iter_dump
+from bustbuy_gen.writers import ExtendedInsertWriter, SqlRowWriter
+
+ROWS = [(1, "O'Neil", None, True), (2, 'back\\slash', 3.5, False), (3, 'biasa', 0, True)]
+COLUMNS = ('a', 'b', 'c', 'd')
+
+
+def write(writer, f, rows=ROWS):
+    writer.begin_table('t', COLUMNS)
+    for row in rows:
+        writer.write_row(row)
+    writer.end_table('t', len(rows))
+    writer.close()
+    return f.getvalue()
+
+
+def read_back(tmp_path, text):
+    path = tmp_path / 'dump.sql'
+    path.write_text(text, encoding='utf-8')
+    return [tuple(values) for _, _, values in iter_dump(str(path))]
+
+
+def test_extended_insert_batches(tmp_path):
+    f = io.StringIO()
+    text = write(ExtendedInsertWriter(f, batch_size=2), f)
+    assert text.count('INSERT INTO t (') == 2
+    assert read_back(tmp_path, text) == ROWS
+
+
+def test_extended_insert_respects_max_packet():
+    f = io.StringIO()
+    rows = [(k, 'x' * 100, None, True) for k in range(20)]
+    text = write(ExtendedInsertWriter(f, batch_size=1000, max_packet=400), f, rows)
+    statements = [s[s.index('INSERT INTO t ('):] for s in text.split(';\n') if 'INSERT INTO t (' in s]
+    assert len(statements) > 1
+    assert all(len(s) + 2 <= 400 for s in statements)
+
+
+def test_rows_format_plain_is_unchanged():
+    f = io.StringIO()
+    text = write(SqlRowWriter(f), f)
+    assert text.startswith("-- INSERT INTO t\nINSERT INTO t (a, b, c, d)\n")
+    assert 'TRANSACTION' not in text and 'CHECKS' not in text
+
+
+def test_rows_format_transactions_and_checks(tmp_path):
+    f = io.StringIO()
+    text = write(SqlRowWriter(f, transactions=True, disable_checks=True), f)
+    assert text.startswith("SET @OLD_UNIQUE_CHECKS")
+    assert text.index('START TRANSACTION;') < text.index('INSERT INTO t (') < text.index('COMMIT;')
+    assert text.rstrip().endswith("SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS;")
+    assert read_back(tmp_path, text) == ROWS
@@ -0,0 +1,59 @@
+# Check a generated dump against the BustBuy constraints without loading it.
+#
+#   python verify_dump.py test.txt
+#   python verify_dump.py dump/                      # csv/tsv directory or sharded output
+#   python verify_dump.py base.sql delta1.sql --today 2025-06-01 -o verify.json
+#
+# The dump is streamed once; keys are kept in bitmaps and hash sets. Checks
+# PRIMARY KEY, UNIQUE and FOREIGN KEY (schemav2.txt), NOT NULL, VARCHAR
+# lengths, the CHECK constraints and the insert triggers of
+# Bustbuy(v3)-add-constraint.sql and Fiturtambahan.sql. Several paths are
+# verified as one dataset, e.g. a full dump followed by its deltas. Exits
+# with status 1 when anything is violated.
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+
+from bustbuy_gen.verify import verify
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify a BustBuy dump against the schema constraints")
+    parser.add_argument('paths', nargs='+', metavar='DUMP',
+                        help="SQL file (.sql/.txt, .gz, .zst) or output directory, checked in this order")
+    parser.add_argument('--today', type=date.fromisoformat, default=None,
+                        help="date used for the umur > 17 rule (default: today, like CURDATE())")
+    parser.add_argument('--examples', type=int, default=5, help="examples kept per rule (default: 5)")
+    parser.add_argument('-o', '--output', default=None, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    started_at = time.perf_counter()
+    report = verify(args.paths, today=args.today, max_examples=args.examples)
+    report['seconds'] = round(time.perf_counter() - started_at, 3)
+
+    total = sum(report['rows'].values())
+    print(f"{total} baris dari {len(report['rows'])} tabel diperiksa dalam {report['seconds']:.2f} s",
+          file=sys.stderr)
+    if report['missing_parents']:
+        print(f"tabel induk tidak ada di input, FK ke sana dilewati: {', '.join(report['missing_parents'])}",
+              file=sys.stderr)
+    if report['unknown_tables']:
+        print(f"tabel tidak dikenal dilewati: {', '.join(report['unknown_tables'])}", file=sys.stderr)
+    for rule, count in report['violations'].items():
+        print(f"{rule:<32} {count:>10} pelanggaran")
+        for example in report['examples'][rule]:
+            where = f"{example['table']} baris {example['row']}" if example['row'] else example['table']
+            print(f"    {where}: {example['detail']}")
+    if not report['violations']:
+        print("tidak ada pelanggaran")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['violations'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())